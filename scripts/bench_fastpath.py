@@ -0,0 +1,37 @@
+"""
+Time the regex fast path against the reduced fixture release, the latency the
+preliminary comparison adds before the LLM call.
+
+    python scripts/bench_fastpath.py [--iterations 200] [--file release.html]
+"""
+import os
+import sys
+import time
+import argparse
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from services.worker.classes.content import reduce_content
+from services.worker.classes.fastpath import extract_fast_metrics
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "..", "tests", "fixtures", "release_page.html")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--file", default=FIXTURE, help="HTML release page, or .txt release text")
+    args = parser.parse_args()
+
+    with open(args.file, encoding="utf-8") as f:
+        raw = f.read()
+    start = time.perf_counter()
+    content, stats = reduce_content(raw, is_html=not args.file.endswith(".txt"))
+    reduce_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    for _ in range(args.iterations):
+        metrics = extract_fast_metrics(content)
+    fast_ms = (time.perf_counter() - start) * 1000 / args.iterations
+
+    print(f"~{stats['tokens_after']} tokens after reduction ({reduce_ms:.1f} ms)")
+    print(f"fast path {fast_ms:.2f} ms per release over {args.iterations} iterations")
+    print(metrics)
@@ -0,0 +1,57 @@
+"""
+Benchmark per-element href reads against a single eval_on_selector_all call on a
+large local IR fixture page.
+
+    python scripts/bench_link_harvest.py [--iterations 20] [--browser chromium]
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+from playwright.async_api import async_playwright
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from services.worker.classes.ir import HARVEST_LINKS_JS
+from services.worker.classes.browser import launch_browser
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "..", "tests", "fixtures", "ir_page_large.html")
+
+async def per_element(page, selector: str) -> list:
+    elements = await page.query_selector_all(selector)
+    return [await el.get_attribute("href") for el in elements]
+
+async def bulk(page, selector: str) -> list:
+    return [href for href, _ in await page.eval_on_selector_all(selector, HARVEST_LINKS_JS)]
+
+async def main(iterations: int, browser_type: str, selector: str) -> None:
+    with open(FIXTURE) as f:
+        html = f.read()
+
+    async with async_playwright() as p:
+        browser = await launch_browser(p, browser_type)
+        page = await browser.new_page()
+        await page.set_content(html)
+
+        results = {}
+        for name, harvest in [("query_selector_all + get_attribute", per_element), ("eval_on_selector_all", bulk)]:
+            hrefs = await harvest(page, selector)
+            start = time.perf_counter()
+            for _ in range(iterations):
+                await harvest(page, selector)
+            elapsed = (time.perf_counter() - start) / iterations
+            results[name] = (elapsed, hrefs)
+            print(f"{name:<40} {len(hrefs):>5} links  {elapsed * 1000:8.2f} ms/iteration")
+
+        (slow, slow_hrefs), (fast, fast_hrefs) = results.values()
+        assert slow_hrefs == fast_hrefs, "harvest strategies returned different hrefs"
+        print(f"speedup: {slow / fast:.1f}x")
+        await browser.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--browser", default="chromium")
+    parser.add_argument("--selector", default="a")
+    args = parser.parse_args()
+    asyncio.run(main(args.iterations, args.browser, args.selector))
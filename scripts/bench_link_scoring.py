@@ -0,0 +1,70 @@
+"""
+Micro-benchmark the compiled LinkMatcher against the legacy per-keyword scoring
+loop on thousands of synthetic IR links.
+
+    python scripts/bench_link_scoring.py [--links 5000] [--iterations 50]
+"""
+import os
+import sys
+import time
+import random
+import argparse
+from typing import List, Tuple
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from services.worker.classes.scoring import LinkMatcher
+
+KEYWORDS = ['2025', 'fourth', 'reports', 'results', 'financial']
+IGNORE_WORDS = ['Webcast', 'Conference-Call', 'FY24', 'FY23', 'FY22']
+WORDS = [
+    'announces', 'reports', 'results', 'financial', 'quarter', 'fourth', 'third', 'fiscal', 'dividend',
+    'webcast', 'conference-call', 'partnership', 'launch', 'platform', 'customer', 'fy24', '2024', '2025'
+]
+
+def synthetic_links(count: int, seed: int = 7) -> List[List[str]]:
+    rng = random.Random(seed)
+    links = []
+    for i in range(count):
+        slug = "-".join(rng.sample(WORDS, 5))
+        links.append([f"https://ir.example.com/news-releases/news-release-details/{slug}-{i}", slug.replace('-', ' ').title()])
+    return links
+
+def legacy_rank(links: List[List[str]], url_ignore_list: List[str]) -> List[Tuple[int, str]]:
+    candidates = []
+    for href, _ in links:
+        if not href or href in url_ignore_list:
+            continue
+        href_lower = href.lower()
+        if any(ignore_word.lower() in href_lower for ignore_word in IGNORE_WORDS):
+            continue
+        match_count = sum(1 for kw in KEYWORDS if kw in href_lower)
+        candidates.append((match_count, href))
+    candidates.sort(key=lambda x: x[0], reverse=True)
+    return candidates
+
+def timed(fn, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--links", type=int, default=5000)
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    links = synthetic_links(args.links)
+    url_ignore_list = [href for href, _ in links[::50]]
+    matcher = LinkMatcher(KEYWORDS, url_ignore_list=url_ignore_list, href_ignore_words=IGNORE_WORDS)
+
+    assert matcher.rank(links) == legacy_rank(links, url_ignore_list), "matcher and legacy ranking disagree"
+
+    build = lambda: LinkMatcher(KEYWORDS, url_ignore_list=url_ignore_list, href_ignore_words=IGNORE_WORDS)
+    legacy = timed(lambda: legacy_rank(links, url_ignore_list), args.iterations)
+    cold = timed(lambda: build().rank(links), args.iterations)
+    warm = timed(lambda: matcher.rank(links), args.iterations)
+    print(f"{args.links} links, {len(url_ignore_list)} ignored urls")
+    print(f"legacy loop                  {legacy * 1000:8.2f} ms/rank")
+    print(f"LinkMatcher, first poll      {cold * 1000:8.2f} ms/rank  ({legacy / cold:.1f}x)")
+    print(f"LinkMatcher, repeat poll     {warm * 1000:8.2f} ms/rank  ({legacy / warm:.1f}x)")
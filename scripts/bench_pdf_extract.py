@@ -0,0 +1,46 @@
+"""
+Compare single-core PyPDF2 extraction against page-range extraction in the
+process pool on multi-page synthetic earnings releases.
+
+    python scripts/bench_pdf_extract.py [--pages 40 80 160] [--workers 4] [--iterations 3]
+"""
+import os
+import sys
+import mmap
+import time
+import argparse
+import tempfile
+
+import PyPDF2
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "tests", "fixtures")))
+from services.worker.classes.pdf import extract_text_parallel, extract_text_serial, get_pdf_process_pool
+from pdf_fixture import build_pdf, earnings_release_pages
+
+def timed(fn, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, nargs="+", default=[40, 80, 160])
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--iterations", type=int, default=3)
+    args = parser.parse_args()
+
+    # Start the pool outside the timings; the worker keeps it alive between releases.
+    get_pdf_process_pool(args.workers).submit(int).result()
+    print(f"{args.workers} workers, {os.cpu_count()} cpus")
+    for num_pages in args.pages:
+        with tempfile.NamedTemporaryFile(suffix=".pdf") as spool:
+            spool.write(build_pdf(earnings_release_pages(num_pages)))
+            spool.flush()
+            with mmap.mmap(spool.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                serial_text = extract_text_serial(PyPDF2.PdfReader(buffer))
+                assert extract_text_parallel(spool.name, num_pages, args.workers) == serial_text, "outputs differ"
+                serial = timed(lambda: extract_text_serial(PyPDF2.PdfReader(buffer)), args.iterations)
+                parallel = timed(lambda: extract_text_parallel(spool.name, num_pages, args.workers), args.iterations)
+        print(f"{num_pages:4d} pages  single core {serial * 1000:8.1f} ms  process pool {parallel * 1000:8.1f} ms  ({serial / parallel:.1f}x)")
@@ -0,0 +1,93 @@
+"""
+Score the regex fast path against the LLM responses in stored artifacts. Each
+artifact's scraped_content is reduced as the worker would and run through the
+fast path; every figure it reports is compared with the same key in
+groq_response, and LLM figures the fast path missed are counted as misses.
+
+    python scripts/fastpath_accuracy.py artifacts/                 # directory of stored artifacts
+    python scripts/fastpath_accuracy.py s3://bucket[/2025-03-04/]  # artifacts in S3, optionally one day
+"""
+import os
+import sys
+import argparse
+from itertools import islice
+from typing import Any, Dict, Iterator, Tuple
+
+import boto3
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from services.worker.classes.artifacts import is_metadata_key, read_artifact
+from services.worker.classes.content import reduce_content
+from services.worker.classes.fastpath import extract_fast_metrics
+
+PERIODS = ("current_quarter", "full_year")
+
+def iter_artifacts(source: str, limit: int) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Artifacts under source, in the date/ticker/quarter layout or as legacy flat JSON files."""
+    if source.startswith("s3://"):
+        bucket, _, prefix = source[len("s3://"):].partition("/")
+        s3_client = boto3.client("s3")
+        read = lambda key: s3_client.get_object(Bucket=bucket, Key=key)["Body"].read()
+        keys = (
+            obj["Key"]
+            for page in s3_client.get_paginator("list_objects_v2").paginate(Bucket=bucket, Prefix=prefix)
+            for obj in page.get("Contents", [])
+        )
+    else:
+        def read(key: str) -> bytes:
+            with open(os.path.join(source, key), "rb") as f:
+                return f.read()
+        keys = (
+            os.path.relpath(os.path.join(root, name), source).replace(os.sep, "/")
+            for root, _, names in sorted(os.walk(source))
+            for name in sorted(names)
+        )
+    for key in islice((key for key in keys if is_metadata_key(key)), limit):
+        yield key, read_artifact(read, key)
+
+def score(artifact: Dict[str, Any], tolerance: float) -> Dict[str, Any]:
+    config = artifact.get("config", {})
+    content, _ = reduce_content(
+        artifact.get("scraped_content") or "",
+        is_html=config.get("extraction_method") != "pdf",
+        config=config.get("reduction_config")
+    )
+    fast = extract_fast_metrics(content)["metrics"]
+    llm = (artifact.get("groq_response") or {}).get("metrics") or {}
+    result = {"correct": 0, "wrong": [], "extra": 0, "missed": 0}
+    for period in PERIODS:
+        expected = {key: value for key, value in (llm.get(period) or {}).items() if isinstance(value, (int, float))}
+        found = fast.get(period, {})
+        for key, value in found.items():
+            if key not in expected:
+                result["extra"] += 1
+            elif abs(value - expected[key]) <= tolerance * max(abs(expected[key]), 0.01):
+                result["correct"] += 1
+            else:
+                result["wrong"].append(f"{period}.{key}: fast {value} vs llm {expected[key]}")
+        result["missed"] += len([key for key in expected if key not in found])
+    return result
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("source", help="directory of artifact JSON files or s3://bucket/prefix")
+    parser.add_argument("--tolerance", type=float, default=0.01, help="relative difference counted as a match")
+    parser.add_argument("--limit", type=int, default=500)
+    args = parser.parse_args()
+
+    totals = {"correct": 0, "wrong": 0, "extra": 0, "missed": 0}
+    for name, artifact in iter_artifacts(args.source, args.limit):
+        if "error" in (artifact.get("groq_response") or {}):
+            continue
+        result = score(artifact, args.tolerance)
+        for key in totals:
+            totals[key] += len(result[key]) if key == "wrong" else result[key]
+        for mismatch in result["wrong"]:
+            print(f"{name}: {mismatch}")
+
+    reported = totals["correct"] + totals["wrong"]
+    print(
+        f"precision {totals['correct'] / reported if reported else 0:.1%} ({totals['correct']}/{reported}), "
+        f"recall {totals['correct'] / (totals['correct'] + totals['wrong'] + totals['missed'] or 1):.1%}, "
+        f"{totals['extra']} figures the LLM did not report"
+    )
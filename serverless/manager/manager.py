@@ -64,7 +64,8 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 "GROQ_API_SECRET_ARN": GROQ_API_SECRET_ARN,
                 "DISCORD_WEBHOOK_SECRET_ARN": DISCORD_WEBHOOK_SECRET_ARN,
                 "ARTIFACT_BUCKET": ARTIFACT_BUCKET,
-                "MESSAGES_TABLE": MESSAGES_TABLE
+                "MESSAGES_TABLE": MESSAGES_TABLE,
+                "RELEASE_TIME": item.get("release_time", release_time)
             }
 
             function_name = f"WorkerFunction-{ticker}"
@@ -0,0 +1,103 @@
+import io
+import gzip
+import json
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from boto3.s3.transfer import TransferConfig
+
+DEFAULT_ARTIFACT_CONFIG: Dict[str, Any] = {
+    'codec': 'gzip',
+    'level': None,
+    # Objects at or above this size go up as concurrent multipart uploads.
+    'multipart_threshold': 8 * 1024 * 1024,
+    'multipart_chunksize': 8 * 1024 * 1024
+}
+CODEC_EXTENSIONS: Dict[str, str] = {'gzip': '.gz', 'zstd': '.zst', 'none': ''}
+CODEC_ENCODINGS: Dict[str, Optional[str]] = {'gzip': 'gzip', 'zstd': 'zstd', 'none': None}
+
+def compress(data: bytes, codec: str, level: Optional[int] = None) -> bytes:
+    if codec == 'gzip':
+        return gzip.compress(data, compresslevel=6 if level is None else level, mtime=0)
+    if codec == 'zstd':
+        try:
+            import zstandard
+        except ImportError:
+            raise Exception("The zstd artifact codec requires the zstandard package")
+        return zstandard.ZstdCompressor(level=3 if level is None else level).compress(data)
+    if codec == 'none':
+        return data
+    raise ValueError(f"Unknown artifact codec: {codec}")
+
+def decompress(data: bytes, codec: str) -> bytes:
+    if codec == 'gzip':
+        return gzip.decompress(data)
+    if codec == 'zstd':
+        import zstandard
+        return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+    return data
+
+def codec_for_key(key: str) -> str:
+    for codec, extension in CODEC_EXTENSIONS.items():
+        if extension and key.endswith(extension):
+            return codec
+    return 'none'
+
+def artifact_prefix(ticker: str, quarter: Any, year: Any, timestamp: str, run_id: str) -> str:
+    """
+    Key prefix for one run's artifacts, laid out as date/ticker/quarter so backtests can
+    list a day, a ticker on that day, or a single quarter. run_id (the message record's id)
+    keeps two runs in the same second apart: 2025-03-04/HPE/2025-Q1/20250304_210501_<run_id>/
+    """
+    day = datetime.strptime(timestamp, "%Y%m%d_%H%M%S").strftime("%Y-%m-%d")
+    return f"{day}/{str(ticker).upper()}/{year}-Q{quarter}/{timestamp}_{run_id}/"
+
+def is_metadata_key(key: str) -> bool:
+    """Metadata records of the partitioned layout, plus flat {ticker}_{timestamp}.json legacy artifacts."""
+    name = key.rsplit('/', 1)[-1]
+    return name.startswith('metadata.json') or ('/' not in key and name.endswith('.json'))
+
+def artifact_objects(
+    artifact: Dict[str, Any],
+    prefix: str,
+    codec: str = DEFAULT_ARTIFACT_CONFIG['codec'],
+    level: Optional[int] = None
+) -> List[Tuple[str, bytes]]:
+    """
+    Split an artifact into its compressed scraped content and a small metadata record that
+    points at it. The metadata comes last, so a reader that finds it can rely on the content.
+    """
+    extension = CODEC_EXTENSIONS[codec]
+    content = (artifact.get("scraped_content") or "").encode("utf-8")
+    content_key = f"{prefix}content.txt{extension}"
+    metadata = {key: value for key, value in artifact.items() if key != "scraped_content"}
+    metadata["content_key"] = content_key
+    metadata["content_bytes"] = len(content)
+    return [
+        (content_key, compress(content, codec, level)),
+        (f"{prefix}metadata.json{extension}", compress(json.dumps(metadata).encode("utf-8"), codec, level))
+    ]
+
+def upload_objects(s3_client: Any, bucket: str, objects: List[Tuple[str, bytes]], config: Dict[str, Any]) -> None:
+    """Upload each (key, body); bodies over multipart_threshold are sent in parallel parts."""
+    transfer_config = TransferConfig(
+        multipart_threshold=int(config['multipart_threshold']),
+        multipart_chunksize=int(config['multipart_chunksize'])
+    )
+    for key, body in objects:
+        extra_args = {"ContentType": "application/json" if ".json" in key else "text/plain; charset=utf-8"}
+        encoding = CODEC_ENCODINGS[codec_for_key(key)]
+        if encoding:
+            extra_args["ContentEncoding"] = encoding
+        s3_client.upload_fileobj(io.BytesIO(body), bucket, key, ExtraArgs=extra_args, Config=transfer_config)
+
+def read_artifact(read: Callable[[str], bytes], metadata_key: str, with_content: bool = True) -> Dict[str, Any]:
+    """
+    Load an artifact through read(key) -> bytes (an S3 get or a file read). With
+    with_content=False only the metadata record is fetched; legacy flat artifacts are
+    returned as stored.
+    """
+    artifact: Dict[str, Any] = json.loads(decompress(read(metadata_key), codec_for_key(metadata_key)))
+    content_key = artifact.get("content_key")
+    if with_content and content_key and "scraped_content" not in artifact:
+        artifact["scraped_content"] = decompress(read(content_key), codec_for_key(content_key)).decode("utf-8")
+    return artifact
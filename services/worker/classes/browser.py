@@ -0,0 +1,95 @@
+import asyncio
+from typing import Dict, Optional
+from playwright.async_api import async_playwright, Browser, Playwright
+
+LAUNCH_ARGS = [
+    "--disable-gpu",
+    "--disable-dev-shm-usage",
+    "--disable-software-rasterizer",
+    "--headless=new"
+]
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/121.0.0.0 Safari/537.36"
+)
+
+async def launch_browser(p: Playwright, browser_type: str = 'chromium') -> Browser:
+    """Launch a headless browser of the given type ('chromium' or 'firefox')."""
+    print(f'Launching browser: {browser_type}')
+    launcher = p.firefox if browser_type == 'firefox' else p.chromium
+    return await launcher.launch(headless=True, args=LAUNCH_ARGS)
+
+class BrowserPool:
+    """
+    Owns one Playwright driver and one long-lived browser per browser type so many
+    IRWorkflows can run in a single process. Each workflow opens its own
+    BrowserContext in the shared browser, keeping cookies and cache isolated per ticker.
+    """
+    def __init__(self):
+        self.playwright: Optional[Playwright] = None
+        self.browsers: Dict[str, Browser] = {}
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def start(self) -> "BrowserPool":
+        if self.playwright is None:
+            self._lock = asyncio.Lock()
+            self.playwright = await async_playwright().start()
+        return self
+
+    async def get_browser(self, browser_type: str = 'chromium') -> Browser:
+        """
+        Return the shared browser for browser_type, launching it on first use and
+        relaunching it if the previous one has disconnected (crash, OOM kill).
+        """
+        await self.start()
+        async with self._lock:
+            browser = self.browsers.get(browser_type)
+            if browser is not None and not browser.is_connected():
+                print(f'Browser {browser_type} disconnected, relaunching')
+                browser = None
+            if browser is None:
+                browser = await launch_browser(self.playwright, browser_type)
+                self.browsers[browser_type] = browser
+            return browser
+
+    async def check_health(self, browser_type: str = 'chromium', timeout: float = 10) -> bool:
+        """Probe the browser by opening and closing a context, dropping it if the probe fails."""
+        browser = await self.get_browser(browser_type)
+        try:
+            context = await asyncio.wait_for(browser.new_context(), timeout=timeout)
+            await context.close()
+            return True
+        except Exception as e:
+            print(f'Browser {browser_type} failed health check: {e}')
+            async with self._lock:
+                if self.browsers.get(browser_type) is browser:
+                    del self.browsers[browser_type]
+            try:
+                await browser.close()
+            except Exception:
+                pass
+            return False
+
+    async def warm(self, browser_type: str = 'chromium') -> None:
+        """Pre-launch browser_type so the first workflow does not pay the launch cost."""
+        if not await self.check_health(browser_type):
+            await self.get_browser(browser_type)
+
+    async def close(self) -> None:
+        for browser in self.browsers.values():
+            try:
+                await browser.close()
+            except Exception as e:
+                print(f"Error closing browser: {e}")
+        self.browsers = {}
+        if self.playwright is not None:
+            await self.playwright.stop()
+        self.playwright = None
+
+    async def __aenter__(self) -> "BrowserPool":
+        return await self.start()
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
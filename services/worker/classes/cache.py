@@ -0,0 +1,173 @@
+import os
+import json
+import time
+import boto3
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+DEFAULT_LLM_CACHE_CONFIG: Dict[str, Any] = {
+    'enabled': True,
+    'max_entries': 256,
+    'ttl_seconds': 6 * 60 * 60,
+    'directory': None,
+    's3_bucket': None,
+    's3_prefix': 'llm-cache/'
+}
+
+def cache_key(content: str, prompt: str, model: str, temperature: Any) -> str:
+    """Content address for an LLM call: sha256 over everything that determines the response."""
+    payload = json.dumps([content, prompt, model, temperature], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class MemoryTier:
+    """Process-wide LRU of serialised entries, shared by every workflow in the worker."""
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: str, entry: str) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+class DiskTier:
+    """One JSON file per key under directory; survives worker restarts on the same host."""
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key: str) -> Optional[str]:
+        try:
+            with open(self._path(key), encoding="utf-8") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def put(self, key: str, entry: str) -> None:
+        # Write then rename so a concurrent reader never sees a partial file.
+        tmp_path = f"{self._path(key)}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(entry)
+        os.replace(tmp_path, self._path(key))
+
+    def delete(self, key: str) -> None:
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+class S3Tier:
+    """One object per key under s3_prefix; shared by every worker instance."""
+    def __init__(self, bucket: str, prefix: str):
+        self.bucket = bucket
+        self.prefix = prefix
+        self.client = boto3.client("s3")
+
+    def get(self, key: str) -> Optional[str]:
+        try:
+            response = self.client.get_object(Bucket=self.bucket, Key=f"{self.prefix}{key}.json")
+        except self.client.exceptions.NoSuchKey:
+            return None
+        return response["Body"].read().decode("utf-8")
+
+    def put(self, key: str, entry: str) -> None:
+        self.client.put_object(Bucket=self.bucket, Key=f"{self.prefix}{key}.json", Body=entry)
+
+    def delete(self, key: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=f"{self.prefix}{key}.json")
+
+class LLMCache:
+    """
+    Two-tier cache for parsed LLM responses. Lookups go to the in-process LRU first and
+    then to the persistent tier (disk or S3), promoting hits into the LRU. Entries carry
+    their write time and are evicted on read once older than ttl_seconds. Persistent
+    tier failures are logged and treated as misses so they never fail a workflow.
+    """
+    def __init__(
+        self,
+        memory: MemoryTier,
+        persistent: Optional[Any] = None,
+        ttl_seconds: float = DEFAULT_LLM_CACHE_CONFIG['ttl_seconds'],
+        clock: Callable[[], float] = time.time
+    ):
+        self.memory = memory
+        self.persistent = persistent
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+
+    def _load(self, tier: Any, key: str) -> Optional[Dict[str, Any]]:
+        entry = tier.get(key)
+        if entry is None:
+            return None
+        entry = json.loads(entry)
+        if self.clock() - entry["stored_at"] > self.ttl_seconds:
+            tier.delete(key)
+            return None
+        return entry
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._load(self.memory, key)
+        if entry is None and self.persistent is not None:
+            try:
+                entry = self._load(self.persistent, key)
+            except Exception as e:
+                print(f"LLM cache lookup failed for {key}: {e}")
+                entry = None
+            if entry is not None:
+                self.memory.put(key, json.dumps(entry))
+        return entry["value"] if entry is not None else None
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        entry = json.dumps({"stored_at": self.clock(), "value": value})
+        self.memory.put(key, entry)
+        if self.persistent is not None:
+            try:
+                self.persistent.put(key, entry)
+            except Exception as e:
+                print(f"LLM cache write failed for {key}: {e}")
+
+_memory_tier: Optional[MemoryTier] = None
+_caches: Dict[Tuple[Any, ...], LLMCache] = {}
+_caches_lock = threading.Lock()
+
+def get_llm_cache(config: Optional[Dict[str, Any]] = None) -> Optional[LLMCache]:
+    """
+    Return the process-wide LLMCache for config (see DEFAULT_LLM_CACHE_CONFIG), or None
+    when caching is disabled. Every cache shares one in-process LRU.
+    """
+    global _memory_tier
+    config = {**DEFAULT_LLM_CACHE_CONFIG, **(config or {})}
+    if not config['enabled']:
+        return None
+    key = (config['directory'], config['s3_bucket'], config['s3_prefix'], config['ttl_seconds'])
+    with _caches_lock:
+        if _memory_tier is None:
+            _memory_tier = MemoryTier(int(config['max_entries']))
+        if key not in _caches:
+            if config['s3_bucket']:
+                persistent = S3Tier(config['s3_bucket'], config['s3_prefix'])
+            elif config['directory']:
+                persistent = DiskTier(config['directory'])
+            else:
+                persistent = None
+            _caches[key] = LLMCache(_memory_tier, persistent, float(config['ttl_seconds']))
+        return _caches[key]
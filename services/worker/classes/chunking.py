@@ -0,0 +1,109 @@
+import json
+from typing import Any, Dict, List, Tuple
+from .content import estimate_tokens
+
+# Chunked extraction is opt-in: 0 sends the whole release in one call.
+DEFAULT_CHUNK_TOKENS = 0
+
+def _split_oversized(unit: str, max_tokens: int) -> List[str]:
+    """Split one paragraph or table block by lines, repeating a table's title and header row."""
+    lines = unit.split('\n')
+    carry: List[str] = lines[:2] if lines[0].startswith('Table ') and len(lines) > 2 else []
+    # A single line over budget is cut at the character level as a last resort.
+    width = max(1, max_tokens * 4 - len('\n'.join(carry)) - 8)
+    body = [line[i:i + width] for line in lines[len(carry):] for i in range(0, max(len(line), 1), width)]
+
+    pieces: List[str] = []
+    current: List[str] = []
+    size = estimate_tokens('\n'.join(carry))
+    for line in body:
+        line_tokens = estimate_tokens(line) + 1
+        if current and size + line_tokens > max_tokens:
+            pieces.append('\n'.join(carry + current))
+            current, size = [], estimate_tokens('\n'.join(carry))
+        current.append(line)
+        size += line_tokens
+    if current:
+        pieces.append('\n'.join(carry + current))
+    return pieces
+
+def split_content(content: str, max_tokens: int) -> List[str]:
+    """
+    Split release content into chunks of at most max_tokens (estimated), breaking at
+    blank-line sections where possible and at lines otherwise, so headline, outlook and
+    table blocks stay whole. Content within budget comes back as a single chunk.
+    """
+    if estimate_tokens(content) <= max_tokens:
+        return [content]
+    separator = '\n\n' if '\n\n' in content else '\n'
+    units: List[str] = []
+    for unit in content.split(separator):
+        if not unit.strip():
+            continue
+        units.extend(_split_oversized(unit, max_tokens) if estimate_tokens(unit) > max_tokens else [unit])
+
+    chunks: List[str] = []
+    current: List[str] = []
+    size = 0
+    for unit in units:
+        unit_tokens = estimate_tokens(unit) + 1
+        if current and size + unit_tokens > max_tokens:
+            chunks.append(separator.join(current))
+            current, size = [], 0
+        current.append(unit)
+        size += unit_tokens
+    if current:
+        chunks.append(separator.join(current))
+    return chunks
+
+def _is_missing(value: Any) -> bool:
+    return value is None or value == {} or value == [] or value == ''
+
+def _is_range(value: Any) -> bool:
+    return isinstance(value, dict) and set(value) <= {'low', 'high'} and bool(value)
+
+def _merge(values: List[Any], path: str, conflicts: List[str]) -> Any:
+    present = [value for value in values if not _is_missing(value)]
+    if not present:
+        return values[0] if values else None
+    # Lists of records (sentiment snippets) accumulate; lists of figures are [low, high] leaves.
+    if all(isinstance(value, list) and all(isinstance(item, dict) for item in value) for value in present):
+        merged: List[Any] = []
+        seen = set()
+        for value in present:
+            for item in value:
+                marker = json.dumps(item, sort_keys=True)
+                if marker not in seen:
+                    seen.add(marker)
+                    merged.append(item)
+        return merged
+    if all(isinstance(value, dict) and not _is_range(value) for value in present):
+        keys: List[str] = []
+        for value in present:
+            keys.extend(key for key in value if key not in keys)
+        return {
+            key: _merge([value.get(key) for value in present], f"{path}.{key}" if path else key, conflicts)
+            for key in keys
+        }
+    # Leaves (figures and low/high ranges): the earliest complete value wins, since chunks
+    # run in document order and headline figures precede reconciliation tables.
+    complete = [value for value in present if not _is_range(value) or None not in value.values()]
+    winner = (complete or present)[0]
+    for value in complete[1:]:
+        if value != winner:
+            conflicts.append(f"{path}: kept {winner!r}, ignored {value!r}")
+    return winner
+
+def merge_partial_metrics(partials: List[Dict[str, Any]]) -> Tuple[Dict[str, Any], List[str]]:
+    """
+    Merge per-chunk extraction results, in chunk order, into one response with the same
+    metrics/comparisons/sentiment_snippets schema. Dicts merge key by key; for a figure or
+    range reported by several chunks the first non-null (complete) value wins; lists are
+    concatenated without duplicates. Chunks that failed are skipped; if all failed the
+    first error is returned. Also returns a description of each conflicting value ignored.
+    """
+    usable = [partial for partial in partials if isinstance(partial, dict) and 'error' not in partial]
+    if not usable:
+        return (partials[0] if partials else {"error": "No chunks were extracted"}), []
+    conflicts: List[str] = []
+    return _merge(usable, '', conflicts), conflicts
@@ -0,0 +1,243 @@
+import re
+from typing import Any, Dict, List, Optional, Tuple
+from selectolax.lexbor import LexborHTMLParser
+from .tables import UNITS, TableCollector, split_text_tables
+
+# Subtrees that never carry release content.
+SKIP_TAGS = frozenset({
+    'script', 'style', 'noscript', 'template', 'iframe', 'svg', 'canvas', 'form', 'button',
+    'select', 'nav', 'aside', 'head', 'meta', 'link', 'video', 'audio', 'picture', 'img'
+})
+# Page chrome, dropped unless it sits inside the article itself.
+CHROME_TAGS = frozenset({'header', 'footer'})
+CHROME_ROLES = frozenset({'navigation', 'banner', 'contentinfo', 'search', 'dialog', 'alertdialog'})
+CONTENT_TAGS = frozenset({'article', 'main'})
+BLOCK_TAGS = frozenset({
+    'address', 'article', 'blockquote', 'br', 'caption', 'dd', 'div', 'dl', 'dt', 'figcaption', 'figure',
+    'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'hr', 'li', 'main', 'ol', 'p', 'pre', 'section', 'table',
+    'tbody', 'tfoot', 'thead', 'tr', 'ul'
+})
+CELL_TAGS = frozenset({'td', 'th'})
+HEADING_TAGS = frozenset({'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'caption'})
+# Containers scored by density; tables are always kept whole.
+SCORED_TAGS = frozenset({'div', 'section', 'ul', 'ol', 'dl', 'header', 'footer'})
+
+BOILERPLATE_ATTR = re.compile(
+    r'(?:^|[\s_-])(?:cookie|consent|gdpr|onetrust|breadcrumbs?|menu|navbar|nav|sidebar|social|share|'
+    r'subscribe|newsletter|skip|modal|popup|banner)(?:$|[\s_-])',
+    re.IGNORECASE
+)
+DISCLAIMER_HEADER = re.compile(
+    r'^\s*(?:cautionary\s+(?:note|statement|language)s?(?:\s+(?:regarding|concerning|about)[\w\s-]*)?|'
+    r'(?:special\s+note\s+(?:regarding|concerning)\s+)?forward[\s-]looking\s+(?:statements?|information)|'
+    r'safe\s+harbor(?:\s+statement)?|disclaimer)\s*:?\s*$',
+    re.IGNORECASE
+)
+DISCLAIMER_TEXT = re.compile(
+    r'forward[\s-]looking\s+statements?|private\s+securities\s+litigation\s+reform\s+act|safe\s+harbor',
+    re.IGNORECASE
+)
+RISK_TEXT = re.compile(r'\b(?:risks?|uncertaint(?:y|ies)|differ\s+materially)\b', re.IGNORECASE)
+MONEY = re.compile(r'\$\s?\d|\d\s?%')
+DIGIT = re.compile(r'\d')
+
+DEFAULT_REDUCTION_CONFIG = {
+    'max_link_density': 0.5,
+    'min_text_density': 4.0,
+    'min_chars': 500
+}
+
+def estimate_tokens(text: str) -> int:
+    """Rough LLM token count (about four characters per token for English prose)."""
+    return (len(text) + 3) // 4
+
+def _is_boilerplate(node, inside_content: bool) -> bool:
+    tag = node.tag
+    if tag in SKIP_TAGS:
+        return True
+    attributes = node.attributes
+    if attributes.get('aria-hidden') == 'true' or 'hidden' in attributes:
+        return True
+    if (attributes.get('role') or '').lower() in CHROME_ROLES:
+        return True
+    if inside_content:
+        return False
+    if tag in CHROME_TAGS:
+        return True
+    marker = f"{attributes.get('id') or ''} {attributes.get('class') or ''}"
+    return bool(marker.strip()) and BOILERPLATE_ATTR.search(marker) is not None
+
+def _walk(
+    node,
+    inside_content: bool,
+    inside_table: bool,
+    prune: bool,
+    config: Dict[str, Any],
+    tables: Optional[TableCollector] = None
+) -> Tuple[List[str], int, int, int, bool]:
+    """
+    Depth-first walk returning (text pieces, text chars, link text chars, element count, has digits)
+    for node's subtree, with boilerplate subtrees and low-density blocks already removed. Data tables
+    go to tables, when given, and leave only their marker in the text.
+    """
+    pieces: List[str] = []
+    chars = link_chars = elements = 0
+    has_digit = False
+    child = node.child
+    while child is not None:
+        if child.is_text_node:
+            text = child.text_content or ''
+            if text.strip():
+                pieces.append(text)
+                chars += len(text.strip())
+                has_digit = has_digit or DIGIT.search(text) is not None
+        elif child.is_element_node:
+            tag = child.tag
+            if prune and _is_boilerplate(child, inside_content):
+                child = child.next
+                continue
+            marker = tables.add_html_table(child) if tables is not None and tag == 'table' and not inside_table else None
+            if marker:
+                pieces.append(f"\n{marker}\n")
+                child = child.next
+                continue
+            sub_pieces, sub_chars, sub_links, sub_elements, sub_digit = _walk(
+                child,
+                inside_content or tag in CONTENT_TAGS,
+                inside_table or tag == 'table',
+                prune,
+                config,
+                tables
+            )
+            if tables is not None and tag in HEADING_TAGS:
+                tables.last_heading = ' '.join(''.join(sub_pieces).split()) or tables.last_heading
+                tables.last_units = None
+            elif tables is not None and tag == 'p' and sub_chars < 120:
+                units = UNITS.search(''.join(sub_pieces))
+                tables.last_units = units.group(0) if units else tables.last_units
+            if tag == 'a':
+                sub_links = sub_chars
+            sub_elements += 1
+            if prune and tag in SCORED_TAGS and not inside_table and sub_chars:
+                link_density = sub_links / sub_chars
+                text_density = sub_chars / sub_elements
+                if link_density > config['max_link_density'] or (
+                    text_density < config['min_text_density'] and not sub_digit
+                ):
+                    child = child.next
+                    continue
+            if tag in BLOCK_TAGS:
+                pieces.append('\n')
+            pieces.extend(sub_pieces)
+            if tag in CELL_TAGS:
+                pieces.append('\t')
+            elif tag in BLOCK_TAGS:
+                pieces.append('\n')
+            chars += sub_chars
+            link_chars += sub_links
+            elements += sub_elements
+            has_digit = has_digit or sub_digit
+        child = child.next
+    return pieces, chars, link_chars, elements, has_digit
+
+def _normalise_lines(text: str) -> List[str]:
+    lines = []
+    for line in text.split('\n'):
+        line = '\t'.join(' '.join(cell.split()) for cell in line.split('\t')).strip('\t ')
+        if line:
+            lines.append(line)
+    return lines
+
+def html_to_lines(
+    html: str,
+    prune: bool = True,
+    config: Optional[Dict[str, Any]] = None,
+    tables: Optional[TableCollector] = None
+) -> List[str]:
+    """
+    Render html to text lines, one per block, with table cells tab separated. With prune,
+    navigation, cookie banners and other page chrome are dropped, as are containers
+    that are mostly link text or carry little text per element (and no figures).
+    Passing a TableCollector moves data tables out of the text into CSV blocks.
+    """
+    config = {**DEFAULT_REDUCTION_CONFIG, **(config or {})}
+    tree = LexborHTMLParser(html)
+    root = tree.body or tree.root
+    if root is None:
+        return []
+    pieces, *_ = _walk(root, root.tag in CONTENT_TAGS, False, prune, config, tables)
+    return _normalise_lines(''.join(pieces))
+
+def strip_disclaimers(lines: List[str]) -> List[str]:
+    """
+    Drop forward-looking-statement and safe-harbor sections: a disclaimer header and
+    the paragraphs under it up to the next heading, plus any stand-alone disclaimer
+    paragraph. Lines quoting dollar or percentage figures are always kept.
+    """
+    kept: List[str] = []
+    in_disclaimer = False
+    for line in lines:
+        if DISCLAIMER_HEADER.match(line):
+            in_disclaimer = True
+            continue
+        if in_disclaimer:
+            is_heading = len(line) < 80 and not line.endswith(('.', ',', ';', ':'))
+            if is_heading or MONEY.search(line):
+                in_disclaimer = False
+            else:
+                continue
+        if len(line) > 200 and DISCLAIMER_TEXT.search(line) and RISK_TEXT.search(line) and not MONEY.search(line):
+            continue
+        kept.append(line)
+    return kept
+
+def format_llm_content(lines: List[str], table_blocks: List[str]) -> str:
+    """Prose first, then the CSV table blocks its [Table N] markers refer to."""
+    text = '\n'.join(lines)
+    if not table_blocks:
+        return text
+    return (
+        f"{text}\n\n"
+        f"Tables (CSV; figures without $ or thousands separators, negatives as -):\n\n"
+        + '\n\n'.join(table_blocks)
+    )
+
+def reduce_content(
+    content: str,
+    is_html: bool,
+    config: Optional[Dict[str, Any]] = None,
+    prune: bool = True,
+    tables: bool = True
+) -> Tuple[str, Dict[str, Any]]:
+    """
+    Shrink scraped release content before it is sent to the LLM. With prune, HTML is pruned
+    by block density and disclaimers are removed from HTML and PDF text alike; with tables,
+    financial tables are pulled out of the text into compact CSV blocks. If less than
+    min_chars is left, the unreduced text is used instead. Returns the text to send and
+    token estimates before and after.
+    """
+    config = {**DEFAULT_REDUCTION_CONFIG, **(config or {})}
+    collector = TableCollector() if tables else None
+    if is_html:
+        full_lines = html_to_lines(content, prune=False)
+        lines = html_to_lines(content, prune=prune, config=config, tables=collector)
+    else:
+        full_lines = content.split('\n')
+        lines = full_lines
+    if prune:
+        lines = strip_disclaimers(lines)
+    if collector is not None and not is_html:
+        lines = split_text_tables(lines, collector)
+
+    full_text = '\n'.join(full_lines)
+    reduced = format_llm_content(lines, collector.blocks if collector is not None else [])
+    if len(reduced) < min(config['min_chars'], len(full_text)):
+        print('Content reduction removed too much, sending unreduced text')
+        reduced = full_text
+
+    stats = {
+        'tokens_before': estimate_tokens(full_text if is_html else content),
+        'tokens_after': estimate_tokens(reduced),
+        'tables': len(collector.blocks) if collector is not None and reduced is not full_text else 0
+    }
+    return reduced, stats
@@ -0,0 +1,195 @@
+import time
+import random
+import asyncio
+import httpx
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+DISCORD_MESSAGE_LIMIT = 2000
+DEFAULT_DISCORD_QUEUE_CONFIG: Dict[str, Any] = {
+    # Discord allows about five requests per two seconds on one webhook.
+    'rate': 5,
+    'per_seconds': 2.0,
+    'max_attempts': 5,
+    # Merge queued new posts for a webhook into one message once this many are waiting.
+    'coalesce': False,
+    'coalesce_threshold': 3
+}
+
+class TokenBucket:
+    """Refills rate tokens every per_seconds; acquire waits for a token and any server-imposed pause."""
+    def __init__(self, rate: float, per_seconds: float):
+        self.capacity = float(rate)
+        self.fill_rate = rate / per_seconds
+        self.tokens = float(rate)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+
+    def pause_for(self, seconds: float) -> None:
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+    async def acquire(self) -> None:
+        while True:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.fill_rate)
+            self.updated = now
+            wait = self.paused_until - now
+            if wait <= 0 and self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep(max(wait, (1 - self.tokens) / self.fill_rate))
+
+class DiscordMessage:
+    """One queued webhook call and the future its sender awaits for the Discord message id."""
+    def __init__(self, method: str, content: str, message_id: Optional[str], coalescible: bool, label: str):
+        self.method = method
+        self.content = content
+        self.message_id = message_id
+        self.coalescible = coalescible
+        self.label = label
+        self.enqueued_at = time.monotonic()
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+
+def discord_retry_after(response: httpx.Response) -> float:
+    """Seconds a 429 asks us to wait, from the JSON body or the Retry-After header."""
+    try:
+        return float(response.json().get("retry_after"))
+    except (ValueError, TypeError, AttributeError):
+        pass
+    try:
+        return float(response.headers.get("retry-after", 1))
+    except ValueError:
+        return 1.0
+
+class DiscordQueue:
+    """
+    Delivers webhook posts and edits over one pooled keep-alive client. Each webhook has
+    its own FIFO worker and token bucket; X-RateLimit-* headers and 429 Retry-After pause
+    the bucket (or every bucket, for a global limit) instead of dropping the message.
+    With coalesce, new posts that back up behind the limit are merged into one message.
+    Latency from enqueue to delivery is printed and kept in latencies.
+    """
+    def __init__(self, config: Optional[Dict[str, Any]] = None, http_client: Optional[httpx.AsyncClient] = None):
+        self.config = {**DEFAULT_DISCORD_QUEUE_CONFIG, **(config or {})}
+        self.client = http_client or httpx.AsyncClient(
+            timeout=httpx.Timeout(10.0, connect=5.0),
+            limits=httpx.Limits(max_connections=10, max_keepalive_connections=10)
+        )
+        self.queues: Dict[str, Deque[DiscordMessage]] = {}
+        self.buckets: Dict[str, TokenBucket] = {}
+        self.workers: Dict[str, asyncio.Task] = {}
+        self.latencies: Deque[Tuple[str, float]] = deque(maxlen=1000)
+
+    def _bucket(self, webhook_url: str) -> TokenBucket:
+        if webhook_url not in self.buckets:
+            self.buckets[webhook_url] = TokenBucket(self.config['rate'], self.config['per_seconds'])
+        return self.buckets[webhook_url]
+
+    def _enqueue(self, webhook_url: str, message: DiscordMessage) -> asyncio.Future:
+        self.queues.setdefault(webhook_url, deque()).append(message)
+        worker = self.workers.get(webhook_url)
+        if worker is None or worker.done():
+            self.workers[webhook_url] = asyncio.ensure_future(self._drain(webhook_url))
+        return message.future
+
+    async def post(self, webhook_url: str, content: str, coalescible: bool = False, label: str = '') -> Optional[str]:
+        """Queue a new webhook message and return its Discord message id once delivered."""
+        return await self._enqueue(webhook_url, DiscordMessage('POST', content, None, coalescible, label))
+
+    async def edit(self, webhook_url: str, message_id: str, content: str, label: str = '') -> Optional[str]:
+        """Queue an edit of a message previously posted through the webhook."""
+        return await self._enqueue(webhook_url, DiscordMessage('PATCH', content, message_id, False, label))
+
+    def _take_batch(self, queue: Deque[DiscordMessage]) -> List[DiscordMessage]:
+        batch = [queue.popleft()]
+        if not (self.config['coalesce'] and batch[0].coalescible and len(queue) + 1 >= self.config['coalesce_threshold']):
+            return batch
+        size = len(batch[0].content)
+        while queue and queue[0].coalescible and size + len(queue[0].content) + 2 <= DISCORD_MESSAGE_LIMIT:
+            size += len(queue[0].content) + 2
+            batch.append(queue.popleft())
+        return batch
+
+    async def _drain(self, webhook_url: str) -> None:
+        queue = self.queues[webhook_url]
+        while queue:
+            batch = self._take_batch(queue)
+            try:
+                message_id = await self._send(webhook_url, batch)
+            except Exception as e:
+                for message in batch:
+                    if not message.future.done():
+                        message.future.set_exception(e)
+                continue
+            delivered = time.monotonic()
+            for message in batch:
+                latency = delivered - message.enqueued_at
+                self.latencies.append((message.label, latency))
+                print(
+                    f"Discord {message.method.lower()} for {message.label or 'webhook'} delivered in {latency:.2f}s"
+                    + (f" (coalesced {len(batch)} messages)" if len(batch) > 1 else "")
+                )
+                if not message.future.done():
+                    message.future.set_result(message_id)
+
+    async def _send(self, webhook_url: str, batch: List[DiscordMessage]) -> Optional[str]:
+        bucket = self._bucket(webhook_url)
+        first = batch[0]
+        payload = {"content": "\n\n".join(message.content for message in batch)[:DISCORD_MESSAGE_LIMIT]}
+        if first.method == 'POST':
+            payload["username"] = "EarningsEar"
+        url = f"{webhook_url}/messages/{first.message_id}" if first.method == 'PATCH' else webhook_url
+        params = {"wait": "true"} if first.method == 'POST' else None
+
+        for attempt in range(1, self.config['max_attempts'] + 1):
+            await bucket.acquire()
+            try:
+                response = await self.client.request(first.method, url, params=params, json=payload)
+            except httpx.TransportError:
+                if attempt == self.config['max_attempts']:
+                    raise
+                await asyncio.sleep(min(30.0, 2 ** attempt) * random.uniform(0.5, 1.0))
+                continue
+
+            if response.headers.get("x-ratelimit-remaining") == "0":
+                bucket.pause_for(float(response.headers.get("x-ratelimit-reset-after", 1)))
+            if response.status_code == 429:
+                wait = discord_retry_after(response)
+                if response.headers.get("x-ratelimit-global") or response.headers.get("x-ratelimit-scope") == "global":
+                    for other in self.buckets.values():
+                        other.pause_for(wait)
+                else:
+                    bucket.pause_for(wait)
+                print(f"Discord rate limited {first.label or 'webhook'}, retrying in {wait:.2f}s")
+                continue
+            if response.status_code >= 500 and attempt < self.config['max_attempts']:
+                await asyncio.sleep(min(30.0, 2 ** attempt) * random.uniform(0.5, 1.0))
+                continue
+            response.raise_for_status()
+            if first.method == 'POST':
+                return response.json().get("id")
+            return first.message_id
+        raise Exception(f"Discord {first.method} to webhook failed after {self.config['max_attempts']} attempts")
+
+    async def close(self) -> None:
+        for worker in self.workers.values():
+            if not worker.done():
+                await asyncio.gather(worker, return_exceptions=True)
+        await self.client.aclose()
+
+_queues: Dict[asyncio.AbstractEventLoop, DiscordQueue] = {}
+
+def get_discord_queue(config: Optional[Dict[str, Any]] = None) -> DiscordQueue:
+    """Shared DiscordQueue for the running event loop, created (with config) on first use."""
+    loop = asyncio.get_running_loop()
+    for key in [key for key in _queues if key.is_closed()]:
+        del _queues[key]
+    if loop not in _queues:
+        _queues[loop] = DiscordQueue(config)
+    return _queues[loop]
+
+async def close_discord_queues() -> None:
+    """Finish queued deliveries and close the queue bound to the running event loop."""
+    queue = _queues.pop(asyncio.get_running_loop(), None)
+    if queue is not None:
+        await queue.close()
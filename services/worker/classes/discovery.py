@@ -0,0 +1,92 @@
+import re
+import httpx
+import hashlib
+from typing import Any, List, Optional
+from selectolax.lexbor import LexborHTMLParser
+from .browser import USER_AGENT
+
+def new_http_client(max_connections: int = 100) -> httpx.AsyncClient:
+    """Pooled keep-alive client for HTTP-first link discovery. Share one per process where possible."""
+    return httpx.AsyncClient(
+        headers={"User-Agent": USER_AGENT, "Accept-Language": "en-US"},
+        follow_redirects=True,
+        verify=False,
+        timeout=httpx.Timeout(10.0, connect=5.0),
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections
+        )
+    )
+
+def parse_links(html: str, selector: str) -> List[List[str]]:
+    """
+    Parse server-rendered html and return [href, anchor text] for every element
+    matching selector, the same shape HARVEST_LINKS_JS returns from a live page.
+    """
+    tree = LexborHTMLParser(html)
+    return [[node.attributes.get("href"), node.text(strip=True)] for node in tree.css(selector)]
+
+def hash_links(links: List[List[str]]) -> str:
+    """Stable digest of a harvested anchor set, used to skip re-scoring unchanged pages."""
+    digest = hashlib.blake2b(digest_size=16)
+    for href, text in links:
+        digest.update(f"{href}\x1f{text}\x1e".encode("utf-8", "surrogatepass"))
+    return digest.hexdigest()
+
+def _looks_like_link(value: str) -> bool:
+    return (value.startswith(("http://", "https://")) or value.startswith("/")) and not any(c.isspace() for c in value)
+
+def extract_json_links(payload: Any) -> List[List[str]]:
+    """
+    Walk a JSON payload and return [href, text] pairs for every URL-like string value.
+    The text is the object's other short string fields (headline, title, date), so
+    feeds such as Q4's GetPressReleaseList score like rendered anchors.
+    """
+    links = []
+    stack = [payload]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            strings = [value for value in node.values() if isinstance(value, str)]
+            hrefs = [value for value in strings if _looks_like_link(value)]
+            if hrefs:
+                text = " ".join(value for value in strings if value not in hrefs and len(value) < 300)
+                links.extend([href, text] for href in hrefs)
+            stack.extend(value for value in reversed(list(node.values())) if isinstance(value, (dict, list)))
+        elif isinstance(node, list):
+            stack.extend(reversed(node))
+    return links
+
+QUARTER_WORDS = {1: 'first', 2: 'second', 3: 'third', 4: 'fourth'}
+
+async def fetch_head_text(client: httpx.AsyncClient, url: str, max_bytes: int = 32_768) -> str:
+    """Stream url and return at most its first max_bytes, decoded, without downloading the rest."""
+    chunks = []
+    size = 0
+    async with client.stream("GET", url) as response:
+        response.raise_for_status()
+        async for chunk in response.aiter_bytes():
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= max_bytes:
+                break
+    return b"".join(chunks)[:max_bytes].decode(response.encoding or "utf-8", errors="ignore")
+
+def verification_terms(quarter: Any, year: Any, ticker: Optional[str]) -> List[re.Pattern]:
+    """
+    Patterns a release page should contain for the given quarter, year and ticker,
+    e.g. 'Q4' or 'fourth' for quarter 4, and '2025' or 'FY25' for year 2025.
+    """
+    terms = []
+    if quarter:
+        q = int(float(quarter))
+        terms.append(re.compile(rf"\bq{q}\b|\b{QUARTER_WORDS.get(q, q)}\b", re.IGNORECASE))
+    if year:
+        y = str(int(float(year)))
+        terms.append(re.compile(rf"\b{y}\b|\bfy\s?'?{y[-2:]}\b", re.IGNORECASE))
+    if ticker:
+        terms.append(re.compile(rf"\b{re.escape(ticker)}\b", re.IGNORECASE))
+    return terms
+
+def is_verified(text: str, terms: List[re.Pattern]) -> bool:
+    return all(term.search(text) for term in terms)
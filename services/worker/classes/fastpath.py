@@ -0,0 +1,121 @@
+import re
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# "$1.93 billion", "$801.0 million", "$ 7,300 million", "$(12.4) million", "$1.9B"
+MONEY = r'\$\s?\(?(?P<value>\d{1,3}(?:,\d{3})+(?:\.\d+)?|\d+(?:\.\d+)?)\s*\)?\s*(?P<unit>billion|million|thousand|bn|mm|b|m)\b'
+LABEL_GAP = r'[^$\n;]{0,60}?'
+
+METRIC_PATTERNS: List[Tuple[str, "re.Pattern[str]"]] = [
+    ('revenue_billion', re.compile(
+        r'\b(?:total\s+)?(?:net\s+)?(?:revenues?|sales)\b' + LABEL_GAP + MONEY, re.IGNORECASE)),
+    ('revenue_billion', re.compile(
+        MONEY + r'\s+(?:in|of)\s+(?:total\s+)?(?:quarterly\s+)?(?:net\s+)?(?:revenues?|sales)\b', re.IGNORECASE)),
+    ('net_income_billion', re.compile(
+        r'\bnet\s+(?P<sign>income|loss)\b' + LABEL_GAP + MONEY, re.IGNORECASE)),
+]
+EPS_PATTERNS: List["re.Pattern[str]"] = [
+    re.compile(r'(?P<neg>\(|-)?\$\s?(?P<paren>\()?(?P<value>\d+\.\d{2,3})\)?\s+(?:per\s+(?:basic\s+and\s+)?(?:diluted\s+)?share|diluted\s+eps)\b', re.IGNORECASE),
+    re.compile(r'\b(?:diluted\s+)?(?:eps|earnings\s+per\s+(?:diluted\s+)?share)\b' + LABEL_GAP + r'(?P<neg>\(|-)?\$\s?(?P<paren>\()?(?P<value>\d+\.\d{2,3})', re.IGNORECASE),
+]
+NON_GAAP = re.compile(r'\b(?:non[-\s]?gaap|adjusted)\b', re.IGNORECASE)
+GAAP = re.compile(r'\bgaap\b', re.IGNORECASE)
+LOSS_PER_SHARE = re.compile(r'\bloss\s+per\s+(?:diluted\s+)?share\b', re.IGNORECASE)
+GUIDANCE = re.compile(
+    r'\b(?:expects?|expected|outlook|guidance|anticipates?|forecasts?|projects?|targets?|will\s+be|range\s+of)\b',
+    re.IGNORECASE
+)
+FULL_YEAR = re.compile(
+    r'\b(?:full[-\s]year|fiscal\s+(?:year\s+)?(?:20)?\d{2}\b(?!\s+(?:first|second|third|fourth)\s+quarter)|'
+    r'twelve\s+months|12\s+months|year\s+ended|annual)\b',
+    re.IGNORECASE
+)
+# Only these words may directly precede "revenue"/"sales" in a headline figure; anything else
+# ("cost of", "subscription", "Data Center") qualifies it as a line item or segment.
+REVENUE_LEAD_WORD = re.compile(
+    r'(?:^|[,;:(]|\b(?:quarter|quarterly|year|annual|fiscal|full[-\s]year|total|net|gaap|reported|record|'
+    r'consolidated|company|our|its|the|q[1-4]|fy\s?\d{2,4}|\d{4}))\s*$',
+    re.IGNORECASE
+)
+REVENUE_SEGMENT = re.compile(r'\b(?:segment|division|business|unit|from)\b', re.IGNORECASE)
+QUARTER = re.compile(r'\b(?:quarter|quarterly|three\s+months|q[1-4])\b', re.IGNORECASE)
+SENTENCE_BREAK = re.compile(r'(?<=[.!?])\s+(?=[A-Z(])|\n+')
+UNIT_DIVISORS = {'billion': 1, 'bn': 1, 'b': 1, 'million': 1_000, 'mm': 1_000, 'm': 1_000, 'thousand': 1_000_000}
+
+def to_billions(value: str, unit: str) -> float:
+    """Normalise a matched amount to billions, rounded to two decimals like the LLM output."""
+    return round(float(value.replace(',', '')) / UNIT_DIVISORS[unit.lower()], 2)
+
+def _sentences(text: str) -> Iterator[str]:
+    for sentence in SENTENCE_BREAK.split(text):
+        sentence = sentence.strip()
+        if sentence and '$' in sentence:
+            yield sentence
+
+def _period(sentence: str, position: int) -> Optional[str]:
+    """Classify the clause leading up to position as current quarter, full year or guidance (None)."""
+    lead = sentence[:position]
+    if GUIDANCE.search(sentence):
+        return None
+    if FULL_YEAR.search(lead) and not QUARTER.search(lead[-40:]):
+        return 'full_year'
+    return 'current_quarter'
+
+def _is_non_gaap(lead: str) -> bool:
+    """Whether the nearest GAAP marker before the figure is a non-GAAP one."""
+    non_gaap = [m.start() for m in NON_GAAP.finditer(lead)]
+    gaap = [m.start() for m in GAAP.finditer(lead) if not NON_GAAP.match(lead, max(0, m.start() - 4))]
+    return bool(non_gaap) and (not gaap or non_gaap[-1] >= gaap[-1] - 4)
+
+def _revenue_match(sentence: str, match: "re.Match[str]") -> Optional[bool]:
+    """None when a revenue match is a line item or segment figure, else whether it is labelled total."""
+    label = match.group(0)[:match.start('value') - match.start()]
+    if label.lstrip().startswith('$'):
+        # "$1.93 billion in total revenue": the qualifier sits between the amount and the label.
+        return bool(re.search(r'\btotal\b', match.group(0), re.IGNORECASE))
+    if not REVENUE_LEAD_WORD.search(sentence[:match.start()]) or REVENUE_SEGMENT.search(label):
+        return None
+    return label.lower().startswith('total')
+
+def extract_fast_metrics(text: str) -> Dict[str, Any]:
+    """
+    Pull headline revenue, net income and EPS out of release text with compiled patterns,
+    in milliseconds and without the LLM. Figures use the LLM's key convention (amounts in
+    billions under *_billion keys, non-GAAP variants prefixed non_gaap_) in the same
+    metrics.current_quarter / metrics.full_year shape; forward-looking sentences are skipped
+    and the first mention of each metric (the headline) wins, except that total revenue is
+    preferred and segment or line-item revenue (cost of revenue, subscription revenue) ignored.
+    """
+    sections: Dict[str, Dict[str, float]] = {'current_quarter': {}, 'full_year': {}}
+    total_revenue: Dict[str, float] = {}
+    for sentence in _sentences(text):
+        for key, pattern in METRIC_PATTERNS:
+            for match in pattern.finditer(sentence):
+                period = _period(sentence, match.start('value'))
+                if period is None:
+                    continue
+                value = to_billions(match.group('value'), match.group('unit'))
+                if key == 'revenue_billion':
+                    is_total = _revenue_match(sentence, match)
+                    if is_total is None:
+                        continue
+                    if is_total:
+                        total_revenue.setdefault(period, value)
+                if 'sign' in match.groupdict() and match.group('sign').lower() == 'loss':
+                    value = -value
+                lead = sentence[:match.start('value')]
+                metric = f"non_gaap_{key}" if key.startswith('net_income') and _is_non_gaap(lead) else key
+                sections[period].setdefault(metric, value)
+        for pattern in EPS_PATTERNS:
+            for match in pattern.finditer(sentence):
+                period = _period(sentence, match.start('value'))
+                if period is None:
+                    continue
+                lead = sentence[:match.start('value')]
+                value = float(match.group('value'))
+                if match.group('neg') or match.group('paren') or LOSS_PER_SHARE.search(sentence[match.start():match.end() + 30]):
+                    value = -value
+                sections[period].setdefault('non_gaap_eps' if _is_non_gaap(lead) else 'eps', value)
+    # An explicit "total revenue" beats an earlier unqualified mention.
+    for period, value in total_revenue.items():
+        sections[period]['revenue_billion'] = value
+    return {'metrics': {period: values for period, values in sections.items() if values}}
@@ -1,16 +1,105 @@
-import io
 import uuid
 import json
+import time
 import boto3
 import base64
 import asyncio
 import PyPDF2
-import requests
-from groq import Groq, BadRequestError
+import concurrent.futures
+import httpx
+from groq import APIConnectionError, APIStatusError, BadRequestError
 from datetime import datetime, timezone
 from urllib.parse import urlparse
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+from .browser import USER_AGENT, launch_browser
+from .discovery import extract_json_links, fetch_head_text, hash_links, is_verified, new_http_client, parse_links, verification_terms
+from .polling import poll_delay, resolve_release_at
+from .network import RequestBlocker, merge_block_policies
+from .scoring import LinkMatcher
+from .content import reduce_content
+from .cache import cache_key, get_llm_cache
+from .llm import DEFAULT_LLM_CONCURRENCY, get_groq_channel, retry_delay
+from .jsonstream import IncrementalJSONParser
+from .chunking import DEFAULT_CHUNK_TOKENS, merge_partial_metrics, split_content
+from .fastpath import extract_fast_metrics
+from .writes import DEFAULT_WRITE_ATTEMPTS, get_durable_writer
+from .delivery import get_discord_queue
+from .artifacts import DEFAULT_ARTIFACT_CONFIG, artifact_objects, artifact_prefix
+from .sinks import DEFAULT_SINK_DIRECTORY, get_artifact_sink, get_message_sink
+from .pdf import (
+    DEFAULT_PDF_EXTRACT_TIMEOUT,
+    DEFAULT_PDF_MAX_BYTES,
+    DEFAULT_PDF_PAGE_BUDGET,
+    DEFAULT_PDF_STOP_MARKERS,
+    DEFAULT_PDF_TIMEOUT,
+    DEFAULT_PDF_WORKERS,
+    PARALLEL_MIN_PAGES,
+    extract_text_parallel,
+    extract_text_serial,
+    extract_text_until,
+    open_pdf,
+    warm_connection
+)
+
+GROQ_MODEL = "llama-3.3-70b-versatile"
+
+# Collects [href, anchor text] for every matched element in a single in-page evaluation.
+HARVEST_LINKS_JS = """
+els => els.map(el => [el.getAttribute('href'), (el.innerText || el.textContent || '').trim()])
+"""
+
+# Hints the browser to open DNS/TCP/TLS to the release host before navigation starts.
+PRECONNECT_JS = """
+origin => {
+    const link = document.createElement('link');
+    link.rel = 'preconnect';
+    link.href = origin;
+    document.head.appendChild(link);
+}
+"""
+
+def compare(actual: float, estimate: Optional[float]) -> str:
+    if actual is None:
+        actual = 0
+
+    if estimate is None:
+        estimate = 0
+
+    if actual > estimate:
+        return "🟢"
+    if actual < estimate:
+        return "🔴"
+    return "🟡"
+
+def reports_release_metrics(extracted_data: Dict[str, Any]) -> bool:
+    """Whether an extraction found any current, full-year or guidance figures; none means the wrong release."""
+    metrics: Dict[str, Any] = extracted_data.get("metrics") or {}
+    guidance: Dict[str, Any] = metrics.get("forward_guidance") or {}
+    return bool(
+        metrics.get("current_quarter") or metrics.get("full_year")
+        or guidance.get('next_quarter') or guidance.get('fiscal_year')
+    )
+
+def current_quarter_lines(current: Dict[str, Any], hist: Dict[str, Any]) -> List[str]:
+    lines: List[str] = []
+    for key, actual in current.items():
+        hist_val: Optional[float] = hist.get(f"current_{key}")
+        comp: str = compare(actual, hist_val)
+        lines.append(
+            f"{key.replace('billion', '').replace('_', ' ').title()}: ${actual}{'B' if 'billion' in key else ''} vs {hist_val}{'B' if 'billion' in key else ''} {comp}"
+        )
+    return lines
+
+def full_year_lines(full_year: Dict[str, Any], hist: Dict[str, Any]) -> List[str]:
+    lines: List[str] = []
+    for key, actual in full_year.items():
+        hist_val: Optional[float] = hist.get(f"full_year_{key}")
+        comp: str = compare(actual, hist_val)
+        lines.append(
+            f"Full Year {key.replace('_billion', '').replace('_', ' ').title()}: ${actual}{'B' if 'billion' in key else ''} vs {hist_val}{'B' if 'billion' in key else ''} {comp}"
+        )
+    return lines
 
 class IRWorkflow:
     def __init__(self, config: Dict[str, Any]):
@@ -20,7 +109,48 @@ class IRWorkflow:
             - selectors: List[str] for fallback scraping
             - verify_keywords: Dict[str, Any] for quarter/year verification (e.g., {"quarter": "Q3", "year": "24"})
             - extraction_method: 'pdf' or 'html'
+            - discovery_mode: 'browser' (default) or 'http' to poll server-rendered IR pages without Playwright;
+              http_fallback_polls polls without a positively scored link hand over to the browser (default 10)
+            - release_time: 'before', 'after' or 'HH:MM' US/Eastern, used to tighten polling around the release
+            - polling_config: Dict[str, Any] with min_interval/max_interval seconds and window_minutes/ramp_minutes
+            - pdf_max_bytes / pdf_timeout: size cap and (connect, read) timeout for streamed PDF downloads
+            - pdf_workers: int processes for page-parallel PDF extraction, 1 keeps the single-core path;
+              pdf_extract_timeout seconds bounds the parallel pass before falling back (default 60)
+            - pdf_early_exit: bool, send only the pages up to the outlook/guidance section (pdf_stop_markers regexes)
+              or pdf_page_budget pages to the LLM; the rest is parsed in the background for the artifact
+            - sniff_responses: bool, look for the release link in JSON XHR payloads before render; a sniffed
+              link is only used once its page verifies, so this needs html extraction (default False)
+            - verify_top_k: int candidates fetched concurrently to break ties at the top score (default 3)
+            - scoring_weights: Dict[str, float] weighting keyword hits in the href and anchor text (default href 1, text 0)
+            - block_policy / global_block_policy: Dict[str, List[str]] of resource_types, blocked_domains,
+              allowed_domains, blocked_url_patterns and allowed_url_patterns, merged over DEFAULT_BLOCK_POLICY
+            - content_reduction: bool, strip page chrome, low-density blocks and safe-harbor text before the
+              LLM call (default True); reduction_config tunes max_link_density, min_text_density and min_chars
+            - table_extraction: bool, send financial tables as compact CSV blocks after the prose (default True)
             - llm_instructions: Dict[str, Any] (e.g., system prompt, temperature)
+            - llm_cache: Dict[str, Any] with enabled, max_entries, ttl_seconds and a persistent tier in
+              directory or s3_bucket/s3_prefix; the in-process LRU is on by default
+            - llm_chunk_tokens: int estimated-token budget per LLM call; longer content is split into chunks
+              extracted concurrently and merged (default 0, off: everything goes in one call)
+            - llm_concurrency / llm_max_attempts: in-flight Groq requests per API key on the shared client
+              (default 4, set by the first workflow to use the key) and attempts on rate limits or server errors (default 6)
+            - llm_streaming: bool, stream single-call extractions and fire on_current_quarter as soon as the
+              current quarter block is complete, by default editing it into the preliminary Discord message
+              (default False; streaming runs without Groq JSON mode)
+            - fast_path: bool, pull headline revenue, net income and EPS out of the reduced content with
+              regexes before the LLM call for a preliminary comparison; the LLM result fills in and
+              corrects it, and fast-path figures the LLM missed are kept for estimates in json_data (default True)
+            - discord_two_phase: bool, post a preliminary Discord message as soon as the release link is verified,
+              edit in the fast-path figures, then edit it into the full analysis; a link that turns out to have no
+              release figures is retracted in place (default True, html extraction only since PDFs are not verified)
+            - discord_queue: Dict[str, Any] with rate/per_seconds (token bucket per webhook), max_attempts,
+              coalesce and coalesce_threshold for the shared Discord delivery queue (set by the first workflow)
+            - artifact_storage: Dict[str, Any] with codec ('gzip', 'zstd' or 'none'), level and
+              multipart_threshold/multipart_chunksize bytes for the artifact upload
+            - artifact_sink: 's3' (default, s3_artifact_bucket), 'local' or 'none'; message_sink: 'dynamodb'
+              (messages_table, default unless deployment_type is 'local'), 'local' or 'none'. Local sinks write
+              compressed artifact files and an append-only messages.ndjson under sink_directory
+            - write_max_attempts: int attempts for the background S3 artifact and DynamoDB message writes (default 3)
         """
         self.base_url: str = config.get("base_url", "")
         self.selector: list[str] = config.get('selector', 'a')
@@ -43,8 +173,79 @@ class IRWorkflow:
         self.s3_artifact_bucket = config.get("s3_artifact_bucket")
         self.browser = config.get('browser_type', 'chromium').lower()
         self.messages_table = config.get('messages_table')
+        self.discovery_mode: str = config.get("discovery_mode", "browser")
+        self.http_fallback_polls: int = int(config.get("http_fallback_polls", 10))
+        self.polling_config: Dict[str, Any] = config.get("polling_config", {})
+        self.release_at = resolve_release_at(config.get("release_time"))
+        self.request_blocker = RequestBlocker(
+            merge_block_policies(config.get("global_block_policy"), config.get("block_policy"))
+        )
+        self.scoring_weights: Dict[str, Any] = config.get("scoring_weights", {})
+        self._link_matcher = None
+        self.pdf_max_bytes: int = int(config.get("pdf_max_bytes", DEFAULT_PDF_MAX_BYTES))
+        self.pdf_timeout = tuple(config.get("pdf_timeout", DEFAULT_PDF_TIMEOUT))
+        self.pdf_workers: int = int(config.get("pdf_workers", DEFAULT_PDF_WORKERS))
+        self.pdf_extract_timeout: float = float(config.get("pdf_extract_timeout", DEFAULT_PDF_EXTRACT_TIMEOUT))
+        self.pdf_early_exit: bool = config.get("pdf_early_exit", False)
+        self.pdf_stop_markers: List[str] = config.get("pdf_stop_markers", DEFAULT_PDF_STOP_MARKERS)
+        self.pdf_page_budget: int = int(config.get("pdf_page_budget", DEFAULT_PDF_PAGE_BUDGET))
+        self.sniff_responses: bool = config.get("sniff_responses", False)
+        self.verify_top_k: int = int(config.get("verify_top_k", 3))
+        self.verify_bytes: int = int(config.get("verify_bytes", 32_768))
+        self.content_reduction: bool = config.get("content_reduction", True)
+        self.reduction_config: Dict[str, Any] = config.get("reduction_config", {})
+        self.table_extraction: bool = config.get("table_extraction", True)
+        self.content_stats: Dict[str, Any] = {}
+        self.llm_cache = get_llm_cache(config.get("llm_cache"))
+        self.llm_chunk_tokens: int = int(config.get("llm_chunk_tokens", DEFAULT_CHUNK_TOKENS))
+        self.llm_concurrency: int = int(config.get("llm_concurrency", DEFAULT_LLM_CONCURRENCY))
+        self.llm_max_attempts: int = int(config.get("llm_max_attempts", 6))
+        self.llm_streaming: bool = config.get("llm_streaming", False)
+        # Called with metrics.current_quarter as soon as it streams in; may return a coroutine.
+        # By default the streamed figures are edited into the preliminary Discord message.
+        self.on_current_quarter: Optional[Callable[[Dict[str, Any]], Any]] = (
+            self.announce_current_quarter if self.llm_streaming else None
+        )
+        self._early_metrics_sent = False
+        self._early_tasks: List[asyncio.Future] = []
+        self.fast_path: bool = config.get("fast_path", True)
+        self.fast_metrics: Dict[str, Any] = {}
+        self.preliminary_message: Optional[str] = None
+        self.artifact_config: Dict[str, Any] = {**DEFAULT_ARTIFACT_CONFIG, **config.get("artifact_storage", {})}
+        sink_directory: str = config.get("sink_directory", DEFAULT_SINK_DIRECTORY)
+        self.artifact_sink = get_artifact_sink(
+            config.get("artifact_sink", "s3"),
+            bucket=self.s3_artifact_bucket,
+            directory=sink_directory,
+            config=self.artifact_config
+        )
+        self.message_sink = get_message_sink(
+            config.get("message_sink", "none" if self.deployment_type == 'local' else "dynamodb"),
+            table_name=self.messages_table,
+            directory=sink_directory
+        )
+        self.write_max_attempts: int = int(config.get("write_max_attempts", DEFAULT_WRITE_ATTEMPTS))
+        self.pending_writes: List[asyncio.Future] = []
+        self.discord_two_phase: bool = config.get("discord_two_phase", True)
+        self.discord_message_id: Optional[str] = None
+        self.discord_queue_config: Dict[str, Any] = config.get("discord_queue", {})
+        # Kept across retried runs so a release is only announced once, unless it is retracted.
+        self._announcement: Optional[asyncio.Future] = None
+        self._announcement_edit: Optional[asyncio.Future] = None
+        self._verified_link: Optional[str] = None
+        self._retracted_links: Set[str] = set()
+        self.poll_count = 0
         self.message = None
         self.link = None
+        self._context = None
+        self._context_lock = None
+        self._playwright = None
+        self._owned_browser = None
+        self._release_page = None
+        self._preconnect_task = None
+        self._sniffed = None
+        self._sniff_rejected: Set[str] = set()
+        self._full_content_task = None
 
     def _get_discord_webhook_url(self):
         """Retrieve the Discord Webhook URL from AWS Secrets Manager."""
@@ -68,143 +269,332 @@ class IRWorkflow:
             else:
                 raise ValueError("Missing GROQ_API_SECRET_ARN environment variable")
 
-    def store_message_to_dynamo(self, message: str) -> None:
+    def store_message_to_dynamo(
+        self,
+        message: str,
+        message_id: Optional[str] = None,
+        discord_message_id: Optional[str] = None
+    ) -> None:
         """
-        Write the discord message to a DynamoDB table specified by self.messages_table.
+        Write the discord message record to the message sink (the DynamoDB table in
+        self.messages_table by default), with the webhook message id so the post can be
+        edited later. Errors are raised so the caller can retry; passing the same
+        message_id makes a retried write overwrite the same item.
         """
-        if self.deployment_type != 'local':
+        if self.message_sink is not None:
             timestamp: str = datetime.now(timezone.utc).isoformat()
-            message_id: str = str(uuid.uuid4())
+            message_id = message_id or str(uuid.uuid4())
 
-            dynamodb = boto3.resource("dynamodb", region_name="us-east-1")
-            table = dynamodb.Table(self.messages_table)
-            
-            try:
-                table.put_item(
-                    Item={
-                        "message_id": message_id,
-                        "ticker": self.ticker,
-                        "quarter": self.quarter,
-                        "year": self.year,
-                        "timestamp": timestamp,
-                        "discord_message": message
-                    }
-                )
-                print(f"Stored discord message with id {message_id} in table.")
-            except Exception as e:
-                print(f"Error storing discord message to DynamoDB: {e}")
+            location = self.message_sink.put({
+                "message_id": message_id,
+                "ticker": self.ticker,
+                "quarter": self.quarter,
+                "year": self.year,
+                "timestamp": timestamp,
+                "discord_message": message,
+                "discord_message_id": discord_message_id
+            })
+            print(f"Stored discord message with id {message_id} in {location}.")
 
     def get_base_url(self, url: str) -> str:
         parsed_url = urlparse(url)
         return f"{parsed_url.scheme}://{parsed_url.netloc}"
 
-    async def launch_browser_and_open_page(self, p, browser = None):
-        if browser is None:
-            print(f'Launching browser: {self.browser}')
-            browser = p.chromium    
-            if self.browser == 'firefox':
-                browser = p.firefox
-
-            browser = await browser.launch(
-                headless=True,
-                args=[
-                    "--disable-gpu",
-                    "--disable-dev-shm-usage",
-                    "--disable-software-rasterizer",
-                    "--headless=new"
-                ]
-            )
-        context = await browser.new_context(
-            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                        "AppleWebKit/537.36 (KHTML, like Gecko) "
-                        "Chrome/121.0.0.0 Safari/537.36",
+    async def new_context(self, browser):
+        return await browser.new_context(
+            user_agent=USER_AGENT,
             ignore_https_errors=True,
             locale='en-US',
             bypass_csp=True,
             java_script_enabled=True
         )
-        
+
+    async def open_page(self, context):
         page = await context.new_page()
-        await page.route("**/*", lambda route: route.abort()
-            if route.request.resource_type in ["image", "stylesheet", "font"]
-            else route.continue_())
-            
+        await page.route("**/*", self.request_blocker.handle)
+        page.on("requestfinished", self.request_blocker.on_request_finished)
+        return page
+
+    async def launch_browser_and_open_page(self, p, browser = None):
+        if browser is None:
+            browser = await launch_browser(p, self.browser)
+        context = await self.new_context(browser)
+        page = await self.open_page(context)
         return page, browser
 
-    async def _scrape_ir_page_for_link(self, page) -> Optional[str]:
+    async def _scrape_ir_page_for_link(self, page, http_client: Optional[httpx.AsyncClient] = None) -> Optional[str]:
         attempt = 0
         domcontentloaded_timeout_count = 0
         waitforselector_timeout_count = 0
+        links_hash = None
+        poll_started = None
+        self._sniffed = asyncio.get_running_loop().create_future()
+        self._sniff_rejected = set()
+        if self.sniff_responses:
+            page.on("response", self._sniff_response)
         while True:
             if attempt == 8:
                 break
+            await self._until_sniffed(self._wait_for_next_poll(poll_started))
+            if self._sniffed.done() and (link := await self._take_sniffed_link(http_client)):
+                return link
+            poll_started = time.monotonic()
+            self.poll_count += 1
             print(f"Iteration {attempt+1} of 8")
 
             try:
                 timeout = 5_000 if domcontentloaded_timeout_count < 3 else 10_000
-                await page.goto(self.base_url, wait_until="domcontentloaded", timeout=timeout)
+                await self._until_sniffed(page.goto(self.base_url, wait_until="domcontentloaded", timeout=timeout))
             except PlaywrightTimeoutError as e:
                 print('timeout reached, attempting to pull content thats there')
                 domcontentloaded_timeout_count += 1
             except Exception as e:
                 print(f"Error during page.goto (networkidle): {e}")
+            if self._sniffed.done() and (link := await self._take_sniffed_link(http_client)):
+                return link
 
             try:
                 timeout = 5_000 if waitforselector_timeout_count < 3 else 10_000
-                await page.wait_for_selector(self.selector, timeout=timeout)
+                await self._until_sniffed(page.wait_for_selector(self.selector, timeout=timeout))
             except PlaywrightTimeoutError as e:
                 print(f"Timeout waiting for selector '{self.selector}': {e}")
                 waitforselector_timeout_count += 1
             except Exception as e:
                 print(f"Error waiting for selector '{self.selector}': {e}")
                 attempt+=1
+            if self._sniffed.done() and (link := await self._take_sniffed_link(http_client)):
+                return link
 
             print('Extracted page content')
-            elements = []
+            links = []
             try:
-                elements = await page.query_selector_all(self.selector)
-                print(f"Found {len(elements)} elements with selector '{self.selector}'")
+                links = await page.eval_on_selector_all(self.selector, HARVEST_LINKS_JS)
+                print(f"Found {len(links)} elements with selector '{self.selector}'")
             except Exception as e:
                 print('error reading selectors from page')
 
-            if not elements:
+            if not links:
                 print(f"No elements found in in iteration {attempt+1}. Decrementing 1 from the attempt.")
                 attempt -=1
                 continue
+
+            current_hash = hash_links(links)
+            if current_hash == links_hash:
+                print(f"Anchor set unchanged in iteration {attempt+1}, skipping candidate scoring")
+                attempt -=1
+                continue
             
             print('Refining element list')
-            keywords = self._generate_search_keywords()
-            candidates = []
-            for el in elements:
-                href = await el.get_attribute("href")
-                if not href or href in self.url_ignore_list:
-                    continue
-                if self.extraction_method == 'pdf' and not href.endswith(self.extraction_method):
-                    continue
-                if any(ignore_word.lower() in href.lower() for ignore_word in self.href_ignore_words):
-                    continue
-                
-                href_lower = href.lower()
-                match_count: int = sum(1 for kw in keywords if kw in href_lower)
-                candidates.append((match_count, el, href))
-
-            candidates.sort(key=lambda x: x[0], reverse=True)
-            best_priority, best_el, best_href = candidates[0]
+            candidates = self._rank_link_candidates(links)
+            best_priority, best_href = candidates[0] if candidates else (0, None)
             print(f"Best candidate found with priority {best_priority}: {best_href}")
             if best_priority > 0:
-                print(f"Returning link: {best_href}")
-                if best_href.startswith('/'):
-                    best_href = self.get_base_url(self.base_url) + best_href
-                self.link = best_href
-                return best_href
+                return self._set_link(await self._select_candidate(candidates, http_client))
             else:
                 print(f"No candidate with sufficient priority found in iteration {attempt+1}. Decrementing 1 from the attempt")
+                links_hash = current_hash
                 attempt -=1
         
         attempt +=1
         await asyncio.sleep(3)
         raise Exception(f"Earnings link not found after {attempt+1} iterations.")
 
+    async def _until_sniffed(self, awaitable) -> Any:
+        """Await awaitable, abandoning it early once the response sniffer has found the release link."""
+        task = asyncio.ensure_future(awaitable)
+        await asyncio.wait({task, self._sniffed}, return_when=asyncio.FIRST_COMPLETED)
+        if not task.done():
+            task.cancel()
+            return None
+        return task.result()
+
+    async def _take_sniffed_link(self, http_client: Optional[httpx.AsyncClient]) -> Optional[str]:
+        """
+        Use the sniffed candidates only if one of them verifies. Sniffed payloads skip the
+        selector scoping, so an events feed or last quarter's item could otherwise win;
+        unverified candidates are set aside and the sniffer re-armed for the next payload.
+        """
+        candidates = self._sniffed.result()
+        href = await self._select_candidate(candidates, http_client, require_verified=True)
+        if href is None:
+            print("No sniffed candidate verified, reading the page instead")
+            self._sniff_rejected.update(href for _, href in candidates)
+            self._sniffed = asyncio.get_running_loop().create_future()
+            return None
+        return self._set_link(href)
+
+    async def _sniff_response(self, response) -> None:
+        """
+        Look for the release link in JSON XHR/fetch payloads (e.g. Q4 press-release feeds)
+        as they arrive, so JS-rendered IR pages resolve before the list is rendered.
+        """
+        sniffed = self._sniffed
+        if sniffed is None or sniffed.done():
+            return
+        if response.request.resource_type not in ("xhr", "fetch"):
+            return
+        try:
+            payload = await response.json()
+        except Exception:
+            return
+        candidates = [
+            (priority, href) for priority, href in self._rank_link_candidates(extract_json_links(payload))
+            if href not in self._sniff_rejected
+        ]
+        if candidates and candidates[0][0] > 0 and not sniffed.done():
+            print(f"Release link found in {response.url} payload with priority {candidates[0][0]}: {candidates[0][1]}")
+            sniffed.set_result(candidates)
+
+    async def _scrape_ir_page_over_http(self, http_client: httpx.AsyncClient) -> Optional[str]:
+        """
+        Poll base_url over plain HTTP and score its anchors without a browser.
+        Sends conditional-GET headers and skips scoring when the page or its anchor set is unchanged.
+        Returns None when http_fallback_polls polls in a row yield no positively scored link
+        (e.g. the list is rendered client-side and only nav anchors are static) or the site
+        keeps erroring, so the caller can fall back to Playwright.
+        """
+        failures = 0
+        iteration = 0
+        unmatched_polls = 0
+        validators: Dict[str, str] = {}
+        links_hash = None
+        poll_started = None
+        while unmatched_polls < self.http_fallback_polls:
+            await self._wait_for_next_poll(poll_started)
+            poll_started = time.monotonic()
+            iteration += 1
+            self.poll_count += 1
+            try:
+                response = await http_client.get(self.base_url, headers=validators)
+                self.request_blocker.record_allowed(len(response.content))
+                # httpx treats 304 as an error; here it is the expected unchanged-page answer.
+                if response.status_code != 304:
+                    response.raise_for_status()
+            except httpx.HTTPError as e:
+                failures += 1
+                print(f"Error fetching {self.base_url} over http: {e}")
+                if failures == 3:
+                    return None
+                continue
+            failures = 0
+
+            if response.status_code == 304:
+                print(f"Page not modified in iteration {iteration}")
+                unmatched_polls += 1
+                continue
+            if etag := response.headers.get("etag"):
+                validators["If-None-Match"] = etag
+            if last_modified := response.headers.get("last-modified"):
+                validators["If-Modified-Since"] = last_modified
+
+            links = parse_links(response.text, self.selector)
+            current_hash = hash_links(links)
+            if current_hash == links_hash:
+                print(f"Anchor set unchanged in iteration {iteration}, skipping candidate scoring")
+            else:
+                candidates = self._rank_link_candidates(links)
+                if not candidates:
+                    print(f"No candidate links found over http for selector '{self.selector}', falling back to browser")
+                    return None
+
+                best_priority, best_href = candidates[0]
+                if best_priority > 0:
+                    print(f"Best candidate found over http with priority {best_priority}: {best_href}")
+                    return self._set_link(await self._select_candidate(candidates, http_client))
+                print(f"No candidate with sufficient priority found over http in iteration {iteration}")
+                links_hash = current_hash
+            unmatched_polls += 1
+        print(f"No positively scored link over http after {unmatched_polls} polls, falling back to browser")
+        return None
+
+    async def _wait_for_next_poll(self, poll_started: Optional[float]) -> None:
+        """Space poll starts by poll_delay, which tightens around the scheduled release_time."""
+        if poll_started is None:
+            return
+        delay = poll_delay(self.release_at, self.polling_config)
+        remaining = delay - (time.monotonic() - poll_started)
+        if remaining > 0:
+            await asyncio.sleep(remaining)
+
+    async def _select_candidate(
+        self,
+        candidates: List[Tuple[float, str]],
+        http_client: Optional[httpx.AsyncClient],
+        require_verified: bool = False
+    ) -> Optional[str]:
+        """
+        Pick the link to extract. When the best score is tied, speculatively fetch the first
+        kilobytes of the top verify_top_k candidates concurrently and return the first one that
+        mentions the quarter, year and ticker, cancelling the rest. Falls back to the top
+        candidate when nothing verifies, and skips verification for PDFs. With
+        require_verified even a single top candidate is checked, and None is returned
+        when nothing verifies (or verification is impossible).
+        """
+        best_priority, best_href = candidates[0]
+        tied = sum(1 for priority, _ in candidates if priority == best_priority)
+        hrefs = [href for priority, href in candidates if priority == best_priority and priority > 0][:self.verify_top_k]
+        if not hrefs or http_client is None or self.extraction_method == 'pdf':
+            return None if require_verified else best_href
+        if not require_verified and (tied < 2 or len(hrefs) < 2):
+            return best_href
+
+        terms = verification_terms(self.quarter, self.year, self.ticker)
+        print(f"Verifying top {len(hrefs)} of {tied} candidates at priority {best_priority}")
+        async def fetch(href: str) -> Tuple[str, str]:
+            return href, await fetch_head_text(http_client, self._resolve_href(href), self.verify_bytes)
+
+        tasks = [asyncio.ensure_future(fetch(href)) for href in hrefs]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                try:
+                    href, head = await next_done
+                except Exception as e:
+                    print(f"Error verifying candidate: {e}")
+                    continue
+                if is_verified(head, terms):
+                    print(f"Verified candidate: {href}")
+                    self._verified_link = self._resolve_href(href)
+                    return href
+        finally:
+            for task in tasks:
+                task.cancel()
+        if require_verified:
+            return None
+        print(f"No candidate verified, falling back to {best_href}")
+        return best_href
+
+    def _resolve_href(self, href: str) -> str:
+        if href.startswith('/'):
+            return self.get_base_url(self.base_url) + href
+        return href
+
+    def _set_link(self, href: str) -> str:
+        print(f"Returning link: {href}")
+        href = self._resolve_href(href)
+        self.link = href
+        if self.extraction_method == 'pdf':
+            self._preconnect_task = asyncio.ensure_future(asyncio.to_thread(warm_connection, href, self.pdf_timeout))
+        elif self._release_page is not None:
+            self._preconnect_task = asyncio.ensure_future(self._preconnect(href))
+        return href
+
+    def _rank_link_candidates(self, links: List[List[str]]) -> List[Tuple[float, str]]:
+        """
+        Filter harvested [href, text] pairs and score them with the compiled LinkMatcher.
+
+        Returns:
+            List of (score, href) tuples, best candidate first
+        """
+        if self._link_matcher is None:
+            self._link_matcher = LinkMatcher(
+                self._generate_search_keywords(),
+                url_ignore_list=self.url_ignore_list,
+                href_ignore_words=self.href_ignore_words,
+                extraction_method=self.extraction_method,
+                weights=self.scoring_weights
+            )
+        return self._link_matcher.rank(links)
+
     def _generate_search_keywords(self) -> List[str]:
         """
         Generate a list of search keywords based on verification criteria.
@@ -241,17 +631,39 @@ class IRWorkflow:
 
     def extract_pdf_text(self, pdf_url: str) -> str:
         """
-        Download PDF and extract text using PyPDF2, applying custom editing if provided.
+        Stream the PDF over the pooled session into a memory-mapped temp file and extract text using PyPDF2.
+        Long documents are split into page ranges extracted in the shared process pool; short ones,
+        or any failure in the pool, use the single-core path.
         """
-        response = requests.get(pdf_url)
-        response.raise_for_status()
-        pdf_bytes: bytes = response.content
-        reader: PyPDF2.PdfReader = PyPDF2.PdfReader(io.BytesIO(pdf_bytes))
-        text = ""
-        for page in reader.pages:
-            page_text = page.extract_text() or ""
-            text += page_text + "\n"
-        return text
+        with open_pdf(pdf_url, timeout=self.pdf_timeout, max_bytes=self.pdf_max_bytes) as (buffer, path):
+            return self._extract_pdf_pages(PyPDF2.PdfReader(buffer), path)
+
+    def _extract_pdf_pages(self, reader: PyPDF2.PdfReader, path: str, start: int = 0) -> str:
+        num_pages = len(reader.pages)
+        if self.pdf_workers > 1 and num_pages - start >= PARALLEL_MIN_PAGES:
+            try:
+                return extract_text_parallel(path, num_pages, self.pdf_workers, start, self.pdf_extract_timeout)
+            except Exception as e:
+                print(f"Parallel PDF extraction failed, falling back to a single core: {e}")
+        return extract_text_serial(reader, start)
+
+    def extract_pdf_text_incrementally(self, pdf_url: str, head: concurrent.futures.Future) -> str:
+        """
+        Early-exit extraction: read pages until the outlook/guidance section or the page budget
+        is reached and hand that text to head right away, then keep parsing the remaining pages
+        for the artifact. Returns the full document text.
+        """
+        try:
+            with open_pdf(pdf_url, timeout=self.pdf_timeout, max_bytes=self.pdf_max_bytes) as (buffer, path):
+                reader: PyPDF2.PdfReader = PyPDF2.PdfReader(buffer)
+                head_text, pages_read = extract_text_until(reader, self.pdf_stop_markers, self.pdf_page_budget)
+                print(f"Extracted {pages_read} of {len(reader.pages)} PDF pages before early exit")
+                head.set_result(head_text)
+                return head_text + self._extract_pdf_pages(reader, path, pages_read)
+        except Exception as e:
+            if not head.done():
+                head.set_exception(e)
+            raise
 
     async def extract_html_text(
         self, 
@@ -288,73 +700,196 @@ class IRWorkflow:
                 print(f"Error extracting content: {e}")
         return ""
 
-    def punt_message_to_discord(self, discord_message: str) -> None:
+    async def punt_message_to_discord(self, discord_message: str, coalescible: bool = False) -> Optional[str]:
+        """
+        Post a new webhook message through the shared delivery queue and return its Discord
+        message id (None when local or rejected). Only messages that will never be edited
+        should be coalescible, since a merged message is shared with other tickers.
+        """
         if self.deployment_type != 'local':
-            requests.post(
-                self.discord_webhook_url, 
-                json={
-                    "content": discord_message,
-                    "username": "EarningsEar"
-                }
-            )
+            queue = get_discord_queue(self.discord_queue_config)
+            try:
+                message_id = await queue.post(self.discord_webhook_url, discord_message, coalescible, label=self.ticker)
+            except Exception as e:
+                print(f'Discord rejected message for {self.ticker}: {e}')
+                return None
             print('message sent to discord')
+            return message_id
+        return None
+
+    async def edit_discord_message(self, message_id: str, discord_message: str) -> None:
+        """Replace the content of a message previously posted through the webhook."""
+        if self.deployment_type != 'local':
+            queue = get_discord_queue(self.discord_queue_config)
+            await queue.edit(self.discord_webhook_url, message_id, discord_message, label=self.ticker)
+            print(f'discord message {message_id} updated')
+
+    async def announce_if_verified(self, link: str, http_client: Optional[httpx.AsyncClient]) -> None:
+        """
+        Announce link once its first kilobytes mention the quarter, year and ticker, unless it
+        already verified while breaking a tie. PDFs, links that fail verification and links
+        retracted by an earlier run get no preliminary message, only the final analysis.
+        """
+        if not self.discord_two_phase or self._announcement is not None or link in self._retracted_links:
+            return
+        if link != self._verified_link:
+            if http_client is None or self.extraction_method == 'pdf':
+                return
+            try:
+                head = await fetch_head_text(http_client, link, self.verify_bytes)
+            except Exception as e:
+                print(f"Error verifying {link} before announcing it: {e}")
+                return
+            if not is_verified(head, verification_terms(self.quarter, self.year, self.ticker)):
+                print(f"{link} did not verify, holding the preliminary Discord message")
+                return
+        self.announce_release(link)
 
-    async def extract_earnings_content(self, link: str, p, browser) -> str:
+    def announce_release(self, link: str) -> None:
+        """
+        Post the preliminary message for a verified release link in the background. Runs once
+        per workflow, so a retried run edits the same message instead of announcing again.
+        """
+        if not self.discord_two_phase or self._announcement is not None:
+            return
+        self._announcement = asyncio.ensure_future(self.punt_message_to_discord(
+            f"### ${self.ticker.upper()} Q{self.quarter} Earnings Released\n{link}\nAnalysis to follow..."
+        ))
+
+    def update_announcement(self, discord_message: str) -> None:
+        """Queue an in-place edit of the preliminary message; edits apply in the order queued."""
+        announcement = self._announcement
+        if announcement is None:
+            return
+        previous = self._announcement_edit
+
+        async def edit() -> None:
+            if previous is not None:
+                await asyncio.gather(previous, return_exceptions=True)
+            message_id = await self._announced_message_id(announcement)
+            if message_id:
+                await self.edit_discord_message(message_id, discord_message)
+
+        self._announcement_edit = asyncio.ensure_future(edit())
+
+    async def retract_announcement(self, link: str) -> None:
+        """
+        Edit the preliminary message into a retraction when link turns out not to be the
+        release, and forget it so a retried run announces the right link instead.
+        """
+        if self._announcement is None:
+            return
+        self.update_announcement(
+            f"### ${self.ticker.upper()} Q{self.quarter} Earnings Released\n~~{link}~~\n"
+            "Wrong link, still looking for the release..."
+        )
+        for result in await asyncio.gather(self._announcement_edit, return_exceptions=True):
+            if isinstance(result, Exception):
+                print(f"Retracting the preliminary Discord message for {self.ticker} failed: {result}")
+        self._retracted_links.add(link)
+        self._announcement = None
+        self._announcement_edit = None
+
+    def announce_current_quarter(self, current_quarter: Dict[str, Any]) -> None:
+        """Edit the streamed current quarter comparison into the preliminary message."""
+        lines = current_quarter_lines(current_quarter, json.loads(self.json_data))
+        if lines:
+            self.update_announcement(
+                f"### ${self.ticker.upper()} Q{self.quarter} Current Quarter\n" + "\n".join(lines)
+                + f"\n{self.link}\nFull analysis to follow..."
+            )
+
+    async def _announced_message_id(self, announcement: Optional[asyncio.Future] = None) -> Optional[str]:
+        announcement = announcement or self._announcement
+        if announcement is None:
+            return None
+        try:
+            return await announcement
+        except Exception as e:
+            print(f"Preliminary Discord post for {self.ticker} failed: {e}")
+            return None
+
+    async def send_final_message(self, discord_message: str) -> Optional[str]:
+        """
+        Edit the preliminary message into the full analysis, or post it as a new message
+        when there is none or the edit fails. Returns the Discord message id.
+        """
+        if self._announcement_edit is not None:
+            for result in await asyncio.gather(self._announcement_edit, return_exceptions=True):
+                if isinstance(result, Exception):
+                    print(f"Preliminary Discord edit for {self.ticker} failed: {result}")
+        message_id = await self._announced_message_id()
+        if message_id:
+            try:
+                await self.edit_discord_message(message_id, discord_message)
+                return message_id
+            except Exception as e:
+                print(f"Editing Discord message {message_id} failed, posting a new one: {e}")
+        return await self.punt_message_to_discord(discord_message, coalescible=True)
+
+    async def extract_earnings_content(self, link: str) -> str:
         content = None
-        if self.extraction_method == "pdf":
-            content = self.extract_pdf_text(link)
+        if self.extraction_method == "pdf" and self.pdf_early_exit:
+            head = concurrent.futures.Future()
+            self._full_content_task = asyncio.ensure_future(
+                asyncio.to_thread(self.extract_pdf_text_incrementally, link, head)
+            )
+            try:
+                content = await asyncio.wrap_future(head)
+            except Exception:
+                await asyncio.gather(self._full_content_task, return_exceptions=True)
+                self._full_content_task = None
+                raise
+        elif self.extraction_method == "pdf":
+            content = await asyncio.to_thread(self.extract_pdf_text, link)
         else:
             print('Extracting content from webpage')
-            page, browser = await self.launch_browser_and_open_page(p, browser = browser)
-            content = await self.extract_html_text(link, page)
-            await browser.close()
+            page = await self._take_release_page()
+            try:
+                content = await self.extract_html_text(link, page, extract_html=self.content_reduction or self.table_extraction)
+            finally:
+                await page.close()
 
         if not content:
             raise Exception('Content was not able to be scraped')
 
         return content
 
+    def reduce_earnings_content(self, content: str) -> str:
+        """
+        Trim scraped content down to the release itself and its tables to CSV blocks
+        before it goes to the LLM.
+        """
+        if not self.content_reduction and not self.table_extraction:
+            return content
+        reduced, self.content_stats = reduce_content(
+            content,
+            is_html=self.extraction_method != 'pdf',
+            config=self.reduction_config,
+            prune=self.content_reduction,
+            tables=self.table_extraction
+        )
+        print(
+            f"Reduced {self.ticker} content from ~{self.content_stats['tokens_before']} "
+            f"to ~{self.content_stats['tokens_after']} tokens with {self.content_stats['tables']} tables"
+        )
+        return reduced
+
     def analyze_financial_metrics(self, extracted_data: dict) -> str:
         hist: Dict[str, Any] = json.loads(self.json_data)
         metrics: Dict[str, Any] = extracted_data.get("metrics", {})
-        if not metrics.get("current_quarter") and not metrics.get("full_year") and not metrics.get("forward_guidance").get('next_quarter') and not metrics.get("forward_guidance").get('fiscal_year'):
+        if not reports_release_metrics(extracted_data):
             raise Exception('Looks like earnings were attempting to be scraped from the wrong link.')
 
-        def compare(actual: float, estimate: Optional[float]) -> str:
-            if actual is None:
-                actual = 0
-
-            if estimate is None:
-                estimate = 0
-
-            if actual > estimate:
-                return "🟢"
-            if actual < estimate:
-                return "🔴"
-            return "🟡"
-
         messages: List[str] = []
 
         # Process current quarter metrics
-        current: Dict[str, Any] = metrics.get("current_quarter", {})
-        for key, actual in current.items():
-            hist_val: Optional[float] = hist.get(f"current_{key}")
-            comp: str = compare(actual, hist_val)
-            messages.append(
-                f"{key.replace('billion', '').replace('_', ' ').title()}: ${actual}{'B' if 'billion' in key else ''} vs {hist_val}{'B' if 'billion' in key else ''} {comp}"
-            )
+        messages.extend(current_quarter_lines(metrics.get("current_quarter", {}), hist))
 
         messages.append('\n')
 
         # Process full year metrics, if available
-        full_year: Dict[str, Any] = metrics.get("full_year", {})
-        if full_year:
-            for key, actual in full_year.items():
-                hist_val: Optional[float] = hist.get(f"full_year_{key}")
-                comp: str = compare(actual, hist_val)
-                messages.append(
-                    f"Full Year {key.replace('_billion', '').replace('_', ' ').title()}: ${actual}{'B' if 'billion' in key else ''} vs {hist_val}{'B' if 'billion' in key else ''} {comp}"
-                )
+        messages.extend(full_year_lines(metrics.get("full_year", {}), hist))
 
         # Process forward guidance metrics
         forward_guidance: Dict[str, Any] = metrics.get("forward_guidance", {})
@@ -395,61 +930,203 @@ class IRWorkflow:
         self.message = final_message[:2000]
         return self.message
 
+    def extract_preliminary_metrics(self, content: str) -> Dict[str, Any]:
+        """
+        Run the regex fast path over the reduced content and build the preliminary
+        comparison against json_data, ahead of the LLM call.
+        """
+        started = time.perf_counter()
+        self.fast_metrics = extract_fast_metrics(content)
+        metrics: Dict[str, Any] = self.fast_metrics["metrics"]
+        hist: Dict[str, Any] = json.loads(self.json_data)
+        lines = current_quarter_lines(metrics.get("current_quarter", {}), hist)
+        lines.extend(full_year_lines(metrics.get("full_year", {}), hist))
+        if lines:
+            self.preliminary_message = (
+                f"### ${self.ticker.upper()} Q{self.quarter} Preliminary Results\n" + "\n".join(lines)
+            )[:2000]
+        print(
+            f"Fast path found {sum(len(values) for values in metrics.values())} {self.ticker} metrics "
+            f"in {(time.perf_counter() - started) * 1000:.1f}ms"
+        )
+        return self.fast_metrics
+
+    def enrich_metrics(self, llm_metrics: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Combine the LLM response with the fast-path figures. LLM values win wherever both
+        report a metric; fast-path figures only fill gaps for metrics json_data has an
+        estimate for, so the message gains comparisons rather than unmatched lines. A response
+        without any metrics is returned untouched, so the wrong-link check still rejects it.
+        """
+        fast: Dict[str, Any] = self.fast_metrics.get("metrics", {})
+        if "error" in llm_metrics or not fast or not reports_release_metrics(llm_metrics):
+            return llm_metrics
+        hist: Dict[str, Any] = json.loads(self.json_data)
+        prefixes = {"current_quarter": "current_", "full_year": "full_year_"}
+        comparable = {
+            period: {key: value for key, value in values.items() if f"{prefixes[period]}{key}" in hist}
+            for period, values in fast.items()
+        }
+        enriched, conflicts = merge_partial_metrics([llm_metrics, {"metrics": comparable}])
+        for conflict in conflicts:
+            print(f"Fast path disagrees with LLM for {self.ticker}: {conflict}")
+        return enriched
+
     async def extract_financial_metrics(self, content: str) -> Dict[str, Any]:
         """
         Sends the PDF text to a GPT-like service and returns a dictionary
         with extracted financial metrics such as EPS, net sales, and operating income.
-        Retries the API call on JSON decode or BadRequest errors.
+        Retries the API call on JSON decode or BadRequest errors. Parsed responses are
+        cached by a hash of the content, prompt, model and temperature, so a rerun on
+        identical content skips the call; responses without any metrics (a wrong release)
+        are never cached. Content over llm_chunk_tokens is split into sections that are
+        extracted concurrently and merged back into one response.
+        Otherwise, with llm_streaming, the response is streamed and on_current_quarter is
+        called as soon as the current quarter metrics are complete.
         """
-        max_attempts: int = 3
-        delay: float = 1.0
-
         prompt = self.llm_instructions.get('system')
         if self.deployment_type != 'local':
             prompt = base64.b64decode(prompt).decode("utf-8")
 
-        for attempt in range(max_attempts):
-            try:
-                client = Groq(api_key=self.groq_api_key)
-                response = client.chat.completions.create(
-                    model="llama-3.3-70b-versatile",
-                    messages=[
-                        {
-                            "role": "system",
-                            "content": f'''
+        system_message = f'''
                             Follow the below steps unless the provided information is empty or does not contain the earnings press release for {self.ticker} for {self.quarter} {self.year}
                             DO NOT MAKE UP METRICS, ONLY USE NUMBERS PROVIDED IN THE CONTENT OF THE NEXT MESSAGE
                             {prompt}
                             '''
-                        },
-                        {
-                            "role": "user",
-                            "content": content
-                        }
-                    ],
-                    temperature=int(float(self.llm_instructions.get('temperature'))),
-                    response_format={"type": "json_object"}
+        temperature = int(float(self.llm_instructions.get('temperature')))
+        key = cache_key(content, system_message, GROQ_MODEL, temperature)
+        if self.llm_cache is not None:
+            cached = await asyncio.to_thread(self.llm_cache.get, key)
+            if cached is not None and reports_release_metrics(cached):
+                print(f"LLM cache hit for {self.ticker} ({key[:12]})")
+                return cached
+
+        chunks = split_content(content, self.llm_chunk_tokens) if self.llm_chunk_tokens else [content]
+        if len(chunks) == 1:
+            metrics = await self._complete_metrics(system_message, content, temperature, stream=self.llm_streaming)
+            for result in await asyncio.gather(*self._early_tasks, return_exceptions=True):
+                if isinstance(result, Exception):
+                    print(f"Early metrics callback for {self.ticker} failed: {result}")
+            self._early_tasks = []
+        else:
+            print(f"Extracting {self.ticker} metrics from {len(chunks)} chunks concurrently")
+            partials = await asyncio.gather(*(
+                self._complete_metrics(
+                    system_message,
+                    f"[Part {index} of {len(chunks)} of the release]\n{chunk}",
+                    temperature
                 )
+                for index, chunk in enumerate(chunks, start=1)
+            ))
+            metrics, conflicts = merge_partial_metrics(partials)
+            for conflict in conflicts:
+                print(f"Chunk merge conflict for {self.ticker}: {conflict}")
+
+        # Responses the wrong-link check would reject are not cached, so a retry asks again.
+        if self.llm_cache is not None and "error" not in metrics and reports_release_metrics(metrics):
+            await asyncio.to_thread(self.llm_cache.put, key, metrics)
+        return metrics
+
+    async def _complete_metrics(
+        self,
+        system_message: str,
+        content: str,
+        temperature: int,
+        stream: bool = False
+    ) -> Dict[str, Any]:
+        """
+        One Groq JSON completion over the worker's shared async client for this key. Rate limits,
+        server errors and dropped connections are retried after the delay the server asks for
+        (or an exponential backoff), up to llm_max_attempts; JSON decode or BadRequest errors
+        are retried up to three times. With stream, the completion is parsed as it arrives.
+        """
+        max_attempts: int = 3
+        delay: float = 1.0
+        failed_parses = 0
+        transient_failures = 0
+        channel = get_groq_channel(self.groq_api_key, self.llm_concurrency)
+        messages = [
+            {
+                "role": "system",
+                "content": system_message
+            },
+            {
+                "role": "user",
+                "content": content
+            }
+        ]
 
-                content: str = response.choices[0].message.content
-                metrics: Dict[str, Any] = json.loads(content)
+        while True:
+            try:
+                if stream:
+                    return await self._stream_metrics(channel, messages, temperature)
+
+                response = await channel.complete(
+                    model=GROQ_MODEL,
+                    messages=messages,
+                    temperature=temperature,
+                    response_format={"type": "json_object"}
+                )
+                response_content: str = response.choices[0].message.content
+                metrics: Dict[str, Any] = json.loads(response_content)
                 return metrics
 
             except (json.JSONDecodeError, BadRequestError) as e:
-                if attempt == max_attempts - 1:
+                failed_parses += 1
+                if failed_parses == max_attempts:
                     return {"error": f"Failed to parse metrics from GPT response after retries: {e}"}
                 await asyncio.sleep(delay)
                 delay *= 2
 
+            except (APIStatusError, APIConnectionError) as e:
+                wait = retry_delay(e, transient_failures)
+                transient_failures += 1
+                if wait is None or transient_failures >= self.llm_max_attempts:
+                    raise
+                if getattr(e, "status_code", None) == 429:
+                    channel.block_for(wait)
+                print(f"Groq call for {self.ticker} failed with {e.__class__.__name__}, retrying in {wait:.1f}s")
+                await asyncio.sleep(wait)
+
+    async def _stream_metrics(self, channel, messages: List[Dict[str, str]], temperature: int) -> Dict[str, Any]:
+        """
+        Stream the completion through an incremental JSON parser and hand metrics.current_quarter
+        to on_current_quarter the moment its object closes, before sentiment and the rest arrive.
+        JSON mode is unavailable when streaming, so fences or preamble around the object are skipped.
+        """
+        started = time.monotonic()
+        parser = IncrementalJSONParser()
+
+        def current_quarter_ready(current_quarter: Dict[str, Any]) -> None:
+            print(f"Current quarter metrics for {self.ticker} parsed {time.monotonic() - started:.2f}s into the stream")
+            if self._early_metrics_sent or self.on_current_quarter is None:
+                return
+            self._early_metrics_sent = True
+            result = self.on_current_quarter(current_quarter)
+            if asyncio.iscoroutine(result):
+                self._early_tasks.append(asyncio.ensure_future(result))
+
+        parser.watch(("metrics", "current_quarter"), current_quarter_ready)
+        async for delta in channel.stream(model=GROQ_MODEL, messages=messages, temperature=temperature):
+            parser.feed(delta)
+        return parser.result()
+
     def store_artifacts(
         self,
         scraped_url: str,
         scraped_content: str,
         groq_response: Dict[str, Any],
-        discord_message: str
+        discord_message: str,
+        timestamp: Optional[str] = None,
+        message_id: Optional[str] = None
     ) -> None:
-        timestamp: str = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
-        file_name: str = f"{self.ticker}_{timestamp}.json"
+        """
+        Store the run's artifact in the artifact sink (S3 by default) as a compressed metadata
+        record plus its compressed scraped content, under a date/ticker/quarter prefix made
+        unique by message_id, the id of the run's message record (see artifact_prefix).
+        """
+        timestamp = timestamp or datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
+        message_id = message_id or str(uuid.uuid4())
         stored_config: Dict[str, Any] = self.original_config.copy()
         if "llm_instructions" in stored_config and "system" in stored_config["llm_instructions"]:
             try:
@@ -462,34 +1139,189 @@ class IRWorkflow:
         artifact: Dict[str, Any] = {
             "ticker": self.ticker,
             "timestamp": timestamp,
+            "message_id": message_id,
             "scraped_url": scraped_url,
             "scraped_content": scraped_content,
             "groq_response": groq_response,
             "discord_message": discord_message,
+            "network_stats": {**self.request_blocker.stats, "polls": self.poll_count},
+            "content_stats": self.content_stats,
+            "fast_metrics": self.fast_metrics,
             "config": stored_config
         }
-        artifact_json: str = json.dumps(artifact)
-        s3_bucket = self.s3_artifact_bucket
-        s3_client = boto3.client("s3")
-        s3_client.put_object(Bucket=s3_bucket, Key=file_name, Body=artifact_json)
-        print(f"Artifacts stored in S3 bucket '{s3_bucket}' with key '{file_name}'")
-            
-    async def process_earnings(self) -> Dict[str, Any]:
+        prefix: str = artifact_prefix(self.ticker, self.quarter, self.year, timestamp, message_id)
+        objects = artifact_objects(
+            artifact,
+            prefix,
+            codec=self.artifact_config['codec'],
+            level=self.artifact_config['level']
+        )
+        if self.artifact_sink is None:
+            return
+        location = self.artifact_sink.put(objects)
+        stored_bytes = sum(len(body) for _, body in objects)
+        print(f"Artifacts stored in {location} under '{prefix}' ({stored_bytes} bytes compressed)")
+
+    async def _full_scraped_content(self, content: str) -> str:
+        """Wait for the background parse of an early-exit PDF, falling back to the text sent to the LLM."""
+        task, self._full_content_task = self._full_content_task, None
+        if task is None:
+            return content
+        try:
+            return await task
+        except Exception as e:
+            print(f"Background PDF parse failed, storing the early-exit text only: {e}")
+            return content
+
+    async def _get_context(self):
+        """Return the pooled context, launching a browser for this run only when first needed."""
+        async with self._context_lock:
+            if self._context is None:
+                self._playwright = await async_playwright().start()
+                self._owned_browser = await launch_browser(self._playwright, self.browser)
+                self._context = await self.new_context(self._owned_browser)
+            return self._context
+
+    async def _open_release_page(self):
+        return await self.open_page(await self._get_context())
+
+    async def _take_release_page(self):
+        """
+        Hand over the release page pre-opened in the discovery context, so HTML extraction
+        reuses its connections, cookies and cache instead of building a new context.
+        """
+        task, self._release_page = self._release_page, None
+        if task is not None:
+            try:
+                return await task
+            except Exception as e:
+                print(f"Pre-opened release page unavailable, opening a new one: {e}")
+        return await self._open_release_page()
+
+    async def _close_release_page(self) -> None:
+        task, self._release_page = self._release_page, None
+        if task is None:
+            return
+        if not task.done():
+            task.cancel()
+        elif not task.cancelled() and task.exception() is None:
+            await task.result().close()
+
+    async def _preconnect(self, url: str) -> None:
+        """Warm DNS/TCP/TLS to the release host from the pre-opened release page."""
+        task = self._release_page
+        if task is None or task.cancelled():
+            return
+        try:
+            page = await task
+            await page.evaluate(PRECONNECT_JS, self.get_base_url(url))
+        except Exception as e:
+            print(f"Preconnect to {url} failed: {e}")
+
+    async def _close_owned_browser(self) -> None:
+        if self._owned_browser is not None:
+            await self._owned_browser.close()
+        if self._playwright is not None:
+            await self._playwright.stop()
+        self._owned_browser = None
+        self._playwright = None
+
+    async def _find_earnings_link(self, http_client: Optional[httpx.AsyncClient]) -> str:
+        if self.extraction_method != 'pdf':
+            # Open the release page alongside discovery; in http mode this also warms the browser.
+            self._release_page = asyncio.ensure_future(self._open_release_page())
+
+        if self.discovery_mode == 'http':
+            link = await self._scrape_ir_page_over_http(http_client)
+            if link:
+                return link
+
+        page = await self.open_page(await self._get_context())
+        try:
+            return await self._scrape_ir_page_for_link(page, http_client)
+        finally:
+            await page.close()
+
+    async def process_earnings(self, context = None, http_client: Optional[httpx.AsyncClient] = None) -> Dict[str, Any]:
         """
         Main workflow: poll for link, extract content (PDF or HTML), and send to LLM for processing.
+        When a pooled BrowserContext is passed the run uses its (shared) browser and leaves it open,
+        otherwise a browser is launched on first use for this run and closed afterwards.
+        A shared http_client is used for 'http' discovery and candidate verification; one is
+        created for the run if omitted.
         """
-        async with async_playwright() as p:
-            page, browser = await self.launch_browser_and_open_page(p)
-            link = await self._scrape_ir_page_for_link(page)
-            content = await self.extract_earnings_content(link, p, browser)
+        self._context = context
+        self._context_lock = asyncio.Lock()
+        self.request_blocker.reset()
+        self.poll_count = 0
+        self._full_content_task = None
+        self._early_metrics_sent = False
+        self.fast_metrics = {}
+        self.preliminary_message = None
+        self._verified_link = None
+        owns_client = http_client is None
+        if owns_client:
+            http_client = new_http_client()
+        announcing = None
+        try:
+            link = await self._find_earnings_link(http_client)
+            announcing = asyncio.ensure_future(self.announce_if_verified(link, http_client))
+            content = await self.extract_earnings_content(link)
+            print(f"Network usage for {self.ticker}: {self.request_blocker.summary(self.poll_count)}")
+        finally:
+            if announcing is not None:
+                await asyncio.gather(announcing, return_exceptions=True)
+            await self._close_release_page()
+            if owns_client:
+                await http_client.aclose()
+            if self._owned_browser is not None:
+                await self._close_owned_browser()
+            self._context = None
 
-        metrics = await self.extract_financial_metrics(content)
+        reduced = self.reduce_earnings_content(content)
+        if self.fast_path:
+            self.extract_preliminary_metrics(reduced)
+            if self.preliminary_message:
+                print(self.preliminary_message)
+                self.update_announcement(f"{self.preliminary_message}\n{link}\nFull analysis to follow...")
+        llm_metrics = await self.extract_financial_metrics(reduced)
+        metrics = self.enrich_metrics(llm_metrics)
+        if not reports_release_metrics(metrics):
+            # analyze_financial_metrics raises for the retry; take the wrong link back first.
+            await self.retract_announcement(link)
         message = self.analyze_financial_metrics(metrics)
-        self.punt_message_to_discord(message)
-        self.store_artifacts(
-            scraped_url=link,
-            scraped_content=content,
-            groq_response=metrics,
-            discord_message=message
+        await self.deliver(message, link, content, llm_metrics)
+
+    async def deliver(self, message: str, link: str, content: str, llm_metrics: Dict[str, Any]) -> None:
+        """
+        Send the message to Discord on the critical path (editing the preliminary post in place
+        when there is one) while the artifact and message record are handed to the background
+        writer, which retries them without holding up the worker. Their tasks are kept in
+        pending_writes.
+        """
+        discord = asyncio.ensure_future(self.send_final_message(message))
+        writer = get_durable_writer()
+        message_id = str(uuid.uuid4())
+        try:
+            artifact = writer.submit(
+                f"{self.ticker} artifact",
+                self.store_artifacts,
+                scraped_url=link,
+                scraped_content=await self._full_scraped_content(content),
+                groq_response=llm_metrics,
+                discord_message=message,
+                timestamp=datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S"),
+                message_id=message_id,
+                max_attempts=self.write_max_attempts
+            )
+        finally:
+            self.discord_message_id = await discord
+        record = writer.submit(
+            f"{self.ticker} message record",
+            self.store_message_to_dynamo,
+            message,
+            message_id,
+            discord_message_id=self.discord_message_id,
+            max_attempts=self.write_max_attempts
         )
-        self.store_message_to_dynamo(message)
\ No newline at end of file
+        self.pending_writes = [artifact, record]
\ No newline at end of file
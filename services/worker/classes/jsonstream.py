@@ -0,0 +1,91 @@
+import json
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+Path = Tuple[Any, ...]
+
+class IncrementalJSONParser:
+    """
+    Scans a JSON object as it streams in, one text delta at a time, and calls the
+    callback registered for a path (e.g. ("metrics", "current_quarter")) as soon as the
+    value at that path is closed, long before the rest of the document arrives.
+
+    Text before the first "{" (such as a ```json fence or a preamble) and anything after
+    the root object closes is ignored, since streamed completions cannot use JSON mode.
+    """
+    def __init__(self):
+        self.buffer: List[str] = []
+        self.offset = 0
+        self.root_start: Optional[int] = None
+        self.root_end: Optional[int] = None
+        self._watches: Dict[Path, Callable[[Any], Any]] = {}
+        # One frame per open container: [path, start offset, is_object, current key or index, expecting_key]
+        self._stack: List[List[Any]] = []
+        self._in_string = False
+        self._escape = False
+        self._string_chars: Optional[List[str]] = None
+
+    def watch(self, path: Path, callback: Callable[[Any], Any]) -> None:
+        self._watches[tuple(path)] = callback
+
+    def _value_path(self) -> Path:
+        frame = self._stack[-1]
+        return frame[0] + (frame[3],)
+
+    def feed(self, text: str) -> None:
+        self.buffer.append(text)
+        for char in text:
+            position = self.offset
+            self.offset += 1
+            if self.root_end is not None:
+                continue
+            if self._in_string:
+                if self._string_chars is not None:
+                    self._string_chars.append(char)
+                if self._escape:
+                    self._escape = False
+                elif char == '\\':
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._string_chars is not None:
+                        self._stack[-1][3] = json.loads('"' + ''.join(self._string_chars))
+                        self._string_chars = None
+                continue
+            if self.root_start is None:
+                if char == '{':
+                    self.root_start = position
+                    self._stack.append([(), position, True, None, True])
+                continue
+            frame = self._stack[-1]
+            if char == '"':
+                self._in_string = True
+                # Only object keys are kept; string values are skipped over.
+                self._string_chars = [] if frame[2] and frame[4] else None
+            elif char == ':':
+                frame[4] = False
+            elif char == ',':
+                if frame[2]:
+                    frame[4] = True
+                else:
+                    frame[3] += 1
+            elif char in '{[':
+                self._stack.append([self._value_path(), position, char == '{', None if char == '{' else 0, char == '{'])
+            elif char in '}]':
+                closed = self._stack.pop()
+                if not self._stack:
+                    self.root_end = position + 1
+                    continue
+                callback = self._watches.get(closed[0])
+                if callback is not None:
+                    callback(json.loads(self.text()[closed[1]:position + 1]))
+
+    def text(self) -> str:
+        if len(self.buffer) > 1:
+            self.buffer = [''.join(self.buffer)]
+        return self.buffer[0] if self.buffer else ''
+
+    def result(self) -> Dict[str, Any]:
+        """Parse the complete root object; raises json.JSONDecodeError if it never closed."""
+        if self.root_start is None or self.root_end is None:
+            raise json.JSONDecodeError("Streamed response did not contain a complete JSON object", self.text(), self.offset)
+        return json.loads(self.text()[self.root_start:self.root_end])
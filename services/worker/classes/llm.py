@@ -0,0 +1,141 @@
+import re
+import time
+import random
+import asyncio
+import httpx
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+from groq import AsyncGroq, APIConnectionError, APIStatusError
+
+DEFAULT_LLM_CONCURRENCY = 4
+MAX_BACKOFF_SECONDS = 30.0
+# Groq reports reset windows as durations such as "2m59.56s", "7.66s" or "120ms".
+RESET_DURATION = re.compile(r'^(?:(?P<h>\d+)h)?(?:(?P<m>\d+)m(?!s))?(?:(?P<s>[\d.]+)s)?(?:(?P<ms>[\d.]+)ms)?$')
+
+def parse_reset(value: Optional[str]) -> Optional[float]:
+    """Seconds in a Groq x-ratelimit-reset-* header, or None if absent or unparseable."""
+    match = RESET_DURATION.match((value or '').strip())
+    if not value or not match or not any(match.groupdict().values()):
+        return None
+    parts = {name: float(part) for name, part in match.groupdict().items() if part}
+    return parts.get('h', 0) * 3600 + parts.get('m', 0) * 60 + parts.get('s', 0) + parts.get('ms', 0) / 1000
+
+def rate_limit_delay(headers: Any) -> Optional[float]:
+    """
+    How long the server asked us to wait: retry-after-ms, then retry-after (seconds or an
+    HTTP date), then the reset window of whichever request/token budget is exhausted.
+    """
+    if headers is None:
+        return None
+    retry_after_ms = headers.get('retry-after-ms')
+    if retry_after_ms:
+        try:
+            return float(retry_after_ms) / 1000
+        except ValueError:
+            pass
+    retry_after = headers.get('retry-after')
+    if retry_after:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            try:
+                return max(0.0, (parsedate_to_datetime(retry_after) - datetime.now(timezone.utc)).total_seconds())
+            except (TypeError, ValueError):
+                pass
+    resets = [
+        parse_reset(headers.get(f'x-ratelimit-reset-{budget}'))
+        for budget in ('requests', 'tokens')
+        if headers.get(f'x-ratelimit-remaining-{budget}') == '0'
+    ]
+    resets = [reset for reset in resets if reset is not None]
+    return max(resets) if resets else None
+
+def retry_delay(error: Exception, attempt: int, base_delay: float = 1.0) -> Optional[float]:
+    """
+    Seconds to wait before retrying after error, or None when it is not worth retrying.
+    429s and 5xx honour the server's hints; otherwise, and for connection errors, the
+    delay backs off exponentially with jitter.
+    """
+    if isinstance(error, APIStatusError):
+        if error.status_code != 429 and error.status_code < 500:
+            return None
+        hinted = rate_limit_delay(error.response.headers)
+        if hinted is not None:
+            return min(hinted, MAX_BACKOFF_SECONDS * 2)
+    elif not isinstance(error, APIConnectionError):
+        return None
+    return min(MAX_BACKOFF_SECONDS, base_delay * 2 ** attempt) * random.uniform(0.5, 1.0)
+
+class GroqChannel:
+    """
+    One keep-alive AsyncGroq client per API key, with a limit on in-flight requests and
+    a cooldown that every caller on the key honours once the server reports an exhausted
+    budget, so tickers extracting at the same moment queue instead of piling into 429s.
+    """
+    def __init__(
+        self,
+        api_key: Optional[str],
+        concurrency: int = DEFAULT_LLM_CONCURRENCY,
+        http_client: Optional[httpx.AsyncClient] = None
+    ):
+        self.client = AsyncGroq(
+            api_key=api_key,
+            max_retries=0,
+            http_client=http_client or httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=concurrency * 2, max_keepalive_connections=concurrency),
+                timeout=httpx.Timeout(60.0, connect=5.0)
+            )
+        )
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.blocked_until = 0.0
+
+    def block_for(self, seconds: float) -> None:
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+    async def complete(self, **kwargs) -> Any:
+        """Create a chat completion within the key's concurrency limit and cooldown."""
+        async with self.semaphore:
+            delay = self.blocked_until - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            raw = await self.client.chat.completions.with_raw_response.create(**kwargs)
+        cooldown = rate_limit_delay(raw.headers)
+        if cooldown:
+            self.block_for(cooldown)
+        return await raw.parse()
+
+    async def stream(self, **kwargs) -> AsyncIterator[str]:
+        """Stream a chat completion's content deltas, holding a concurrency slot until it ends."""
+        async with self.semaphore:
+            delay = self.blocked_until - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            stream = await self.client.chat.completions.create(stream=True, **kwargs)
+            cooldown = rate_limit_delay(stream.response.headers)
+            if cooldown:
+                self.block_for(cooldown)
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+
+    async def close(self) -> None:
+        await self.client.close()
+
+_channels: Dict[Tuple[Optional[str], asyncio.AbstractEventLoop], GroqChannel] = {}
+
+def get_groq_channel(api_key: Optional[str], concurrency: int = DEFAULT_LLM_CONCURRENCY) -> GroqChannel:
+    """Shared GroqChannel for api_key on the running event loop, created on first use."""
+    loop = asyncio.get_running_loop()
+    for key in [key for key in _channels if key[1].is_closed()]:
+        del _channels[key]
+    channel = _channels.get((api_key, loop))
+    if channel is None:
+        channel = _channels[(api_key, loop)] = GroqChannel(api_key, concurrency)
+    return channel
+
+async def close_groq_channels() -> None:
+    """Close every channel bound to the running event loop."""
+    loop = asyncio.get_running_loop()
+    for key in [key for key in _channels if key[1] is loop]:
+        await _channels.pop(key).close()
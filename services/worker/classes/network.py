@@ -0,0 +1,145 @@
+import re
+from urllib.parse import urlparse
+from typing import Any, Dict, List, Optional
+
+DEFAULT_BLOCK_POLICY: Dict[str, List[str]] = {
+    "resource_types": ["image", "stylesheet", "font", "media"],
+    "blocked_domains": [
+        "google-analytics.com",
+        "googletagmanager.com",
+        "doubleclick.net",
+        "googlesyndication.com",
+        "facebook.net",
+        "connect.facebook.net",
+        "hotjar.com",
+        "segment.io",
+        "segment.com",
+        "mixpanel.com",
+        "newrelic.com",
+        "nr-data.net",
+        "clarity.ms",
+        "bing.com",
+        "linkedin.com",
+        "licdn.com",
+        "twitter.com",
+        "ads-twitter.com",
+        "intercom.io",
+        "drift.com",
+        "zendesk.com",
+        "onetrust.com",
+        "cookielaw.org",
+        "youtube.com",
+        "ytimg.com",
+        "vimeo.com",
+        "brightcove.net",
+        "addthis.com",
+        "sharethis.com"
+    ],
+    "allowed_domains": [],
+    "blocked_url_patterns": [],
+    "allowed_url_patterns": []
+}
+
+# Rough transfer sizes used to estimate what blocked requests would have cost, since
+# they are never fetched. Measured sizes are only available for allowed requests.
+TYPICAL_RESOURCE_BYTES: Dict[str, int] = {
+    "image": 40_000,
+    "stylesheet": 25_000,
+    "font": 40_000,
+    "media": 500_000,
+    "script": 60_000,
+    "xhr": 5_000,
+    "fetch": 5_000,
+    "document": 50_000
+}
+
+def merge_block_policies(*policies: Optional[Dict[str, Any]]) -> Dict[str, List[str]]:
+    """Union the list fields of each policy on top of DEFAULT_BLOCK_POLICY, in order."""
+    merged = {key: list(values) for key, values in DEFAULT_BLOCK_POLICY.items()}
+    for policy in policies:
+        for key, values in (policy or {}).items():
+            if key in merged:
+                merged[key].extend(value for value in values if value not in merged[key])
+    return merged
+
+def _matches_domain(host: str, domains: frozenset) -> bool:
+    parts = host.split('.')
+    return any('.'.join(parts[i:]) in domains for i in range(len(parts) - 1))
+
+class RequestBlocker:
+    """
+    Playwright route handler that aborts requests matching a block policy and
+    keeps per-run counts and bytes for blocked versus allowed traffic.
+    Allowlisted domains and URL patterns always win over the block rules.
+    """
+    def __init__(self, policy: Dict[str, List[str]]):
+        self.resource_types = frozenset(policy.get("resource_types", []))
+        self.blocked_domains = frozenset(d.lower() for d in policy.get("blocked_domains", []))
+        self.allowed_domains = frozenset(d.lower() for d in policy.get("allowed_domains", []))
+        self.blocked_pattern = self._compile(policy.get("blocked_url_patterns", []))
+        self.allowed_pattern = self._compile(policy.get("allowed_url_patterns", []))
+        self.reset()
+
+    @staticmethod
+    def _compile(patterns: List[str]) -> Optional[re.Pattern]:
+        if not patterns:
+            return None
+        return re.compile("|".join(f"(?:{pattern})" for pattern in patterns))
+
+    def reset(self) -> None:
+        self.stats: Dict[str, Any] = {
+            "allowed_requests": 0,
+            "allowed_bytes": 0,
+            "blocked_requests": 0,
+            "blocked_bytes_estimate": 0,
+            "blocked_by_reason": {}
+        }
+
+    def block_reason(self, url: str, resource_type: str) -> Optional[str]:
+        """Return why url should be blocked ('resource_type', 'domain' or 'pattern'), or None to allow it."""
+        host = (urlparse(url).hostname or "").lower()
+        if _matches_domain(host, self.allowed_domains):
+            return None
+        if self.allowed_pattern is not None and self.allowed_pattern.search(url):
+            return None
+        if resource_type in self.resource_types:
+            return "resource_type"
+        if _matches_domain(host, self.blocked_domains):
+            return "domain"
+        if self.blocked_pattern is not None and self.blocked_pattern.search(url):
+            return "pattern"
+        return None
+
+    async def handle(self, route) -> None:
+        request = route.request
+        reason = self.block_reason(request.url, request.resource_type)
+        if reason is None:
+            await route.continue_()
+            return
+        stats = self.stats
+        stats["blocked_requests"] += 1
+        stats["blocked_bytes_estimate"] += TYPICAL_RESOURCE_BYTES.get(request.resource_type, 0)
+        stats["blocked_by_reason"][reason] = stats["blocked_by_reason"].get(reason, 0) + 1
+        await route.abort()
+
+    def record_allowed(self, num_bytes: int) -> None:
+        self.stats["allowed_requests"] += 1
+        self.stats["allowed_bytes"] += num_bytes
+
+    async def on_request_finished(self, request) -> None:
+        try:
+            sizes = await request.sizes()
+            num_bytes = sizes["responseBodySize"] + sizes["responseHeadersSize"]
+        except Exception:
+            num_bytes = 0
+        self.record_allowed(num_bytes)
+
+    def summary(self, iterations: int = 1) -> str:
+        stats = self.stats
+        iterations = max(iterations, 1)
+        return (
+            f"allowed {stats['allowed_requests']} requests / {stats['allowed_bytes'] / 1024:.1f} KB, "
+            f"blocked {stats['blocked_requests']} requests / ~{stats['blocked_bytes_estimate'] / 1024:.1f} KB "
+            f"{stats['blocked_by_reason']} over {iterations} poll(s), "
+            f"{stats['allowed_bytes'] / 1024 / iterations:.1f} KB per poll"
+        )
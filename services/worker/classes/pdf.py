@@ -0,0 +1,172 @@
+import os
+import re
+import mmap
+import time
+import PyPDF2
+import tempfile
+import threading
+import requests
+import multiprocessing
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Iterator, List, Optional, Tuple
+from requests.adapters import HTTPAdapter
+from .browser import USER_AGENT
+
+DEFAULT_PDF_TIMEOUT: Tuple[float, float] = (5.0, 30.0)
+DEFAULT_PDF_MAX_BYTES = 50 * 1024 * 1024
+CHUNK_SIZE = 256 * 1024
+
+DEFAULT_PDF_WORKERS = min(4, os.cpu_count() or 1)
+PARALLEL_MIN_PAGES = 8
+# Seconds to wait for all page ranges of one PDF before giving up on the pool.
+DEFAULT_PDF_EXTRACT_TIMEOUT = 60.0
+
+# Section headers that mark the end of what the LLM needs; reconciliation tables follow.
+DEFAULT_PDF_STOP_MARKERS: List[str] = [
+    r'^\s*(?:financial |business |fiscal (?:year )?\d{4} |quarterly )?(?:outlook|guidance)\b'
+]
+DEFAULT_PDF_PAGE_BUDGET = 6
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+_process_pools: Dict[int, ProcessPoolExecutor] = {}
+_process_pool_lock = threading.Lock()
+
+def get_pdf_session() -> requests.Session:
+    """Process-wide keep-alive session for PDF downloads, shared by every workflow."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers.update({"User-Agent": USER_AGENT})
+            _session = session
+        return _session
+
+def warm_connection(url: str, timeout: Tuple[float, float] = DEFAULT_PDF_TIMEOUT) -> None:
+    """Open a pooled keep-alive connection to url's host ahead of the download."""
+    try:
+        get_pdf_session().head(url, timeout=timeout, allow_redirects=True)
+    except requests.RequestException as e:
+        print(f"Preconnect to {url} failed: {e}")
+
+@contextmanager
+def open_pdf(
+    url: str,
+    timeout: Tuple[float, float] = DEFAULT_PDF_TIMEOUT,
+    max_bytes: int = DEFAULT_PDF_MAX_BYTES
+) -> Iterator[Tuple[mmap.mmap, str]]:
+    """
+    Stream url into a temp file in fixed-size chunks and yield a read-only mmap of it
+    together with the file path. The body is never held in memory as one bytes object,
+    and the parser reads pages straight out of the page cache.
+    """
+    with tempfile.NamedTemporaryFile(suffix=".pdf") as spool:
+        with get_pdf_session().get(url, stream=True, timeout=timeout) as response:
+            response.raise_for_status()
+            declared = int(response.headers.get("Content-Length") or 0)
+            if declared > max_bytes:
+                raise Exception(f"PDF at {url} is {declared} bytes, over the {max_bytes} byte limit")
+            size = 0
+            for chunk in response.iter_content(CHUNK_SIZE):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise Exception(f"PDF at {url} exceeded the {max_bytes} byte limit")
+                spool.write(chunk)
+        if size == 0:
+            raise Exception(f"PDF at {url} was empty")
+        spool.flush()
+        with mmap.mmap(spool.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            yield buffer, spool.name
+
+def get_pdf_process_pool(max_workers: int = DEFAULT_PDF_WORKERS) -> ProcessPoolExecutor:
+    """
+    Long-lived process pool for page extraction, one per worker count so each workflow gets
+    the pdf_workers it asked for. Workers come from a forkserver rather than forking the
+    worker itself, which holds the event loop and Playwright threads.
+    """
+    with _process_pool_lock:
+        if max_workers not in _process_pools:
+            _process_pools[max_workers] = ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context("forkserver")
+            )
+        return _process_pools[max_workers]
+
+def _reset_pdf_process_pool(pool: ProcessPoolExecutor) -> None:
+    """Drop pool so the next caller gets a fresh one, terminating its workers in case they hung."""
+    with _process_pool_lock:
+        for max_workers, current in list(_process_pools.items()):
+            if current is pool:
+                del _process_pools[max_workers]
+    processes = list((pool._processes or {}).values())
+    pool.shutdown(wait=False, cancel_futures=True)
+    for process in processes:
+        process.terminate()
+
+def extract_page_range(path: str, start: int, stop: int) -> List[str]:
+    """Process-pool task: map the spooled PDF and extract text for pages [start, stop)."""
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+        reader = PyPDF2.PdfReader(buffer)
+        return [reader.pages[i].extract_text() or "" for i in range(start, stop)]
+
+def iter_page_text(reader: PyPDF2.PdfReader, start: int = 0) -> Iterator[str]:
+    """Lazily extract page text from start onwards, one page per step."""
+    for index in range(start, len(reader.pages)):
+        yield reader.pages[index].extract_text() or ""
+
+def extract_text_serial(reader: PyPDF2.PdfReader, start: int = 0) -> str:
+    """Single-core path: extract every page from start onwards in order."""
+    return "".join(text + "\n" for text in iter_page_text(reader, start))
+
+def extract_text_until(
+    reader: PyPDF2.PdfReader,
+    stop_markers: List[str] = DEFAULT_PDF_STOP_MARKERS,
+    page_budget: int = DEFAULT_PDF_PAGE_BUDGET,
+    pages_after_marker: int = 1
+) -> Tuple[str, int]:
+    """
+    Read pages lazily until one opens a section matching a stop marker (plus
+    pages_after_marker more, in case the section runs over) or page_budget pages
+    have been read. Returns the text and the number of pages read.
+    """
+    patterns = [re.compile(marker, re.IGNORECASE | re.MULTILINE) for marker in stop_markers]
+    pages: List[str] = []
+    stop_at = page_budget
+    for text in iter_page_text(reader):
+        pages.append(text)
+        if stop_at == page_budget and any(pattern.search(text) for pattern in patterns):
+            stop_at = min(page_budget, len(pages) + pages_after_marker)
+        if len(pages) >= stop_at:
+            break
+    return "".join(text + "\n" for text in pages), len(pages)
+
+def extract_text_parallel(
+    path: str,
+    num_pages: int,
+    max_workers: int = DEFAULT_PDF_WORKERS,
+    start: int = 0,
+    timeout: float = DEFAULT_PDF_EXTRACT_TIMEOUT
+) -> str:
+    """
+    Split pages [start, num_pages) into one contiguous range per worker, extract the
+    ranges in the process pool against the shared spooled file, and join the results
+    in page order. If a worker process dies, or the ranges take longer than timeout
+    seconds, the pool's workers are terminated and the pool discarded so the next PDF gets
+    a fresh one, and the error is raised for the caller to fall back to the single-core path.
+    """
+    pool = get_pdf_process_pool(max_workers)
+    step = -(-(num_pages - start) // max_workers)
+    ranges = [(first, min(first + step, num_pages)) for first in range(start, num_pages, step)]
+    deadline = time.monotonic() + timeout
+    try:
+        futures = [pool.submit(extract_page_range, path, first, stop) for first, stop in ranges]
+        results = [future.result(timeout=max(0.0, deadline - time.monotonic())) for future in futures]
+    except (BrokenProcessPool, FutureTimeoutError):
+        _reset_pdf_process_pool(pool)
+        raise
+    return "".join(text + "\n" for texts in results for text in texts)
@@ -0,0 +1,61 @@
+from typing import Any, Dict, Optional
+from zoneinfo import ZoneInfo
+from datetime import datetime, timedelta, timezone
+
+MARKET_TZ = ZoneInfo("America/New_York")
+
+# Typical wall-clock release times for the scheduler's 'before'/'after' market sessions.
+SESSION_RELEASE_TIMES = {
+    'before': '07:00',
+    'after': '16:05'
+}
+
+DEFAULT_POLLING_CONFIG = {
+    'min_interval': 1.0,
+    'max_interval': 15.0,
+    'window_minutes': 10,
+    'ramp_minutes': 30
+}
+
+def resolve_release_at(release_time: Optional[str], now: Optional[datetime] = None) -> Optional[datetime]:
+    """
+    Turn a release_time of 'before', 'after' or 'HH:MM' (US/Eastern) into an aware
+    datetime on today's market date. Returns None when it is missing or unparseable.
+    """
+    if not release_time:
+        return None
+    now = now or datetime.now(timezone.utc)
+    clock = SESSION_RELEASE_TIMES.get(str(release_time).lower(), release_time)
+    try:
+        hour, minute = (int(part) for part in str(clock).split(':'))
+    except ValueError:
+        print(f"Unrecognised release_time '{release_time}', polling at a fixed interval")
+        return None
+    market_now = now.astimezone(MARKET_TZ)
+    return market_now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+
+def poll_delay(
+    release_at: Optional[datetime],
+    polling_config: Dict[str, Any],
+    now: Optional[datetime] = None
+) -> float:
+    """
+    Seconds between poll starts: min_interval within window_minutes of release_at,
+    ramping linearly up to max_interval over the following ramp_minutes either side.
+    Without a release_at every poll uses min_interval.
+    """
+    config = {**DEFAULT_POLLING_CONFIG, **(polling_config or {})}
+    min_interval = float(config['min_interval'])
+    max_interval = max(float(config['max_interval']), min_interval)
+    if release_at is None:
+        return min_interval
+
+    now = now or datetime.now(timezone.utc)
+    distance = abs((now - release_at).total_seconds())
+    window = timedelta(minutes=float(config['window_minutes'])).total_seconds()
+    if distance <= window:
+        return min_interval
+
+    ramp = timedelta(minutes=float(config['ramp_minutes'])).total_seconds()
+    progress = min(1.0, (distance - window) / ramp) if ramp > 0 else 1.0
+    return min_interval + (max_interval - min_interval) * progress
@@ -0,0 +1,61 @@
+import httpx
+import asyncio
+from typing import Any, Dict, List, Optional
+from .ir import IRWorkflow
+from .browser import BrowserPool
+from .discovery import new_http_client
+from .writes import get_durable_writer
+
+async def _run_ticker(workflow: IRWorkflow, pool: BrowserPool, semaphore: asyncio.Semaphore, http_client) -> None:
+    """
+    Run one workflow on the shared browser until it succeeds. The ticker keeps a
+    single BrowserContext across retries, replacing it only if the browser had to be
+    relaunched, and only holds a concurrency slot while an attempt is actually running.
+    """
+    context = None
+    try:
+        while True:
+            async with semaphore:
+                try:
+                    browser = await pool.get_browser(workflow.browser)
+                    if context is None or context.browser is not browser:
+                        context = await workflow.new_context(browser)
+                    await workflow.process_earnings(context=context, http_client=http_client)
+                    return
+                except Exception as e:
+                    print(f'{workflow.ticker} workflow broke with the following error: {e}')
+    finally:
+        if context is not None:
+            try:
+                await context.close()
+            except Exception as e:
+                print(f'Error closing context for {workflow.ticker}: {e}')
+
+async def run_workflows(
+    configs: List[Dict[str, Any]],
+    max_concurrency: int = 8,
+    pool: Optional[BrowserPool] = None,
+    http_client: Optional[httpx.AsyncClient] = None
+) -> List[IRWorkflow]:
+    """
+    Run one IRWorkflow per config concurrently on a single long-lived browser, with at
+    most max_concurrency workflows active at once. A long-lived pool and http_client can
+    be passed in to keep them warm across calls; otherwise both are created for this call.
+    A ticker frees its slot once its Discord message is sent; the background artifact and
+    message writes are drained before returning.
+    """
+    workflows = [IRWorkflow(config) for config in configs]
+    semaphore = asyncio.Semaphore(max_concurrency)
+    owns_pool = pool is None
+    owns_client = http_client is None
+    pool = pool or BrowserPool()
+    http_client = http_client or new_http_client()
+    try:
+        await asyncio.gather(*(_run_ticker(workflow, pool, semaphore, http_client) for workflow in workflows))
+    finally:
+        await get_durable_writer().drain()
+        if owns_client:
+            await http_client.aclose()
+        if owns_pool:
+            await pool.close()
+    return workflows
@@ -0,0 +1,73 @@
+import asyncio
+import threading
+from typing import Any, Coroutine, Dict, List, Optional
+from .ir import IRWorkflow
+from .browser import BrowserPool
+from .runner import run_workflows
+from .discovery import new_http_client
+from .llm import close_groq_channels
+from .delivery import close_discord_queues
+from .writes import get_durable_writer
+
+class WorkerRuntime:
+    """
+    One persistent event loop on a background thread, plus a warm BrowserPool, HTTP
+    client, Groq clients and Discord delivery queue that live as long as the worker
+    process. Flask handlers submit coroutines here instead of calling asyncio.run, so
+    retries after a failure reuse the same loop, Playwright driver and browser instead
+    of relaunching them.
+    """
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.pool = BrowserPool()
+        self.http_client = None
+        self._thread = threading.Thread(target=self._run_loop, name="worker-event-loop", daemon=True)
+        self._thread.start()
+
+    def _run_loop(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def run(self, coro: Coroutine, timeout: Optional[float] = None) -> Any:
+        """Run coro on the persistent loop and block the calling thread for its result."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result(timeout)
+
+    async def _get_http_client(self):
+        if self.http_client is None:
+            self.http_client = new_http_client()
+        return self.http_client
+
+    async def _warm(self, browser_type: str) -> None:
+        await self.pool.warm(browser_type)
+        await self._get_http_client()
+
+    def warm(self, browser_type: str = 'chromium') -> None:
+        """Pre-launch and health-check the browser before any work arrives."""
+        try:
+            self.run(self._warm(browser_type))
+        except Exception as e:
+            print(f'Failed to warm browser {browser_type}: {e}')
+
+    async def _run_workflows(self, configs: List[Dict[str, Any]], max_concurrency: int) -> List[IRWorkflow]:
+        return await run_workflows(
+            configs,
+            max_concurrency,
+            pool=self.pool,
+            http_client=await self._get_http_client()
+        )
+
+    def run_workflows(self, configs: List[Dict[str, Any]], max_concurrency: int = 8) -> List[IRWorkflow]:
+        """Run configs to completion on the warm browser, retrying each ticker until it succeeds."""
+        return self.run(self._run_workflows(configs, max_concurrency))
+
+    def close(self) -> None:
+        async def _close():
+            if self.http_client is not None:
+                await self.http_client.aclose()
+            await self.pool.close()
+            await close_groq_channels()
+            await get_durable_writer().drain()
+            await close_discord_queues()
+        self.run(_close())
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
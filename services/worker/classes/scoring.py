@@ -0,0 +1,72 @@
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_SCORING_WEIGHTS = {
+    'href': 1.0,
+    'text': 0.0
+}
+
+# Bound on memoised link scores per matcher; IR pages repeat the same few hundred links every poll.
+MAX_CACHED_SCORES = 50_000
+
+_FILTERED = object()
+
+class LinkMatcher:
+    """
+    Candidate scorer compiled once per config. Keywords and ignore words are lowered
+    up front and matched with C-level substring tests in one pass per link,
+    url_ignore_list becomes a set, and scores are memoised per link so a poll only
+    pays for links it has not seen before.
+
+    A link scores href_weight per keyword found in its lowercased href plus
+    text_weight per keyword found in its lowercased anchor text. With the default
+    weights this is exactly the legacy "number of keywords in the href" priority.
+    """
+    def __init__(
+        self,
+        keywords: Iterable[str],
+        url_ignore_list: Iterable[str] = (),
+        href_ignore_words: Iterable[str] = (),
+        extraction_method: Optional[str] = None,
+        weights: Optional[Dict[str, Any]] = None
+    ):
+        self.keywords: Tuple[str, ...] = tuple(str(kw).lower() for kw in keywords if kw)
+        self.ignore_words: Tuple[str, ...] = tuple(str(word).lower() for word in href_ignore_words if word)
+        self.url_ignore_set = frozenset(url_ignore_list)
+        self.required_suffix = extraction_method if extraction_method == 'pdf' else None
+        weights = {**DEFAULT_SCORING_WEIGHTS, **(weights or {})}
+        self.href_weight = float(weights['href'])
+        self.text_weight = float(weights['text'])
+        self._cache: Dict[Any, Any] = {}
+
+    def _score(self, href: Optional[str], text: Optional[str]) -> Any:
+        if not href or href in self.url_ignore_set:
+            return _FILTERED
+        if self.required_suffix and not href.endswith(self.required_suffix):
+            return _FILTERED
+        href_lower = href.lower()
+        if any(map(href_lower.__contains__, self.ignore_words)):
+            return _FILTERED
+        score = self.href_weight * sum(map(href_lower.__contains__, self.keywords))
+        if self.text_weight and text:
+            score += self.text_weight * sum(map(text.lower().__contains__, self.keywords))
+        return score
+
+    def score(self, href: Optional[str], text: Optional[str] = None) -> Optional[float]:
+        """Score one link, or return None when it is filtered out."""
+        key = (href, text) if self.text_weight else href
+        score = self._cache.get(key)
+        if score is None:
+            if len(self._cache) >= MAX_CACHED_SCORES:
+                self._cache.clear()
+            score = self._cache[key] = self._score(href, text)
+        return None if score is _FILTERED else score
+
+    def rank(self, links: Iterable[List[str]]) -> List[Tuple[float, str]]:
+        """Score [href, text] pairs and return (score, href) tuples, best first, ties in page order."""
+        candidates = []
+        for href, text in links:
+            score = self.score(href, text)
+            if score is not None:
+                candidates.append((score, href))
+        candidates.sort(key=lambda x: x[0], reverse=True)
+        return candidates
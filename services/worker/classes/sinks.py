@@ -0,0 +1,89 @@
+import os
+import json
+import boto3
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+from .artifacts import DEFAULT_ARTIFACT_CONFIG, upload_objects
+
+DEFAULT_SINK_DIRECTORY = "local_sinks"
+
+class S3ArtifactSink:
+    """Artifact objects uploaded to bucket, multipart above the configured threshold."""
+    def __init__(self, bucket: str, config: Optional[Dict[str, Any]] = None):
+        self.bucket = bucket
+        self.config = {**DEFAULT_ARTIFACT_CONFIG, **(config or {})}
+        self._client = None
+
+    def put(self, objects: List[Tuple[str, bytes]]) -> str:
+        if self._client is None:
+            self._client = boto3.client("s3")
+        upload_objects(self._client, self.bucket, objects, self.config)
+        return f"s3://{self.bucket}"
+
+class LocalArtifactSink:
+    """Artifact objects written as files under directory, keeping the key layout as subdirectories."""
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def put(self, objects: List[Tuple[str, bytes]]) -> str:
+        for key, body in objects:
+            path = os.path.join(self.directory, *key.split("/"))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write then rename so a reader never sees a partial object.
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(body)
+            os.replace(tmp_path, path)
+        return self.directory
+
+class DynamoMessageSink:
+    """Message records put into a DynamoDB table."""
+    def __init__(self, table_name: str):
+        self.table_name = table_name
+        self._table = None
+
+    def put(self, item: Dict[str, Any]) -> str:
+        if self._table is None:
+            self._table = boto3.resource("dynamodb", region_name="us-east-1").Table(self.table_name)
+        self._table.put_item(Item=item)
+        return self.table_name
+
+class LocalMessageSink:
+    """Message records appended as one JSON line each to path."""
+    _lock = threading.Lock()
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def put(self, item: Dict[str, Any]) -> str:
+        line = json.dumps(item) + "\n"
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+        return self.path
+
+def get_artifact_sink(
+    kind: str,
+    bucket: Optional[str] = None,
+    directory: str = DEFAULT_SINK_DIRECTORY,
+    config: Optional[Dict[str, Any]] = None
+) -> Optional[Any]:
+    """Artifact sink for kind 's3', 'local' or 'none' (None)."""
+    if kind == 's3':
+        return S3ArtifactSink(bucket, config)
+    if kind == 'local':
+        return LocalArtifactSink(os.path.join(directory, "artifacts"))
+    if kind == 'none':
+        return None
+    raise ValueError(f"Unknown artifact sink: {kind}")
+
+def get_message_sink(kind: str, table_name: Optional[str] = None, directory: str = DEFAULT_SINK_DIRECTORY) -> Optional[Any]:
+    """Message sink for kind 'dynamodb', 'local' or 'none' (None)."""
+    if kind == 'dynamodb':
+        return DynamoMessageSink(table_name)
+    if kind == 'local':
+        return LocalMessageSink(os.path.join(directory, "messages.ndjson"))
+    if kind == 'none':
+        return None
+    raise ValueError(f"Unknown message sink: {kind}")
@@ -0,0 +1,165 @@
+import io
+import re
+import csv
+from typing import List, Optional, Tuple
+
+NUMERIC_CELL = re.compile(r'^[\$\(\-−–—\s]*(?:\$\s*)?\d[\d,]*(?:\.\d+)?\s*%?\s*\)?\s*[%x]?$')
+EMPTY_CELL = re.compile(r'^[\s\$\-−–—]*$|^n/?[am]$', re.IGNORECASE)
+UNITS = re.compile(
+    r'\((?:[^()]*\b)?in\s+(?:thousands|millions|billions)\b[^()]*\)|\b(?:in|\$)\s+(?:thousands|millions|billions)\b',
+    re.IGNORECASE
+)
+# Closing parenthesis or percent sign set in its own cell after a figure.
+SPLIT_SUFFIX = re.compile(r'^\)?\s*%?$')
+PERIOD_TOKEN = re.compile(r'^(?:(?:19|20)\d{2}|Q[1-4]|FY\s?\d{2,4}|[1-4]Q\d{2})$', re.IGNORECASE)
+# A PDF text line ending in two or more figures, e.g. "Total revenue $ 1,930 $ 1,810 6.6%".
+PDF_ROW = re.compile(
+    r'^(?P<label>.*?[A-Za-z:)\]])\s+(?P<values>(?:\$?\s*\(?-?\$?\s*\d[\d,]*(?:\.\d+)?\s*%?\)?\s*){2,})$'
+)
+PDF_VALUE = re.compile(r'\(?-?\$?\s*\d[\d,]*(?:\.\d+)?\s*%?\)?')
+
+MIN_PDF_TABLE_ROWS = 3
+MAX_CELL_CHARS = 300
+
+def normalise_cell(cell: str) -> str:
+    """Collapse whitespace and write figures compactly: no $, no thousands commas, (12) as -12."""
+    cell = ' '.join(cell.split())
+    if EMPTY_CELL.match(cell):
+        return ''
+    if NUMERIC_CELL.match(cell):
+        negative = cell.lstrip('$ ').startswith(('(', '-', '−', '–'))
+        number = re.sub(r'[^\d.%x]', '', cell)
+        return f"-{number}" if negative else number
+    return cell
+
+def find_units(*texts: Optional[str]) -> Optional[str]:
+    """Return the first units note, e.g. "(in millions, except per share data)", found in texts."""
+    for text in texts:
+        match = UNITS.search(text or '')
+        if match:
+            return match.group(0)
+    return None
+
+def to_csv_block(title: Optional[str], units: Optional[str], header: Optional[List[str]], rows: List[List[str]]) -> str:
+    """Render a titled, comma separated table with empty columns dropped."""
+    all_rows = ([header] if header else []) + rows
+    width = max(len(row) for row in all_rows)
+    all_rows = [row + [''] * (width - len(row)) for row in all_rows]
+    keep = [i for i in range(width) if i == 0 or any(row[i] for row in rows)]
+    out = io.StringIO()
+    writer = csv.writer(out, lineterminator='\n')
+    for row in all_rows:
+        if any(row[i] for i in keep):
+            writer.writerow([row[i] for i in keep])
+    caption = ' '.join(part for part in (title, units if units and units not in (title or '') else None) if part)
+    return f"{caption}\n{out.getvalue().rstrip()}" if caption else out.getvalue().rstrip()
+
+class TableCollector:
+    """
+    Gathers tables found while rendering a release into compact CSV blocks, leaving a
+    "[Table N]" marker in the prose where each one sat.
+    """
+    def __init__(self):
+        self.blocks: List[str] = []
+        self.last_heading: Optional[str] = None
+        self.last_units: Optional[str] = None
+
+    def _add(self, title: Optional[str], units: Optional[str], header: Optional[List[str]], rows: List[List[str]]) -> str:
+        label = f"Table {len(self.blocks) + 1}"
+        self.blocks.append(to_csv_block(f"{label}: {title}" if title else label, units, header, rows))
+        return f"[{label}]"
+
+    def add_html_table(self, node) -> Optional[str]:
+        """
+        Convert a data table to a CSV block and return its marker, or None for layout
+        tables (long prose cells or no figures), which are rendered as text instead.
+        """
+        header: Optional[List[str]] = None
+        rows: List[List[str]] = []
+        for tr in node.css('tr'):
+            cells = [[cell, ' '.join((cell.text(deep=True) or '').split())] for cell in tr.css('th, td')]
+            if any(len(text) > MAX_CELL_CHARS for _, text in cells):
+                return None
+            previous = None
+            for entry in cells:
+                if entry[1] and previous is not None and SPLIT_SUFFIX.match(entry[1]):
+                    previous[1] += entry[1]
+                    entry[1] = ''
+                elif entry[1]:
+                    previous = entry
+            is_header = not rows and (
+                all(cell.tag == 'th' for cell, text in cells if text)
+                or not any(NUMERIC_CELL.match(text) for _, text in cells[1:])
+            )
+            row: List[str] = []
+            for cell, text in cells:
+                colspan = (cell.attributes.get('colspan') or '1').strip()
+                span = int(colspan) if colspan.isdigit() else 1
+                value = normalise_cell(text)
+                # Header labels cover their whole span; body values sit in the first slot.
+                row.extend([value] * span if is_header else [value] + [''] * (span - 1))
+            if not any(row):
+                continue
+            if is_header and header is None:
+                header = row
+            elif is_header:
+                header = [' '.join(part for part in pair if part) for pair in zip(header, row)]
+            else:
+                rows.append(row)
+        if not rows or not any(NUMERIC_CELL.match(cell) for row in rows for cell in row[1:] if cell):
+            return None
+        caption = node.css_first('caption')
+        caption_text = ' '.join(caption.text().split()) if caption is not None else None
+        title = caption_text or self.last_heading
+        units = find_units(
+            caption_text, ' '.join(header or []), self.last_heading, self.last_units,
+            ' '.join(' '.join(row) for row in rows[:3])
+        )
+        return self._add(title, units, header, rows)
+
+    def add_text_rows(self, context: List[str], rows: List[Tuple[str, List[str]]]) -> str:
+        """Convert figure rows pulled from PDF text into a CSV block and return its marker."""
+        width = max(len(values) for _, values in rows)
+        header = None
+        if context:
+            tokens = context[-1].split()
+            if len(tokens) == width and all(PERIOD_TOKEN.match(token) for token in tokens):
+                header = [''] + tokens
+                context = context[:-1]
+        title = context[-1] if context else None
+        body = [[label] + [normalise_cell(value) for value in values] for label, values in rows]
+        return self._add(title, find_units(*reversed(context)), header, body)
+
+def split_text_tables(lines: List[str], collector: TableCollector) -> List[str]:
+    """
+    Pull runs of figure rows out of PDF text lines into collector, returning the prose
+    lines with a table marker in place of each run.
+    """
+    prose: List[str] = []
+    run: List[Tuple[str, List[str]]] = []
+    run_lines: List[str] = []
+    context: List[str] = []
+
+    def flush() -> None:
+        if len(run) >= MIN_PDF_TABLE_ROWS:
+            prose.append(collector.add_text_rows(context[-3:], run))
+        else:
+            prose.extend(run_lines)
+        run.clear()
+        run_lines.clear()
+
+    for line in lines:
+        match = PDF_ROW.match(line.strip())
+        if match:
+            run.append((' '.join(match.group('label').split()), PDF_VALUE.findall(match.group('values'))))
+            run_lines.append(line)
+            continue
+        if run:
+            flush()
+            context = []
+        if line.strip():
+            prose.append(line)
+            context.append(line.strip())
+    if run:
+        flush()
+    return prose
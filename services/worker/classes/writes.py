@@ -0,0 +1,66 @@
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Optional, Set
+
+DEFAULT_WRITE_WORKERS = 4
+DEFAULT_WRITE_ATTEMPTS = 3
+
+class DurableWriter:
+    """
+    Runs blocking sink writes (S3 puts, DynamoDB items) on a bounded thread pool in the
+    background, retrying failures with exponential backoff. A workflow submits its writes
+    and moves on; the runner drains whatever is still pending before the batch returns.
+    """
+    def __init__(self, max_workers: int = DEFAULT_WRITE_WORKERS, base_delay: float = 1.0):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="durable-write")
+        self.base_delay = base_delay
+        self.pending: Set[asyncio.Future] = set()
+
+    def submit(
+        self,
+        name: str,
+        fn: Callable[..., Any],
+        *args: Any,
+        max_attempts: int = DEFAULT_WRITE_ATTEMPTS,
+        **kwargs: Any
+    ) -> asyncio.Future:
+        """Schedule fn(*args, **kwargs) on the pool; the task resolves to True once written."""
+        task = asyncio.ensure_future(self._run(name, functools.partial(fn, *args, **kwargs), max_attempts))
+        self.pending.add(task)
+        task.add_done_callback(self.pending.discard)
+        return task
+
+    async def _run(self, name: str, write: Callable[[], Any], max_attempts: int) -> bool:
+        loop = asyncio.get_running_loop()
+        delay = self.base_delay
+        for attempt in range(1, max_attempts + 1):
+            try:
+                await loop.run_in_executor(self.executor, write)
+                return True
+            except Exception as e:
+                if attempt == max_attempts:
+                    print(f"Giving up on {name} after {attempt} attempts: {e}")
+                    return False
+                print(f"{name} failed ({e}), retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+                delay *= 2
+        return False
+
+    async def drain(self) -> List[bool]:
+        """Wait for every write submitted from the running event loop."""
+        loop = asyncio.get_running_loop()
+        tasks = [task for task in self.pending if task.get_loop() is loop]
+        return list(await asyncio.gather(*tasks)) if tasks else []
+
+_writer: Optional[DurableWriter] = None
+_writer_lock = threading.Lock()
+
+def get_durable_writer() -> DurableWriter:
+    """Process-wide DurableWriter shared by every workflow in the worker."""
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = DurableWriter()
+        return _writer
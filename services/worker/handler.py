@@ -2,13 +2,26 @@ import os
 import time
 import json
 import boto3
-import asyncio
 import requests
-from typing import Any, Dict
-from classes.ir import IRWorkflow
+import threading
+from typing import Any, Dict, Optional
+from classes.runtime import WorkerRuntime
 from flask import Flask, jsonify
 
 app = Flask(__name__)
+# One event loop, Playwright driver and browser for the lifetime of the worker,
+# so retries are handed to a warm browser instead of relaunching everything.
+# Created on first use rather than at import: PDF pool processes re-import this
+# module as __mp_main__ and must not start their own loop thread.
+_runtime: Optional[WorkerRuntime] = None
+_runtime_lock = threading.Lock()
+
+def get_runtime() -> WorkerRuntime:
+    global _runtime
+    with _runtime_lock:
+        if _runtime is None:
+            _runtime = WorkerRuntime()
+        return _runtime
 
 @app.route("/health", methods=["GET"])
 def health():
@@ -41,24 +54,37 @@ def process() -> Any:
         "discord_webhook_url": os.environ.get("DISCORD_WEBHOOK_URL", ""),
         "s3_artifact_bucket": os.environ.get('ARTIFACT_BUCKET', ''),
         "messages_table": os.environ.get('MESSAGES_TABLE', ''),
+        "release_time": os.environ.get('RELEASE_TIME', ''),
+        "global_block_policy": json.loads(os.environ.get("BLOCK_POLICY", "{}")),
+        "llm_cache": json.loads(os.environ.get("LLM_CACHE", "{}")),
+        "discord_queue": json.loads(os.environ.get("DISCORD_QUEUE", "{}")),
+        **({"llm_streaming": os.environ["LLM_STREAMING"].lower() == "true"} if os.environ.get("LLM_STREAMING") else {}),
+        **({"artifact_sink": os.environ["ARTIFACT_SINK"]} if os.environ.get("ARTIFACT_SINK") else {}),
+        **({"message_sink": os.environ["MESSAGE_SINK"]} if os.environ.get("MESSAGE_SINK") else {}),
+        "sink_directory": os.environ.get("SINK_DIRECTORY", "local_sinks"),
         **json.loads(os.environ.get("SITE_CONFIG", "{}"))
     }
 
-    workflow = IRWorkflow(config)
-    while True:
-        try:
-            metrics = asyncio.run(workflow.process_earnings())
-            if metrics is None:
-                if deployment_type != "local":
-                    time.sleep(60 * 10)
-                    ec2 = boto3.client("ec2", region_name="us-east-1")
-                    instance_id = requests.get("http://169.254.169.254/latest/meta-data/instance-id").text
-                    ec2.terminate_instances(InstanceIds=[instance_id])
-                    print(f"Instance {instance_id} is terminating.")
-                break
-        except Exception as e:
-            print(f'workflow broke with the following error: {e}')
+    # Multi-ticker mode: SITE_CONFIGS holds a list of per-ticker site configs (each with its own
+    # ticker, quarter, year and json_data) that share one browser in this process.
+    site_configs = json.loads(os.environ.get("SITE_CONFIGS", "[]"))
+    configs = [{**config, **site_config} for site_config in site_configs] or [config]
+    max_concurrency = int(os.environ.get("MAX_CONCURRENT_TICKERS", "8"))
+
+    # Each ticker is retried on the warm browser until its workflow succeeds.
+    get_runtime().run_workflows(configs, max_concurrency)
+    terminate_instance(deployment_type)
     return jsonify('Success')
 
+def terminate_instance(deployment_type: str) -> None:
+    if deployment_type != "local":
+        time.sleep(60 * 10)
+        ec2 = boto3.client("ec2", region_name="us-east-1")
+        instance_id = requests.get("http://169.254.169.254/latest/meta-data/instance-id").text
+        ec2.terminate_instances(InstanceIds=[instance_id])
+        print(f"Instance {instance_id} is terminating.")
+
 if __name__ == "__main__":
+    site_config = json.loads(os.environ.get("SITE_CONFIG", "{}"))
+    get_runtime().warm(site_config.get("browser_type", "chromium").lower())
     app.run(host="0.0.0.0", port=8080)
@@ -0,0 +1,60 @@
+"""Builds small text-only PDFs for tests and benchmarks without extra dependencies."""
+from typing import List
+
+def _escape(line: str) -> str:
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+def build_pdf(pages: List[List[str]]) -> bytes:
+    """Return a PDF with one page per entry in pages, each line drawn in Helvetica."""
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    page_ids = []
+    for lines in pages:
+        stream = "BT /F1 9 Tf 11 TL 40 760 Td " + " ".join(f"({_escape(line)}) Tj T*" for line in lines) + " ET"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream".encode("latin-1"))
+        content_id = len(objects)
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>".encode("latin-1")
+        )
+        page_ids.append(len(objects))
+    kids = " ".join(f"{page_id} 0 R" for page_id in page_ids)
+    objects[1] = f"<< /Type /Pages /Kids [{kids}] /Count {len(page_ids)} >>".encode("latin-1")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n".encode("latin-1") + body + b"\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    out += b"".join(f"{offset:010d} 00000 n \n".encode("latin-1") for offset in offsets)
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("latin-1")
+    return bytes(out)
+
+def earnings_release_pages(num_pages: int = 40) -> List[List[str]]:
+    """Headline and outlook up front, followed by pages of GAAP reconciliation tables."""
+    pages = [
+        [
+            "Acme Reports Fourth Quarter and Fiscal Year 2024 Financial Results",
+            "Revenue of $1.93 billion, up 6.6% year over year",
+            "GAAP net income of $801.0 million, or $0.65 per diluted share",
+            "Non-GAAP net income of $830.1 million, or $0.67 per diluted share",
+        ],
+        [
+            "Financial Outlook",
+            "For the first quarter of fiscal 2025, Acme expects revenue of $1.93 billion to $2.00 billion",
+            "Non-GAAP gross margin of 62% to 63%",
+        ],
+    ]
+    for number in range(3, num_pages + 1):
+        rows = [f"Reconciliation of GAAP to Non-GAAP Financial Measures (page {number})"]
+        rows += [
+            f"Line item {row:02d}    {1000 + row * number:,}    {900 + row * number:,}    {800 + row:,}"
+            for row in range(60)
+        ]
+        pages.append(rows)
+    return pages
@@ -0,0 +1,64 @@
+import os
+import sys
+import gzip
+import json
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from services.worker.classes import ir, sinks
+from services.worker.classes.artifacts import artifact_objects, artifact_prefix, is_metadata_key, read_artifact
+
+ARTIFACT = {
+    "ticker": "acme",
+    "scraped_content": "Revenue of $1.93 billion. " * 2000,
+    "groq_response": {"metrics": {"current_quarter": {"revenue_billion": 1.93}}}
+}
+
+@pytest.mark.parametrize("codec", ["gzip", "zstd", "none"])
+def test_artifact_round_trips_with_content_split_from_metadata(codec):
+    if codec == "zstd":
+        pytest.importorskip("zstandard")
+    prefix = artifact_prefix("acme", 4, 2024, "20250304_210501", "run-1")
+    objects = dict(artifact_objects(ARTIFACT, prefix, codec=codec))
+    extension = {"gzip": ".gz", "zstd": ".zst", "none": ""}[codec]
+    metadata_key = f"2025-03-04/ACME/2024-Q4/20250304_210501_run-1/metadata.json{extension}"
+
+    assert list(objects) == [f"2025-03-04/ACME/2024-Q4/20250304_210501_run-1/content.txt{extension}", metadata_key]
+    assert is_metadata_key(metadata_key) and is_metadata_key("ACME_20250304_210501.json")
+    assert not is_metadata_key(f"{prefix}content.txt{extension}")
+    if codec != "none":
+        assert sum(len(body) for body in objects.values()) < len(ARTIFACT["scraped_content"]) / 10
+
+    assert read_artifact(objects.__getitem__, metadata_key) == {
+        **ARTIFACT,
+        "content_key": f"{prefix}content.txt{extension}",
+        "content_bytes": len(ARTIFACT["scraped_content"])
+    }
+    assert "scraped_content" not in read_artifact(objects.__getitem__, metadata_key, with_content=False)
+
+def test_store_artifacts_uploads_compressed_partitioned_objects(monkeypatch):
+    uploads = []
+
+    class FakeS3:
+        def upload_fileobj(self, fileobj, bucket, key, ExtraArgs=None, Config=None):
+            uploads.append((bucket, key, fileobj.read(), ExtraArgs, Config.multipart_threshold))
+
+    monkeypatch.setattr(sinks.boto3, "client", lambda service: FakeS3())
+    workflow = ir.IRWorkflow({
+        'deployment_type': 'local',
+        'ticker': 'acme',
+        'quarter': 4,
+        'year': 2024,
+        's3_artifact_bucket': 'artifacts',
+        'llm_cache': {'enabled': False},
+        'artifact_storage': {'multipart_threshold': 1024}
+    })
+    workflow.store_artifacts("https://ir.acme.com/q4", "release text", {"metrics": {}}, "message", "20250304_210501", "run-1")
+
+    assert [(bucket, key, extra["ContentEncoding"], threshold) for bucket, key, _, extra, threshold in uploads] == [
+        ("artifacts", "2025-03-04/ACME/2024-Q4/20250304_210501_run-1/content.txt.gz", "gzip", 1024),
+        ("artifacts", "2025-03-04/ACME/2024-Q4/20250304_210501_run-1/metadata.json.gz", "gzip", 1024)
+    ]
+    assert gzip.decompress(uploads[0][2]) == b"release text"
+    metadata = json.loads(gzip.decompress(uploads[1][2]))
+    assert metadata["discord_message"] == "message" and "scraped_content" not in metadata
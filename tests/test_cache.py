@@ -0,0 +1,93 @@
+import os
+import sys
+import json
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from services.worker.classes import ir
+from services.worker.classes.cache import DiskTier, LLMCache, MemoryTier, cache_key
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000.0
+
+    def __call__(self):
+        return self.now
+
+def test_cache_key_covers_every_input():
+    base = cache_key("content", "prompt", "model", 0)
+    assert base == cache_key("content", "prompt", "model", 0)
+    assert len({
+        base,
+        cache_key("content!", "prompt", "model", 0),
+        cache_key("content", "prompt!", "model", 0),
+        cache_key("content", "prompt", "model!", 0),
+        cache_key("content", "prompt", "model", 1),
+    }) == 5
+
+def test_memory_tier_evicts_least_recently_used():
+    cache = LLMCache(MemoryTier(2))
+    cache.put("a", {"v": 1})
+    cache.put("b", {"v": 2})
+    assert cache.get("a") == {"v": 1}
+    cache.put("c", {"v": 3})
+    assert cache.get("b") is None
+    assert cache.get("a") == {"v": 1} and cache.get("c") == {"v": 3}
+
+def test_disk_tier_survives_restart_and_expires(tmp_path):
+    clock = Clock()
+    LLMCache(MemoryTier(8), DiskTier(str(tmp_path)), ttl_seconds=60, clock=clock).put("k", {"v": 1})
+
+    restarted = LLMCache(MemoryTier(8), DiskTier(str(tmp_path)), ttl_seconds=60, clock=clock)
+    assert restarted.get("k") == {"v": 1}
+
+    clock.now += 61
+    expired = LLMCache(MemoryTier(8), DiskTier(str(tmp_path)), ttl_seconds=60, clock=clock)
+    assert expired.get("k") is None
+    assert not os.path.exists(tmp_path / "k.json")
+
+class FakeChannel:
+    def __init__(self, payload=None):
+        self.calls = 0
+        self.payload = payload or {"metrics": {"current_quarter": {"eps": 0.65}}}
+
+    async def complete(self, **kwargs):
+        self.calls += 1
+        message = type("Message", (), {"content": json.dumps(self.payload)})
+        return type("Response", (), {"choices": [type("Choice", (), {"message": message})]})
+
+@pytest.mark.asyncio
+async def test_extract_financial_metrics_reuses_cached_result(monkeypatch, tmp_path):
+    channel = FakeChannel()
+    monkeypatch.setattr(ir, "get_groq_channel", lambda api_key, concurrency: channel)
+    config = {
+        'deployment_type': 'local',
+        'ticker': 'acme',
+        'llm_instructions': {'system': 'extract', 'temperature': 0},
+        'llm_cache': {'directory': str(tmp_path)}
+    }
+
+    first = await ir.IRWorkflow(config).extract_financial_metrics("release text")
+    second = await ir.IRWorkflow(config).extract_financial_metrics("release text")
+    await ir.IRWorkflow(config).extract_financial_metrics("different release text")
+
+    assert first == second == {"metrics": {"current_quarter": {"eps": 0.65}}}
+    assert channel.calls == 2
+    assert len(list(tmp_path.iterdir())) == 2
+
+@pytest.mark.asyncio
+async def test_responses_without_metrics_are_not_cached(monkeypatch, tmp_path):
+    channel = FakeChannel({"metrics": {"current_quarter": {}, "full_year": {}, "forward_guidance": {}}})
+    monkeypatch.setattr(ir, "get_groq_channel", lambda api_key, concurrency: channel)
+    config = {
+        'deployment_type': 'local',
+        'ticker': 'acme',
+        'llm_instructions': {'system': 'extract', 'temperature': 0},
+        'llm_cache': {'directory': str(tmp_path)}
+    }
+
+    await ir.IRWorkflow(config).extract_financial_metrics("wrong release")
+    await ir.IRWorkflow(config).extract_financial_metrics("wrong release")
+
+    assert channel.calls == 2
+    assert not list(tmp_path.iterdir())
@@ -0,0 +1,78 @@
+import os
+import sys
+import json
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from services.worker.classes import ir
+from services.worker.classes.chunking import merge_partial_metrics, split_content
+from services.worker.classes.content import estimate_tokens
+
+def test_split_content_respects_budget_and_keeps_table_headers():
+    prose = "\n\n".join(f"Paragraph {i} " + "word " * 60 for i in range(12))
+    table = "Table 1: Reconciliation (in millions)\n,2024,2023\n" + "\n".join(f"Item {i},{i},{i}" for i in range(200))
+    chunks = split_content(f"{prose}\n\n{table}", max_tokens=300)
+
+    assert len(chunks) > 2
+    assert all(estimate_tokens(chunk) <= 300 for chunk in chunks)
+    table_chunks = [chunk for chunk in chunks if "Item " in chunk]
+    assert all(chunk.startswith("Table 1: Reconciliation (in millions)\n,2024,2023\n") for chunk in table_chunks)
+    assert sum(chunk.count("Item ") for chunk in table_chunks) == 200
+    assert split_content("short release", max_tokens=300) == ["short release"]
+
+def test_merge_partial_metrics_prefers_earliest_values():
+    headline = {
+        "metrics": {
+            "current_quarter": {"revenue_billion": 1.93, "eps": None},
+            "forward_guidance": {"next_quarter": {"revenue_range": {"low": 1.93, "high": 2.0}}}
+        },
+        "sentiment_snippets": [{"snippet": "record demand", "classification": "Bullish"}]
+    }
+    tables = {
+        "metrics": {
+            "current_quarter": {"revenue_billion": 1.9, "eps": 0.65},
+            "full_year": {"revenue_billion": 7.3},
+            "forward_guidance": {"next_quarter": {"revenue_range": {"low": None, "high": 2.1}}}
+        },
+        "sentiment_snippets": [
+            {"snippet": "record demand", "classification": "Bullish"},
+            {"snippet": "macro headwinds", "classification": "Bearish"}
+        ]
+    }
+    merged, conflicts = merge_partial_metrics([headline, {"error": "bad json"}, tables])
+
+    assert merged["metrics"]["current_quarter"] == {"revenue_billion": 1.93, "eps": 0.65}
+    assert merged["metrics"]["full_year"] == {"revenue_billion": 7.3}
+    assert merged["metrics"]["forward_guidance"]["next_quarter"]["revenue_range"] == {"low": 1.93, "high": 2.0}
+    assert [s["snippet"] for s in merged["sentiment_snippets"]] == ["record demand", "macro headwinds"]
+    assert conflicts == ["metrics.current_quarter.revenue_billion: kept 1.93, ignored 1.9"]
+    assert merge_partial_metrics([{"error": "bad json"}]) == ({"error": "bad json"}, [])
+
+@pytest.mark.asyncio
+async def test_long_content_is_extracted_in_concurrent_chunks(monkeypatch):
+    seen = []
+
+    class FakeChannel:
+        async def complete(self, messages, **kwargs):
+            part = messages[1]["content"]
+            seen.append(part.split("\n", 1)[0])
+            value = 1.93 if "Revenue of $1.93 billion" in part else None
+            payload = {"metrics": {"current_quarter": {"revenue_billion": value}}}
+            message = type("Message", (), {"content": json.dumps(payload)})
+            return type("Response", (), {"choices": [type("Choice", (), {"message": message})]})
+
+    monkeypatch.setattr(ir, "get_groq_channel", lambda api_key, concurrency: FakeChannel())
+    workflow = ir.IRWorkflow({
+        'deployment_type': 'local',
+        'ticker': 'acme',
+        'llm_instructions': {'system': 'extract', 'temperature': 0},
+        'llm_cache': {'enabled': False},
+        'llm_chunk_tokens': 200
+    })
+    content = "Revenue of $1.93 billion\n\n" + "\n\n".join("Reconciliation line " * 30 for _ in range(4))
+
+    metrics = await workflow.extract_financial_metrics(content)
+
+    assert metrics == {"metrics": {"current_quarter": {"revenue_billion": 1.93}}}
+    assert sorted(seen) == [f"[Part {i} of {len(seen)} of the release]" for i in range(1, len(seen) + 1)]
+    assert len(seen) > 1
@@ -0,0 +1,87 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from services.worker.classes.content import html_to_lines, reduce_content, strip_disclaimers
+from services.worker.classes.tables import TableCollector, split_text_tables
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "release_page.html")
+
+def load_release_page():
+    with open(FIXTURE, encoding="utf-8") as f:
+        return f.read()
+
+def test_reduce_html_keeps_release_and_drops_boilerplate():
+    reduced, stats = reduce_content(load_release_page(), is_html=True)
+
+    assert "Acme Reports Fourth Quarter and Fiscal Year 2024 Financial Results" in reduced
+    assert "Revenue of $1.93 billion, up 6.6% year over year" in reduced
+    assert "Acme expects revenue of $1.93 billion to $2.00 billion" in reduced
+    assert "[Table 1]" in reduced and "Revenue,1930,1810" in reduced
+    for boilerplate in ("cookies", "Governance", "Email Alerts", "Share on X", "Privacy Policy",
+                        "Related releases", "Private Securities Litigation Reform Act", "no obligation to update"):
+        assert boilerplate not in reduced
+    assert stats['tokens_after'] < stats['tokens_before']
+
+def test_unpruned_render_keeps_everything():
+    text = "\n".join(html_to_lines(load_release_page(), prune=False))
+    assert "Email Alerts" in text and "Private Securities Litigation Reform Act" in text
+    assert "window.dataLayer" not in text
+
+def test_strip_disclaimers_keeps_figures_under_disclaimer_header():
+    lines = [
+        "Safe Harbor Statement",
+        "Statements in this release that are not historical facts are forward-looking and subject to risks.",
+        "Acme expects second quarter revenue of $2.1 billion.",
+        "About Acme",
+    ]
+    assert strip_disclaimers(lines) == lines[2:]
+
+def test_reduction_falls_back_when_too_little_survives():
+    html = "<body><ul><li><a href='/a'>Revenue of $5 billion</a></li></ul></body>"
+    reduced, _ = reduce_content(html, is_html=True, config={'min_chars': 10})
+    assert reduced == "Revenue of $5 billion"
+
+def test_html_table_to_csv_aligns_spanned_headers_and_split_figures():
+    html = """<body><h2>Condensed Consolidated Statements of Operations</h2>
+    <p>(in millions, except per share data)</p>
+    <table>
+    <tr><td></td><td colspan="5">Three Months Ended</td><td></td><td colspan="2">Twelve Months Ended</td></tr>
+    <tr><td></td><td colspan="2">Jan 31, 2025</td><td></td><td colspan="2">Jan 31, 2024</td><td></td><td colspan="2">Jan 31, 2025</td></tr>
+    <tr><td>Revenue</td><td>$</td><td>1,930</td><td></td><td>$</td><td>1,810</td><td></td><td>$</td><td>7,300</td></tr>
+    <tr><td>Operating loss</td><td></td><td>(12.5</td><td>)</td><td></td><td>&#8212;</td><td></td><td></td><td>(40</td></tr>
+    </table></body>"""
+    collector = TableCollector()
+    lines = html_to_lines(html, tables=collector)
+
+    assert "[Table 1]" in lines and "Revenue" not in "\n".join(lines)
+    assert collector.blocks == [
+        "Table 1: Condensed Consolidated Statements of Operations (in millions, except per share data)\n"
+        ',"Three Months Ended Jan 31, 2025","Three Months Ended Jan 31, 2024","Twelve Months Ended Jan 31, 2025"\n'
+        "Revenue,1930,1810,7300\n"
+        "Operating loss,-12.5,,-40"
+    ]
+
+def test_pdf_text_rows_become_csv_block():
+    lines = [
+        "Reconciliation of GAAP to Non-GAAP Net Income (in millions)",
+        "2024 2023",
+        "GAAP net income $ 801.0 $ 712.0",
+        "Stock-based compensation 120.4 101.2",
+        "Amortization of intangibles (3.1) (2.9)",
+        "Non-GAAP net income $ 830.1 $ 760.3",
+        "About Acme",
+        "For the fiscal year ended January 31, 2025",
+    ]
+    collector = TableCollector()
+    prose = split_text_tables(lines, collector)
+
+    assert prose[-3:] == ["[Table 1]", "About Acme", "For the fiscal year ended January 31, 2025"]
+    assert collector.blocks == [
+        "Table 1: Reconciliation of GAAP to Non-GAAP Net Income (in millions)\n"
+        ",2024,2023\n"
+        "GAAP net income,801.0,712.0\n"
+        "Stock-based compensation,120.4,101.2\n"
+        "Amortization of intangibles,-3.1,-2.9\n"
+        "Non-GAAP net income,830.1,760.3"
+    ]
@@ -0,0 +1,185 @@
+import os
+import sys
+import json
+import time
+import httpx
+import asyncio
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from services.worker.classes import ir
+from services.worker.classes.delivery import DiscordQueue
+
+WEBHOOK = 'https://discord.test/api/webhooks/1/token'
+
+def webhook_queue(calls, config=None, handler=None):
+    def record(request):
+        body = json.loads(request.content)
+        calls.append((request.method, str(request.url), body["content"]))
+        if handler is not None:
+            response = handler(request, len(calls))
+            if response is not None:
+                return response
+        if request.method == "PATCH" and request.url.path.endswith("/missing"):
+            return httpx.Response(404, json={"message": "Unknown Message"})
+        return httpx.Response(200, json={"id": f"m{len(calls)}"})
+
+    return DiscordQueue(config, http_client=httpx.AsyncClient(transport=httpx.MockTransport(record)))
+
+def hosted_workflow(monkeypatch, queue, **config):
+    monkeypatch.setattr(ir, "get_discord_queue", lambda config=None: queue)
+    return ir.IRWorkflow({
+        'deployment_type': 'hosted',
+        'discord_webhook_url': WEBHOOK,
+        'groq_api_key': 'key',
+        'ticker': 'acme',
+        'quarter': 4,
+        'llm_cache': {'enabled': False},
+        **config
+    })
+
+@pytest.mark.asyncio
+async def test_preliminary_post_is_edited_in_place(monkeypatch):
+    calls = []
+    workflow = hosted_workflow(monkeypatch, webhook_queue(calls))
+
+    workflow.announce_release("https://ir.acme.com/q4")
+    workflow.announce_release("https://ir.acme.com/q4")
+    workflow.update_announcement("Revenue: $1.93B")
+    message_id = await workflow.send_final_message("Full analysis")
+
+    assert message_id == "m1"
+    assert calls == [
+        ("POST", f"{WEBHOOK}?wait=true", "### $ACME Q4 Earnings Released\nhttps://ir.acme.com/q4\nAnalysis to follow..."),
+        ("PATCH", f"{WEBHOOK}/messages/m1", "Revenue: $1.93B"),
+        ("PATCH", f"{WEBHOOK}/messages/m1", "Full analysis")
+    ]
+
+@pytest.mark.asyncio
+async def test_final_message_is_posted_when_edit_fails_or_two_phase_is_off(monkeypatch):
+    calls = []
+    workflow = hosted_workflow(monkeypatch, webhook_queue(calls))
+    workflow.announce_release("https://ir.acme.com/q4")
+    await workflow._announcement
+    monkeypatch.setattr(workflow, "_announced_message_id", lambda: _resolved("missing"))
+
+    assert await workflow.send_final_message("Full analysis") == "m3"
+    assert [method for method, *_ in calls] == ["POST", "PATCH", "POST"]
+
+    calls.clear()
+    workflow = hosted_workflow(monkeypatch, webhook_queue(calls), discord_two_phase=False)
+    workflow.announce_release("https://ir.acme.com/q4")
+    assert await workflow.send_final_message("Full analysis") == "m1"
+    assert [method for method, *_ in calls] == ["POST"]
+
+@pytest.mark.asyncio
+async def test_queue_honours_retry_after_and_coalesces_backlog():
+    calls = []
+
+    def rate_limit_first(request, count):
+        if count == 1:
+            return httpx.Response(429, json={"retry_after": 0.2, "global": False})
+
+    queue = webhook_queue(calls, {"coalesce": True, "coalesce_threshold": 2}, rate_limit_first)
+    started = time.monotonic()
+    ids = await asyncio.gather(
+        queue.post(WEBHOOK, "first", coalescible=True, label="A"),
+        *(queue.post(WEBHOOK, f"ticker {i}", coalescible=True, label=f"T{i}") for i in range(3))
+    )
+
+    assert time.monotonic() - started >= 0.2
+    assert calls[0] == calls[1] == ("POST", f"{WEBHOOK}?wait=true", "first\n\nticker 0\n\nticker 1\n\nticker 2")
+    assert len(calls) == 2 and list(ids) == ["m2"] * 4
+    assert [label for label, _ in queue.latencies] == ["A", "T0", "T1", "T2"]
+
+@pytest.mark.asyncio
+async def test_queue_spaces_requests_with_token_bucket():
+    calls = []
+    queue = webhook_queue(calls, {"rate": 2, "per_seconds": 0.2})
+    started = time.monotonic()
+    await asyncio.gather(*(queue.post(WEBHOOK, f"message {i}") for i in range(4)))
+
+    assert [content for *_, content in calls] == [f"message {i}" for i in range(4)]
+    assert time.monotonic() - started >= 0.15
+
+async def _resolved(value):
+    return value
+
+@pytest.mark.asyncio
+async def test_streamed_current_quarter_is_edited_into_preliminary_post(monkeypatch):
+    calls = []
+    workflow = hosted_workflow(
+        monkeypatch,
+        webhook_queue(calls),
+        llm_streaming=True,
+        json_data=json.dumps({"current_revenue_billion": 1.9})
+    )
+    workflow.link = "https://ir.acme.com/q4"
+
+    workflow.announce_release(workflow.link)
+    workflow.on_current_quarter({"revenue_billion": 1.93})
+    await workflow.send_final_message("Full analysis")
+
+    assert [(method, content) for method, _, content in calls][1:] == [
+        ("PATCH", "### $ACME Q4 Current Quarter\nRevenue : $1.93B vs 1.9B 🟢\nhttps://ir.acme.com/q4\nFull analysis to follow..."),
+        ("PATCH", "Full analysis")
+    ]
+    assert hosted_workflow(monkeypatch, webhook_queue([])).on_current_quarter is None
+
+@pytest.mark.asyncio
+async def test_wrong_link_is_retracted_and_the_retry_announces_the_release(monkeypatch):
+    calls = []
+    workflow = hosted_workflow(
+        monkeypatch,
+        webhook_queue(calls),
+        year=2024,
+        fast_path=False,
+        content_reduction=False,
+        table_extraction=False,
+        json_data=json.dumps({"current_revenue_billion": 1.9})
+    )
+    pages = {
+        '/q4-call': '<title>ACME to Host Fourth Quarter 2024 Earnings Call</title>',
+        '/q4-results': '<title>ACME Reports Fourth Quarter 2024 Results</title>',
+        '/q3-results': '<title>ACME Reports Third Quarter 2024 Results</title>',
+    }
+    links = iter(["https://ir.acme.com/q3-results", "https://ir.acme.com/q4-call", "https://ir.acme.com/q4-results"])
+    responses = iter([{"metrics": {}}, {"metrics": {}}, {"metrics": {
+        "current_quarter": {"revenue_billion": 1.93},
+        "forward_guidance": {"next_quarter": {"revenue_billion": [2.0, 2.1]}}
+    }}])
+
+    async def find_earnings_link(http_client):
+        return workflow._set_link(next(links))
+
+    async def extract_earnings_content(link):
+        return "content"
+
+    async def extract_financial_metrics(content):
+        return next(responses)
+
+    async def deliver(message, link, content, llm_metrics):
+        await workflow.send_final_message(message)
+
+    monkeypatch.setattr(workflow, "_find_earnings_link", find_earnings_link)
+    monkeypatch.setattr(workflow, "extract_earnings_content", extract_earnings_content)
+    monkeypatch.setattr(workflow, "extract_financial_metrics", extract_financial_metrics)
+    monkeypatch.setattr(workflow, "deliver", deliver)
+
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, text=pages[request.url.path]))
+    async with httpx.AsyncClient(transport=transport) as client:
+        # Last quarter's release never verifies, so nothing is announced for it.
+        with pytest.raises(Exception, match="wrong link"):
+            await workflow.process_earnings(http_client=client)
+        assert calls == []
+        # The call notice verifies but has no figures: its post is retracted.
+        with pytest.raises(Exception, match="wrong link"):
+            await workflow.process_earnings(http_client=client)
+        await workflow.process_earnings(http_client=client)
+
+    assert [(method, url.rsplit('/', 1)[-1], content.split("\n")[1]) for method, url, content in calls] == [
+        ("POST", "token?wait=true", "https://ir.acme.com/q4-call"),
+        ("PATCH", "m1", "~~https://ir.acme.com/q4-call~~"),
+        ("POST", "token?wait=true", "https://ir.acme.com/q4-results"),
+        ("PATCH", "m3", "Revenue : $1.93B vs 1.9B 🟢"),
+    ]
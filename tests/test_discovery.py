@@ -0,0 +1,209 @@
+import os
+import sys
+import httpx
+import asyncio
+import pytest
+from datetime import datetime, timedelta, timezone
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from services.worker.classes.ir import IRWorkflow
+from services.worker.classes.discovery import extract_json_links, parse_links
+from services.worker.classes.scoring import LinkMatcher
+from services.worker.classes.polling import poll_delay, resolve_release_at
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "ir_page_large.html")
+
+@pytest.fixture
+def fixture_html():
+    with open(FIXTURE) as f:
+        return f.read()
+
+@pytest.fixture
+def http_config():
+    return {
+        'deployment_type': 'local',
+        'discovery_mode': 'http',
+        'polling_config': {'min_interval': 0},
+        'quarter': 4,
+        'year': 2024,
+        'base_url': 'https://ir.acme.com/press-releases',
+        'selector': 'a.module_link',
+        'verify_keywords': {'requires_quarter': True, 'requires_year': True, 'quarter_as_string': True, 'fixed_terms': ['reports']},
+    }
+
+def test_parse_links(fixture_html):
+    links = parse_links(fixture_html, 'a.module_link')
+    assert len(links) == 561
+    assert links[-1] == [
+        'https://ir.acme.com/news-releases/news-release-details/acme-reports-fourth-quarter-2024-financial-results',
+        'Acme Reports Fourth Quarter and Full Year 2024 Financial Results'
+    ]
+
+@pytest.mark.asyncio
+async def test_http_discovery_finds_link(fixture_html, http_config):
+    workflow = IRWorkflow(http_config)
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, text=fixture_html))
+    async with httpx.AsyncClient(transport=transport) as client:
+        link = await workflow._scrape_ir_page_over_http(client)
+    assert link == 'https://ir.acme.com/news-releases/news-release-details/acme-reports-fourth-quarter-2024-financial-results'
+    assert workflow.link == link
+
+@pytest.mark.asyncio
+async def test_http_discovery_falls_back_without_candidates(http_config):
+    workflow = IRWorkflow(http_config)
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, text='<html><body><div id="app"></div></body></html>'))
+    async with httpx.AsyncClient(transport=transport) as client:
+        assert await workflow._scrape_ir_page_over_http(client) is None
+
+@pytest.mark.asyncio
+async def test_http_discovery_falls_back_when_only_nav_links_are_static(http_config):
+    shell = '<html><body><nav><a href="/">Home</a><a href="/stock-info">Stock</a></nav><div id="app"></div></body></html>'
+    requests_seen = []
+
+    def handler(request):
+        requests_seen.append(request.url)
+        return httpx.Response(200, text=shell)
+
+    workflow = IRWorkflow({**http_config, 'selector': 'a', 'http_fallback_polls': 3})
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        assert await workflow._scrape_ir_page_over_http(client) is None
+    assert len(requests_seen) == 3
+
+@pytest.mark.asyncio
+async def test_http_discovery_short_circuits_unchanged_polls(fixture_html, http_config, monkeypatch):
+    stale_html = fixture_html.replace('acme-reports-fourth-quarter-2024-financial-results', 'acme-annual-meeting').replace('Reports Fourth Quarter and Full Year 2024 Financial Results', 'Annual Meeting')
+    seen_headers = []
+    responses = [
+        httpx.Response(200, text=stale_html, headers={'ETag': '"v1"'}),
+        httpx.Response(304),
+        httpx.Response(200, text=stale_html, headers={'ETag': '"v2"'}),
+        httpx.Response(200, text=fixture_html, headers={'ETag': '"v3"'}),
+    ]
+
+    def handler(request):
+        seen_headers.append(request.headers.get('if-none-match'))
+        return responses[len(seen_headers) - 1]
+
+    workflow = IRWorkflow({**http_config, 'href_ignore_words': ['2020', '2021', '2022', '2023']})
+    rank = workflow._rank_link_candidates
+    rank_calls = []
+    monkeypatch.setattr(workflow, '_rank_link_candidates', lambda links: rank_calls.append(1) or rank(links))
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        link = await workflow._scrape_ir_page_over_http(client)
+
+    assert link.endswith('acme-reports-fourth-quarter-2024-financial-results')
+    assert seen_headers == [None, '"v1"', '"v1"', '"v2"']
+    assert len(rank_calls) == 2
+
+@pytest.mark.asyncio
+async def test_http_discovery_keeps_polling_through_repeated_304s(fixture_html, http_config):
+    stale_html = fixture_html.replace('acme-reports-fourth-quarter-2024-financial-results', 'acme-annual-meeting').replace('Reports Fourth Quarter and Full Year 2024 Financial Results', 'Annual Meeting')
+    responses = [httpx.Response(200, text=stale_html, headers={'ETag': '"v1"'})]
+    responses += [httpx.Response(304) for _ in range(5)]
+    responses.append(httpx.Response(200, text=fixture_html, headers={'ETag': '"v2"'}))
+    requests_seen = []
+
+    def handler(request):
+        requests_seen.append(request.headers.get('if-none-match'))
+        return responses[len(requests_seen) - 1]
+
+    workflow = IRWorkflow({**http_config, 'href_ignore_words': ['2020', '2021', '2022', '2023']})
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        link = await workflow._scrape_ir_page_over_http(client)
+
+    assert link.endswith('acme-reports-fourth-quarter-2024-financial-results')
+    assert requests_seen == [None] + ['"v1"'] * 6
+
+def test_poll_delay_tightens_around_release():
+    release_at = resolve_release_at('after', datetime(2025, 3, 5, 20, 0, tzinfo=timezone.utc))
+    assert (release_at.hour, release_at.minute) == (16, 5)
+    config = {'min_interval': 1, 'max_interval': 11, 'window_minutes': 10, 'ramp_minutes': 20}
+    assert poll_delay(release_at, config, release_at + timedelta(minutes=5)) == 1
+    assert poll_delay(release_at, config, release_at - timedelta(minutes=20)) == 6
+    assert poll_delay(release_at, config, release_at - timedelta(hours=2)) == 11
+    assert poll_delay(None, config) == 1
+
+def test_link_matcher_scores_href_and_text():
+    matcher = LinkMatcher(
+        ['fourth', '2024', 'results', 'results'],
+        url_ignore_list=['/old'],
+        href_ignore_words=['WEBCAST'],
+        weights={'text': 0.5}
+    )
+    assert matcher.score('/old', 'Fourth Quarter 2024 Results') is None
+    assert matcher.score('/fourth-quarter-2024-webcast', '') is None
+    assert matcher.score('/news/fourth-quarter-2024-results', '') == 4
+    assert matcher.score('/news/12345', 'Fourth Quarter 2024 Results') == 2
+    assert matcher.rank([['/a', 'nothing'], ['/b', 'fourth']]) == [(0.5, '/b'), (0, '/a')]
+
+@pytest.mark.asyncio
+async def test_select_candidate_verifies_ties(http_config):
+    workflow = IRWorkflow({**http_config, 'ticker': 'ACME'})
+    pages = {
+        '/news/acme-results-a': '<title>ACME Reports Third Quarter 2024 Results</title>',
+        '/news/acme-results-b': '<title>ACME Reports Fourth Quarter 2024 Results</title>',
+        '/news/acme-results-c': '<title>ACME Announces Dividend</title>',
+    }
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, text=pages[request.url.path]))
+    candidates = [(2, href) for href in pages]
+    async with httpx.AsyncClient(transport=transport) as client:
+        assert await workflow._select_candidate(candidates, client) == '/news/acme-results-b'
+        assert await workflow._select_candidate([(3, '/news/acme-results-c')] + candidates, client) == '/news/acme-results-c'
+        assert await workflow._select_candidate([(2, '/news/acme-results-c'), (2, '/news/acme-results-a')], client) == '/news/acme-results-c'
+        # A lower-scored candidate never joins the race, even when it would verify.
+        lower = [(2, '/news/acme-results-c'), (2, '/news/acme-results-a'), (1, '/news/acme-results-b')]
+        assert await workflow._select_candidate(lower, client) == '/news/acme-results-c'
+
+class FakeResponse:
+    def __init__(self, payload, resource_type='xhr'):
+        self.url = 'https://ir.acme.com/feed/PressRelease.svc/GetPressReleaseList'
+        self.request = type('Request', (), {'resource_type': resource_type})()
+        self.payload = payload
+
+    async def json(self):
+        return self.payload
+
+@pytest.mark.asyncio
+async def test_sniff_response_resolves_link_from_json_feed(http_config):
+    payload = {'GetPressReleaseListResult': [
+        {'Headline': 'Acme Announces Dividend', 'LinkToDetailPage': '/news/acme-announces-dividend', 'Attachments': []},
+        {'Headline': 'Acme Reports Fourth Quarter 2024 Results', 'LinkToDetailPage': '/news/acme-reports-fourth-quarter-2024-results',
+         'Attachments': [{'Title': 'Press Release', 'Url': 'https://s1.q4cdn.com/acme/q4-2024.pdf'}]},
+    ]}
+    assert extract_json_links(payload)[:2] == [
+        ['/news/acme-announces-dividend', 'Acme Announces Dividend'],
+        ['/news/acme-reports-fourth-quarter-2024-results', 'Acme Reports Fourth Quarter 2024 Results'],
+    ]
+
+    workflow = IRWorkflow(http_config)
+    workflow._sniffed = asyncio.get_running_loop().create_future()
+    await workflow._sniff_response(FakeResponse(payload, resource_type='image'))
+    assert not workflow._sniffed.done()
+    await workflow._sniff_response(FakeResponse(payload))
+    assert workflow._sniffed.result()[0] == (3, '/news/acme-reports-fourth-quarter-2024-results')
+
+@pytest.mark.asyncio
+async def test_sniffed_link_is_used_only_once_verified(http_config):
+    pages = {
+        '/news/acme-reports-third-quarter-2024-results': '<title>ACME Reports Third Quarter 2024 Results</title>',
+        '/news/acme-reports-fourth-quarter-2024-results': '<title>ACME Reports Fourth Quarter 2024 Results</title>',
+    }
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, text=pages[request.url.path]))
+    workflow = IRWorkflow({**http_config, 'ticker': 'ACME', 'sniff_responses': True})
+    assert IRWorkflow(http_config).sniff_responses is False
+
+    async with httpx.AsyncClient(transport=transport) as client:
+        workflow._sniffed = asyncio.get_running_loop().create_future()
+        # A latest-news widget still pointing at last quarter's release scores above 0.
+        latest = {'LatestNews': [{'Headline': 'Acme Reports Third Quarter 2024 Results', 'Link': '/news/acme-reports-third-quarter-2024-results'}]}
+        await workflow._sniff_response(FakeResponse(latest))
+        assert await workflow._take_sniffed_link(client) is None
+        assert not workflow._sniffed.done()
+
+        # The rejected link is not sniffed again; the release in a later payload is.
+        await workflow._sniff_response(FakeResponse(latest))
+        assert not workflow._sniffed.done()
+        releases = {'Releases': [{'Headline': 'Acme Reports Fourth Quarter 2024 Results', 'Link': '/news/acme-reports-fourth-quarter-2024-results'}]}
+        await workflow._sniff_response(FakeResponse(releases))
+        assert await workflow._take_sniffed_link(client) == 'https://ir.acme.com/news/acme-reports-fourth-quarter-2024-results'
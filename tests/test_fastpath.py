@@ -0,0 +1,85 @@
+import os
+import sys
+import json
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from services.worker.classes import ir
+from services.worker.classes.content import reduce_content
+from services.worker.classes.fastpath import extract_fast_metrics, to_billions
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "release_page.html")
+
+def test_fast_path_reads_headline_metrics_from_reduced_release():
+    with open(FIXTURE, encoding="utf-8") as f:
+        content, _ = reduce_content(f.read(), is_html=True)
+
+    assert extract_fast_metrics(content)["metrics"]["current_quarter"] == {
+        "revenue_billion": 1.93,
+        "net_income_billion": 0.8,
+        "eps": 0.65,
+        "non_gaap_net_income_billion": 0.83,
+        "non_gaap_eps": 0.67
+    }
+
+def test_fast_path_periods_losses_and_guidance():
+    text = (
+        "Fourth quarter revenue was $2.57 billion, an increase of 12% compared to $2.29 billion a year ago. "
+        "Full-year 2024 revenue was $9.6 billion. "
+        "Net loss of $(12.4) million, or $(0.05) per share. "
+        "GAAP net income for fiscal year 2024 was $1,400 million. "
+        "The company expects first quarter revenue of $2.6 billion."
+    )
+
+    assert extract_fast_metrics(text)["metrics"] == {
+        "current_quarter": {"revenue_billion": 2.57, "net_income_billion": -0.01, "eps": -0.05},
+        "full_year": {"revenue_billion": 9.6, "net_income_billion": 1.4}
+    }
+    assert to_billions("7,300", "million") == 7.3
+    assert extract_fast_metrics("No figures here.") == {"metrics": {}}
+
+def test_llm_result_is_enriched_with_comparable_fast_path_figures():
+    workflow = ir.IRWorkflow({
+        'deployment_type': 'local',
+        'ticker': 'acme',
+        'quarter': 4,
+        'llm_cache': {'enabled': False},
+        'json_data': json.dumps({"current_revenue_billion": 1.9, "current_eps": 0.6})
+    })
+    workflow.extract_preliminary_metrics("Revenue of $1.93 billion. Net income of $801 million, or $0.65 per share.")
+
+    assert workflow.preliminary_message.splitlines() == [
+        "### $ACME Q4 Preliminary Results",
+        "Revenue : $1.93B vs 1.9B 🟢",
+        "Net Income : $0.8B vs NoneB 🟢",
+        "Eps: $0.65 vs 0.6 🟢"
+    ]
+    enriched = workflow.enrich_metrics({"metrics": {"current_quarter": {"revenue_billion": 1.94, "eps": None}}})
+    assert enriched == {"metrics": {"current_quarter": {"revenue_billion": 1.94, "eps": 0.65}}}
+    assert workflow.enrich_metrics({"error": "bad json"}) == {"error": "bad json"}
+
+def test_fast_path_never_rescues_a_response_without_metrics():
+    workflow = ir.IRWorkflow({
+        'deployment_type': 'local',
+        'ticker': 'acme',
+        'quarter': 4,
+        'llm_cache': {'enabled': False},
+        'json_data': json.dumps({"current_revenue_billion": 1.9})
+    })
+    workflow.extract_preliminary_metrics("Third quarter revenue was $1.81 billion.")
+    empty = {"metrics": {"current_quarter": {}, "full_year": {}, "forward_guidance": {}}}
+
+    assert workflow.enrich_metrics(empty) == empty
+    with pytest.raises(Exception, match="wrong link"):
+        workflow.analyze_financial_metrics(workflow.enrich_metrics(empty))
+
+@pytest.mark.parametrize("text, revenue", [
+    ("Cost of revenue was $412 million. Total revenue was $1.93 billion.", 1.93),
+    ("Subscription revenue of $500 million grew 20%. Revenue was $1.93 billion.", 1.93),
+    ("Revenue from the Cloud segment was $700 million. Total revenue of $1.93 billion.", 1.93),
+    ("Data Center revenue was $35.6 billion. Fourth-quarter revenue was $39.3 billion.", 39.3),
+    ("Quarterly revenue was $1.8 billion. The company reported $1.93 billion in total revenue.", 1.93),
+    ("Q4 2024 revenue was $1.2 billion.", 1.2)
+])
+def test_fast_path_prefers_total_revenue_over_line_items_and_segments(text, revenue):
+    assert extract_fast_metrics(text)["metrics"]["current_quarter"]["revenue_billion"] == revenue
@@ -1,5 +1,6 @@
 import os
 import sys
+import asyncio
 import pytest
 
 # sys.path.insert(0, os.path.join(os.path.dirname(__file__), "services", "worker"))
@@ -310,6 +311,85 @@ def test_pdf_url(pdf_url, instance):
     search_text = "Revenue of $1.930 billion, an increase of 6.6% compared to the third quarter of 2024, and an increase of"
     assert search_text in text
 
+def test_rank_link_candidates():
+    workflow = IRWorkflow({
+        'deployment_type': 'local',
+        'quarter': 4,
+        'year': 2024,
+        'url_ignore_list': ['/news/acme-reports-fourth-quarter-2023-results'],
+        'href_ignore_words': ['Webcast'],
+        'verify_keywords': {'requires_quarter': True, 'requires_year': True, 'quarter_as_string': True, 'fixed_terms': ['reports']},
+    })
+    links = [
+        ['/news/acme-reports-fourth-quarter-2023-results', 'Acme Reports Fourth Quarter 2023 Results'],
+        ['/news/acme-fourth-quarter-2024-webcast', 'Webcast'],
+        [None, 'Menu'],
+        ['/news/acme-announces-dividend', 'Acme Announces Dividend'],
+        ['/news/acme-reports-fourth-quarter-2024-results', 'Acme Reports Fourth Quarter 2024 Results'],
+    ]
+    candidates = workflow._rank_link_candidates(links)
+    assert candidates[0] == (3, '/news/acme-reports-fourth-quarter-2024-results')
+    assert [href for _, href in candidates] == ['/news/acme-reports-fourth-quarter-2024-results', '/news/acme-announces-dividend']
+
+class FakePage:
+    def __init__(self, context):
+        self.context = context
+        self.closed = False
+        self.evaluated = []
+
+    async def route(self, pattern, handler):
+        pass
+
+    def on(self, event, handler):
+        pass
+
+    async def evaluate(self, script, arg=None):
+        self.evaluated.append(arg)
+
+    async def close(self):
+        self.closed = True
+
+class FakeContext:
+    def __init__(self):
+        self.pages = []
+
+    async def new_page(self):
+        page = FakePage(self)
+        self.pages.append(page)
+        return page
+
+@pytest.mark.asyncio
+async def test_html_extraction_reuses_discovery_context(monkeypatch):
+    workflow = IRWorkflow({'deployment_type': 'local', 'base_url': 'https://ir.acme.com/news'})
+    context = FakeContext()
+    extracted_on = []
+
+    async def scrape(page, http_client=None):
+        return workflow._set_link('https://news.acme.com/q4-results')
+
+    async def extract_html_text(url, page, extract_html=False):
+        extracted_on.append(page)
+        return 'content'
+
+    async def new_context(browser):
+        raise AssertionError('extraction should not build a new context')
+
+    monkeypatch.setattr(workflow, '_scrape_ir_page_for_link', scrape)
+    monkeypatch.setattr(workflow, 'extract_html_text', extract_html_text)
+    monkeypatch.setattr(workflow, 'new_context', new_context)
+
+    workflow._context = context
+    workflow._context_lock = asyncio.Lock()
+    link = await workflow._find_earnings_link(None)
+    await workflow._preconnect_task
+    content = await workflow.extract_earnings_content(link)
+
+    assert content == 'content' and len(context.pages) == 2
+    release_page = extracted_on[0]
+    discovery_page = next(page for page in context.pages if page is not release_page)
+    assert release_page.evaluated == ['https://news.acme.com']
+    assert discovery_page.closed and release_page.closed
+
 @pytest.mark.asyncio
 async def test_hpe_workflow(hpe_test_config):
     workflow = IRWorkflow(hpe_test_config)
@@ -0,0 +1,37 @@
+import os
+import sys
+import json
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from services.worker.classes.jsonstream import IncrementalJSONParser
+
+RESPONSE = {
+    "metrics": {
+        "current_quarter": {"revenue_billion": 1.93, "eps": 0.65, "note": "up {6.6%} \"yoy\""},
+        "full_year": {"revenue_billion": 7.3},
+        "forward_guidance": {"next_quarter": {"revenue_range": {"low": 1.93, "high": 2.0}}}
+    },
+    "sentiment_snippets": [{"snippet": "record demand, \"strong\" pipeline", "classification": "Bullish"}]
+}
+
+def test_watch_fires_when_current_quarter_closes():
+    text = "Here is the JSON:\n```json\n" + json.dumps(RESPONSE, indent=2) + "\n```\nDone."
+    fired_at = []
+    parser = IncrementalJSONParser()
+    parser.watch(("metrics", "current_quarter"), lambda value: fired_at.append((parser.offset, value)))
+
+    for char in text:
+        parser.feed(char)
+
+    assert len(fired_at) == 1
+    offset, value = fired_at[0]
+    assert value == RESPONSE["metrics"]["current_quarter"]
+    assert text[offset - 1] == "}" and '"full_year"' not in text[:offset]
+    assert parser.result() == RESPONSE
+
+def test_incomplete_stream_raises_decode_error():
+    parser = IncrementalJSONParser()
+    parser.feed('{"metrics": {"current_quarter": {"eps": 0.65}')
+    with pytest.raises(json.JSONDecodeError):
+        parser.result()
@@ -0,0 +1,124 @@
+import os
+import sys
+import json
+import httpx
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from services.worker.classes import ir
+from services.worker.classes.llm import GroqChannel, parse_reset, rate_limit_delay
+
+def completion(payload):
+    return {
+        "id": "chatcmpl-1",
+        "object": "chat.completion",
+        "created": 0,
+        "model": ir.GROQ_MODEL,
+        "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": json.dumps(payload)}}]
+    }
+
+def test_rate_limit_delay_reads_retry_after_and_reset_headers():
+    assert parse_reset("2m59.56s") == pytest.approx(179.56)
+    assert parse_reset("120ms") == pytest.approx(0.12)
+    assert parse_reset("soon") is None
+    assert rate_limit_delay(httpx.Headers({"retry-after-ms": "250", "retry-after": "3"})) == 0.25
+    assert rate_limit_delay(httpx.Headers({"retry-after": "3"})) == 3.0
+    assert rate_limit_delay(httpx.Headers({
+        "x-ratelimit-remaining-requests": "12",
+        "x-ratelimit-reset-requests": "9s",
+        "x-ratelimit-remaining-tokens": "0",
+        "x-ratelimit-reset-tokens": "7.66s"
+    })) == pytest.approx(7.66)
+    assert rate_limit_delay(httpx.Headers({"x-ratelimit-remaining-requests": "12"})) is None
+
+@pytest.mark.asyncio
+async def test_rate_limited_call_waits_and_retries_on_shared_channel(monkeypatch):
+    requests_seen = []
+
+    def handler(request):
+        requests_seen.append(request)
+        if len(requests_seen) == 1:
+            return httpx.Response(429, headers={"retry-after": "0.05"}, json={"error": {"message": "rate limited"}})
+        return httpx.Response(200, json=completion({"metrics": {"current_quarter": {"eps": 0.65}}}))
+
+    channel = GroqChannel("test-key", http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    monkeypatch.setattr(ir, "get_groq_channel", lambda api_key, concurrency: channel)
+    workflow = ir.IRWorkflow({
+        'deployment_type': 'local',
+        'ticker': 'acme',
+        'llm_instructions': {'system': 'extract', 'temperature': 0},
+        'llm_cache': {'enabled': False}
+    })
+
+    metrics = await workflow.extract_financial_metrics("release text")
+    await channel.close()
+
+    assert metrics == {"metrics": {"current_quarter": {"eps": 0.65}}}
+    assert len(requests_seen) == 2
+    assert requests_seen[0].headers["authorization"] == "Bearer test-key"
+    assert channel.blocked_until > 0
+
+@pytest.mark.asyncio
+async def test_non_retryable_errors_are_raised(monkeypatch):
+    def handler(request):
+        return httpx.Response(401, json={"error": {"message": "invalid api key"}})
+
+    channel = GroqChannel("bad-key", http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    monkeypatch.setattr(ir, "get_groq_channel", lambda api_key, concurrency: channel)
+    workflow = ir.IRWorkflow({
+        'deployment_type': 'local',
+        'llm_instructions': {'system': 'extract', 'temperature': 0},
+        'llm_cache': {'enabled': False}
+    })
+
+    with pytest.raises(ir.APIStatusError):
+        await workflow.extract_financial_metrics("release text")
+    await channel.close()
+
+def sse(payload, pieces):
+    text = json.dumps(payload)
+    size = -(-len(text) // pieces)
+    events = []
+    for start in range(0, len(text), size):
+        chunk = {
+            "id": "chatcmpl-1",
+            "object": "chat.completion.chunk",
+            "created": 0,
+            "model": ir.GROQ_MODEL,
+            "choices": [{"index": 0, "delta": {"content": text[start:start + size]}, "finish_reason": None}]
+        }
+        events.append(f"data: {json.dumps(chunk)}\n\n")
+    events.append("data: [DONE]\n\n")
+    return "".join(events).encode("utf-8")
+
+@pytest.mark.asyncio
+async def test_streamed_extraction_reports_current_quarter_early(monkeypatch):
+    payload = {
+        "metrics": {"current_quarter": {"eps": 0.65}, "full_year": {}, "forward_guidance": {}},
+        "sentiment_snippets": [{"snippet": "strong demand " * 20, "classification": "Bullish"}]
+    }
+
+    def handler(request):
+        assert json.loads(request.content)["stream"] is True
+        return httpx.Response(200, headers={"content-type": "text/event-stream"}, content=sse(payload, 12))
+
+    channel = GroqChannel("test-key", http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    monkeypatch.setattr(ir, "get_groq_channel", lambda api_key, concurrency: channel)
+    workflow = ir.IRWorkflow({
+        'deployment_type': 'local',
+        'ticker': 'acme',
+        'llm_instructions': {'system': 'extract', 'temperature': 0},
+        'llm_cache': {'enabled': False},
+        'llm_streaming': True
+    })
+    early = []
+
+    async def on_current_quarter(current_quarter):
+        early.append(current_quarter)
+
+    workflow.on_current_quarter = on_current_quarter
+    metrics = await workflow.extract_financial_metrics("release text")
+    await channel.close()
+
+    assert early == [{"eps": 0.65}]
+    assert metrics == payload
@@ -0,0 +1,54 @@
+import os
+import sys
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from services.worker.classes.network import RequestBlocker, merge_block_policies
+
+class FakeRequest:
+    def __init__(self, url, resource_type):
+        self.url = url
+        self.resource_type = resource_type
+
+class FakeRoute:
+    def __init__(self, url, resource_type):
+        self.request = FakeRequest(url, resource_type)
+        self.outcome = None
+
+    async def abort(self):
+        self.outcome = 'aborted'
+
+    async def continue_(self):
+        self.outcome = 'continued'
+
+@pytest.fixture
+def blocker():
+    policy = merge_block_policies(
+        {'blocked_domains': ['q4inc.com']},
+        {'allowed_domains': ['widgets.q4inc.com'], 'blocked_url_patterns': [r'/chat/.*\.js$']}
+    )
+    return RequestBlocker(policy)
+
+def test_block_reason(blocker):
+    assert blocker.block_reason('https://ir.acme.com/logo.png', 'image') == 'resource_type'
+    assert blocker.block_reason('https://www.googletagmanager.com/gtm.js', 'script') == 'domain'
+    assert blocker.block_reason('https://cdn.q4inc.com/tracker.js', 'script') == 'domain'
+    assert blocker.block_reason('https://widgets.q4inc.com/feed.json', 'xhr') is None
+    assert blocker.block_reason('https://ir.acme.com/chat/widget.js', 'script') == 'pattern'
+    assert blocker.block_reason('https://ir.acme.com/press-releases', 'document') is None
+
+@pytest.mark.asyncio
+async def test_handle_tracks_blocked_and_allowed(blocker):
+    routes = [
+        FakeRoute('https://ir.acme.com/press-releases', 'document'),
+        FakeRoute('https://ir.acme.com/hero.jpg', 'image'),
+        FakeRoute('https://static.hotjar.com/c/hotjar.js', 'script'),
+    ]
+    for route in routes:
+        await blocker.handle(route)
+    blocker.record_allowed(2048)
+
+    assert [route.outcome for route in routes] == ['continued', 'aborted', 'aborted']
+    assert blocker.stats['blocked_requests'] == 2
+    assert blocker.stats['blocked_by_reason'] == {'resource_type': 1, 'domain': 1}
+    assert blocker.stats['allowed_requests'] == 1 and blocker.stats['allowed_bytes'] == 2048
@@ -0,0 +1,99 @@
+import os
+import sys
+import time
+import threading
+import PyPDF2
+import pytest
+from io import BytesIO
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.append(os.path.join(os.path.dirname(__file__), "fixtures"))
+from services.worker.classes.ir import IRWorkflow
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from services.worker.classes.pdf import extract_text_parallel, extract_text_serial, extract_text_until, get_pdf_process_pool
+from pdf_fixture import build_pdf, earnings_release_pages
+
+@pytest.fixture(scope="module")
+def pdf_bytes():
+    return build_pdf(earnings_release_pages(12))
+
+@pytest.fixture(scope="module")
+def pdf_server(pdf_bytes):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "application/pdf")
+            self.send_header("Content-Length", str(len(pdf_bytes)))
+            self.end_headers()
+            self.wfile.write(pdf_bytes)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/release.pdf"
+    server.shutdown()
+
+def test_extract_pdf_text_streams_local_pdf(pdf_server):
+    workflow = IRWorkflow({'deployment_type': 'local'})
+    text = workflow.extract_pdf_text(pdf_server)
+    assert "Revenue of $1.93 billion" in text
+    assert "Reconciliation of GAAP to Non-GAAP Financial Measures (page 12)" in text
+
+def test_extract_pdf_text_enforces_size_cap(pdf_server):
+    workflow = IRWorkflow({'deployment_type': 'local', 'pdf_max_bytes': 1024})
+    with pytest.raises(Exception, match="byte limit"):
+        workflow.extract_pdf_text(pdf_server)
+
+def test_parallel_extraction_matches_single_core(pdf_server):
+    serial = IRWorkflow({'deployment_type': 'local', 'pdf_workers': 1}).extract_pdf_text(pdf_server)
+    parallel = IRWorkflow({'deployment_type': 'local', 'pdf_workers': 3}).extract_pdf_text(pdf_server)
+    assert parallel == serial
+    assert serial.index("(page 3)") < serial.index("(page 12)")
+
+@pytest.mark.asyncio
+async def test_early_exit_stops_at_outlook_and_parses_rest_in_background(pdf_server):
+    workflow = IRWorkflow({'deployment_type': 'local', 'extraction_method': 'pdf', 'pdf_early_exit': True})
+    content = await workflow.extract_earnings_content(pdf_server)
+    assert "Financial Outlook" in content
+    assert "(page 3)" in content and "(page 4)" not in content
+
+    full_text = await workflow._full_scraped_content(content)
+    assert full_text == workflow.extract_pdf_text(pdf_server)
+
+def test_page_budget_caps_early_exit():
+    reader = PyPDF2.PdfReader(BytesIO(build_pdf(earnings_release_pages(12))))
+    _, pages_read = extract_text_until(reader, stop_markers=[r'^never matches$'], page_budget=4)
+    assert pages_read == 4
+
+def test_broken_pool_is_replaced_for_the_next_pdf(pdf_bytes, tmp_path):
+    path = tmp_path / "release.pdf"
+    path.write_bytes(pdf_bytes)
+    broken = get_pdf_process_pool(2)
+    with pytest.raises(BrokenProcessPool):
+        broken.submit(os._exit, 1).result(timeout=30)
+
+    with pytest.raises(BrokenProcessPool):
+        extract_text_parallel(str(path), 12, 2)
+    assert get_pdf_process_pool(2) is not broken
+    assert extract_text_parallel(str(path), 12, 2) == extract_text_serial(PyPDF2.PdfReader(BytesIO(pdf_bytes)))
+
+def test_timed_out_pool_workers_are_terminated(pdf_bytes, tmp_path):
+    path = tmp_path / "release.pdf"
+    path.write_bytes(pdf_bytes)
+    hung = get_pdf_process_pool(2)
+    assert get_pdf_process_pool(3) is not hung
+    for _ in range(2):
+        hung.submit(time.sleep, 60)
+    processes = list(hung._processes.values())
+
+    with pytest.raises(FutureTimeoutError):
+        extract_text_parallel(str(path), 12, 2, timeout=0.5)
+    for process in processes:
+        process.join(10)
+        assert not process.is_alive()
+    assert get_pdf_process_pool(2) is not hung
+    assert extract_text_parallel(str(path), 12, 2) == extract_text_serial(PyPDF2.PdfReader(BytesIO(pdf_bytes)))
@@ -0,0 +1,81 @@
+import os
+import sys
+import asyncio
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from services.worker.classes import runner
+from services.worker.classes import runtime as runtime_module
+from services.worker.classes.ir import IRWorkflow
+
+class FakeContext:
+    def __init__(self, browser):
+        self.browser = browser
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+class FakeBrowserPool:
+    def __init__(self):
+        self.launches = []
+
+    async def get_browser(self, browser_type='chromium'):
+        if browser_type not in self.launches:
+            self.launches.append(browser_type)
+        return browser_type
+
+    async def close(self):
+        pass
+
+@pytest.mark.asyncio
+async def test_run_workflows_caps_concurrency_and_retries(monkeypatch):
+    running = 0
+    peak = 0
+    attempts = {}
+    contexts = []
+
+    async def new_context(self, browser):
+        context = FakeContext(browser)
+        contexts.append(context)
+        return context
+
+    async def process_earnings(self, context=None, http_client=None):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        attempts[self.ticker] = attempts.get(self.ticker, 0) + 1
+        await asyncio.sleep(0.01)
+        running -= 1
+        if self.ticker == 'FLAKY' and attempts[self.ticker] == 1:
+            raise Exception('transient')
+
+    monkeypatch.setattr(IRWorkflow, "new_context", new_context)
+    monkeypatch.setattr(IRWorkflow, "process_earnings", process_earnings)
+
+    configs = [{'deployment_type': 'local', 'ticker': f'T{i}'} for i in range(6)]
+    configs.append({'deployment_type': 'local', 'ticker': 'FLAKY'})
+    pool = FakeBrowserPool()
+    await runner.run_workflows(configs, max_concurrency=2, pool=pool)
+
+    assert peak == 2
+    assert attempts['FLAKY'] == 2
+    assert pool.launches == ['chromium']
+    assert len(contexts) == 7 and all(c.closed for c in contexts)
+
+def test_worker_runtime_reuses_loop_and_pool(monkeypatch):
+    calls = []
+
+    async def fake_run_workflows(configs, max_concurrency=8, pool=None, http_client=None):
+        calls.append((asyncio.get_running_loop(), pool, http_client))
+
+    monkeypatch.setattr(runtime_module, "run_workflows", fake_run_workflows)
+    worker_runtime = runtime_module.WorkerRuntime()
+    try:
+        worker_runtime.run_workflows([{'deployment_type': 'local'}])
+        worker_runtime.run_workflows([{'deployment_type': 'local'}])
+    finally:
+        worker_runtime.close()
+
+    assert calls[0] == calls[1]
+    assert calls[0][0] is worker_runtime.loop and calls[0][1] is worker_runtime.pool
@@ -0,0 +1,73 @@
+import os
+import sys
+import json
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from services.worker.classes import ir
+from services.worker.classes.artifacts import read_artifact
+from services.worker.classes.sinks import DynamoMessageSink, LocalArtifactSink, S3ArtifactSink, get_message_sink
+from services.worker.classes.writes import DurableWriter
+
+def test_sink_choice_follows_config(tmp_path):
+    local = ir.IRWorkflow({'deployment_type': 'local', 'llm_cache': {'enabled': False}})
+    assert isinstance(local.artifact_sink, S3ArtifactSink) and local.message_sink is None
+
+    hosted = ir.IRWorkflow({
+        'deployment_type': 'hosted',
+        'groq_api_key': 'key',
+        'discord_webhook_url': 'https://discord.test/api/webhooks/1/token',
+        'messages_table': 'messages',
+        'llm_cache': {'enabled': False}
+    })
+    assert isinstance(hosted.message_sink, DynamoMessageSink)
+
+    offline = ir.IRWorkflow({
+        'deployment_type': 'local',
+        'artifact_sink': 'local',
+        'message_sink': 'local',
+        'sink_directory': str(tmp_path),
+        'llm_cache': {'enabled': False}
+    })
+    assert isinstance(offline.artifact_sink, LocalArtifactSink)
+    assert offline.message_sink.path == str(tmp_path / "messages.ndjson")
+    with pytest.raises(ValueError):
+        get_message_sink('kafka')
+
+@pytest.mark.asyncio
+async def test_local_sinks_store_artifacts_and_append_messages(monkeypatch, tmp_path):
+    writer = DurableWriter(max_workers=2, base_delay=0.01)
+    monkeypatch.setattr(ir, "get_durable_writer", lambda: writer)
+    workflow = ir.IRWorkflow({
+        'deployment_type': 'local',
+        'ticker': 'acme',
+        'quarter': 4,
+        'year': 2024,
+        'artifact_sink': 'local',
+        'message_sink': 'local',
+        'sink_directory': str(tmp_path),
+        'llm_cache': {'enabled': False}
+    })
+
+    for message in ("first analysis", "second analysis"):
+        await workflow.deliver(message, "https://ir.acme.com/q4", "release text", {"metrics": {}})
+        await writer.drain()
+
+    with open(tmp_path / "messages.ndjson", encoding="utf-8") as f:
+        records = [json.loads(line) for line in f]
+    assert [record["discord_message"] for record in records] == ["first analysis", "second analysis"]
+    assert all(record["ticker"] == "acme" for record in records)
+
+    root = tmp_path / "artifacts"
+    metadata_keys = sorted(
+        os.path.relpath(os.path.join(directory, name), root).replace(os.sep, "/")
+        for directory, _, names in os.walk(root)
+        for name in names
+        if name.startswith("metadata")
+    )
+    assert len(metadata_keys) == 2 and all(key.split("/")[1:3] == ["ACME", "2024-Q4"] for key in metadata_keys)
+    artifacts = [read_artifact(lambda key: (root / key).read_bytes(), key) for key in metadata_keys]
+    assert all(artifact["scraped_content"] == "release text" for artifact in artifacts)
+    # Each artifact is keyed by its message record, so runs in the same second never collide.
+    by_message = {artifact["message_id"]: artifact["discord_message"] for artifact in artifacts}
+    assert by_message == {record["message_id"]: record["discord_message"] for record in records}
@@ -0,0 +1,59 @@
+import os
+import sys
+import time
+import threading
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from services.worker.classes import ir
+from services.worker.classes.writes import DurableWriter
+
+@pytest.mark.asyncio
+async def test_durable_writer_retries_then_gives_up():
+    writer = DurableWriter(max_workers=2, base_delay=0.01)
+    calls = {"flaky": 0, "broken": 0}
+
+    def flaky():
+        calls["flaky"] += 1
+        if calls["flaky"] < 3:
+            raise Exception("throttled")
+
+    def broken():
+        calls["broken"] += 1
+        raise Exception("access denied")
+
+    writer.submit("flaky write", flaky, max_attempts=3)
+    writer.submit("broken write", broken, max_attempts=2)
+
+    assert sorted(await writer.drain()) == [False, True]
+    assert calls == {"flaky": 3, "broken": 2}
+    assert not writer.pending
+
+@pytest.mark.asyncio
+async def test_deliver_sends_discord_without_waiting_for_durable_writes(monkeypatch):
+    writer = DurableWriter(max_workers=2, base_delay=0.01)
+    monkeypatch.setattr(ir, "get_durable_writer", lambda: writer)
+    workflow = ir.IRWorkflow({'deployment_type': 'local', 'ticker': 'acme', 'llm_cache': {'enabled': False}})
+    release = threading.Event()
+    sent, stored = [], []
+
+    def store_artifacts(**artifact):
+        release.wait(5)
+        stored.append(artifact["timestamp"])
+
+    async def punt_message_to_discord(message, coalescible=False):
+        sent.append(message)
+
+    monkeypatch.setattr(workflow, "punt_message_to_discord", punt_message_to_discord)
+    monkeypatch.setattr(workflow, "store_artifacts", store_artifacts)
+    monkeypatch.setattr(workflow, "store_message_to_dynamo", lambda message, message_id, discord_message_id=None: stored.append(message_id))
+
+    started = time.monotonic()
+    await workflow.deliver("message", "https://ir.acme.com/q4", "content", {"metrics": {}})
+
+    assert sent == ["message"] and time.monotonic() - started < 1
+    assert len(workflow.pending_writes) == 2 and not all(task.done() for task in workflow.pending_writes)
+    release.set()
+    await writer.drain()
+    assert all(task.result() for task in workflow.pending_writes)
+    assert len(stored) == 2